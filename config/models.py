@@ -35,6 +35,12 @@ TTS_MODEL_CONFIG = {
 # Batch-генерация вариантов
 VARIANT_GENERATION_TEMPERATURE = 0.7       # разнообразие (0-1)
 VARIANT_GENERATION_MAX_TOKENS = 2000       # максимум токенов в ответе
+VARIANT_RESPONSE_BASE_TOKENS = 200        # запас токенов на обрамление JSON в ответе
+VARIANT_RESPONSE_TOKENS_PER_WORD = 40     # токенов на слово: "Слово": [3 варианта] с кириллицей
+VARIANT_BATCH_CHUNK_SIZE = 40             # слов в одном batch-запросе (длинные списки делятся на части)
+VARIANT_BATCH_CONCURRENCY = 3             # одновременных batch-запросов по частям списка
+VARIANT_FALLBACK_CONCURRENCY = 5          # одновременных fallback-запросов для отдельных слов
+VARIANT_MODEL_HEDGE_DELAY = 15.0          # сек без ответа основной модели до параллельного запроса к резервной (None - без hedging)
 
 # Vision запросы
 VISION_TEMPERATURE = 0.3                   # низкая температура для точности
@@ -48,10 +54,20 @@ OPENROUTER_API_URL = "https://openrouter.ai/api/v1"
 OPENROUTER_TIMEOUT = 30                    # секунды
 OPENROUTER_RETRY_ATTEMPTS = 3              # количество повторных попыток
 OPENROUTER_RETRY_DELAY = 1                 # начальная задержка (сек)
+OPENROUTER_MAX_RETRY_AFTER = 30            # больший Retry-After игнорируется - остаётся backoff (сек)
 
 # Параметры rate limiting
 OPENROUTER_RATE_LIMIT_DELAY = 0.5          # задержка между запросами (сек)
 
+# Пул соединений общего HTTP клиента (keep-alive между запросами)
+OPENROUTER_MAX_CONNECTIONS = 50            # одновременных соединений
+OPENROUTER_MAX_KEEPALIVE = 20              # простаивающих соединений в пуле
+OPENROUTER_KEEPALIVE_EXPIRY = 60.0         # сек простоя, после которых соединение закрывается
+
+# Кэш ответов в памяти (детерминированные chat запросы с temperature=0; результаты
+# распознавания фото кэширует VisionService только после успешного разбора слов)
+OPENROUTER_RESPONSE_CACHE_SIZE = 256       # сколько ответов держать (LRU)
+
 # Добавляем псевдонимы для совместимости с openrouter_client.py
 OPENROUTER_API_TIMEOUT = OPENROUTER_TIMEOUT
 OPENROUTER_MAX_RETRIES = OPENROUTER_RETRY_ATTEMPTS
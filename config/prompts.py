@@ -94,11 +94,11 @@ VARIANT_GENERATION_BATCH_PROMPT_TEMPLATE = """Сгенерируй неправ
 Структура: словарь, где ключ - правильное слово, значение - массив из 3 вариантов.
 
 Пример формата:
-{
+{{
   "корова": ["карова", "корава", "кoрова"],
   "берёза": ["береза", "бириза", "берёса"],
   "праздник": ["празник", "празднек", "праздник"]
-}
+}}
 
 Каждый вариант должен:
 - Отличаться от правильного написания
@@ -60,6 +60,26 @@ PROGRESS_UPDATE_INTERVAL = 10        # каждые N ответов показ
 # ============================================================================
 
 VARIANTS_COUNT = 3                  # количество неправильных вариантов на слово
+VARIANTS_ALGORITHMIC_FIRST = False  # сначала алгоритмическая генерация, в LLM - только слова, где она не справилась
+
+# ============================================================================
+# ПАРАМЕТРЫ КЭШИРОВАНИЯ
+# ============================================================================
+
+AUDIO_MEMORY_CACHE_SIZE = 128       # сколько аудио держать в памяти (LRU) перед диском
+AUDIO_MEMORY_CACHE_MAX_BYTES = 32 * 1024 * 1024  # предельный объём аудио в памяти (32 МБ)
+AUDIO_DISK_CACHE_MAX_MB = 256       # предельный размер дискового кэша аудио (LRU-вытеснение)
+AUDIO_DISK_CACHE_LOW_WATER = 0.8    # после вытеснения кэш занимает не больше этой доли предела
+TELEGRAM_FILE_ID_CACHE_SIZE = 4096  # сколько file_id загруженных в Telegram аудио помнить (LRU)
+AUDIO_PREFETCH_FILES = 512          # сколько недавних аудио прогреть в page cache при старте
+TTS_WORKERS = 8                     # потоков для параллельной генерации аудио через gTTS
+DICTIONARY_CACHE_SIZE = 512         # сколько разобранных словарей держать в памяти (LRU)
+DICTIONARY_IO_WORKERS = 8           # потоков для параллельного чтения файлов словарей
+PROGRESS_TRACKER_CACHE_SIZE = 1024  # сколько трекеров прогресса пользователей держать в памяти (LRU)
+TEMP_SESSION_CACHE_SIZE = 1024      # сколько временных сессий (распознанные слова) держать в памяти (LRU)
+VARIANTS_MEMORY_CACHE_SIZE = 2048   # сколько наборов вариантов держать в памяти (LRU) перед диском
+IMAGE_PREPROCESS_CACHE_SIZE = 32    # сколько предобработанных фото держать в памяти (LRU по хэшу исходника)
+RECOGNIZED_PHOTO_CACHE_SIZE = 256   # сколько успешно распознанных фото (списки слов) держать в памяти (LRU)
 
 # ============================================================================
 # ОГРАНИЧЕНИЯ
@@ -68,6 +88,19 @@ VARIANTS_COUNT = 3                  # количество неправильн
 MAX_WORDS_IN_DICTIONARY = 50         # максимум слов в словаре
 MAX_FILE_SIZE = 10 * 1024 * 1024     # 10MB максимум для загрузки
 
+# Лимиты Telegram Bot API (~30 сообщений в секунду на бота)
+TELEGRAM_RATE_LIMIT = 30             # исходящих запросов в секунду
+TELEGRAM_MAX_CONCURRENT_REQUESTS = 30  # одновременных запросов к API
+
+# ============================================================================
+# ПАРАМЕТРЫ ОБРАБОТКИ ИЗОБРАЖЕНИЙ
+# ============================================================================
+
+IMAGE_MAX_WIDTH = 1600               # ширина фото для Vision API (текст читается и без большего)
+IMAGE_JPEG_QUALITY = 85              # качество JPEG, отправляемого в Vision API
+IMAGE_JPEG_SUBSAMPLING = 2           # субдискретизация цвета 4:2:0 (0 - 4:4:4 без потерь цвета)
+IMAGE_JPEG_OPTIMIZE = False          # второй проход Хаффмана: ~3% меньше файл, вдвое дольше кодирование
+
 # ============================================================================
 # ЛОГИРОВАНИЕ
 # ============================================================================
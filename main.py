@@ -41,6 +41,7 @@ from config.settings import (
     MAX_LOG_BACKUPS
 )
 from src.bot.handlers import router as handlers_router
+from src.bot.middlewares import RateLimitMiddleware
 from src.bot.handlers.tts_test_handler import init_tts_test_handler
 from src.services.openrouter_client import OpenRouterClient
 from src.services.tts_service import TTSService
@@ -146,6 +147,10 @@ def init_directories():
     TEMP_SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
     logger.info(f"✅ Папка создана/проверена: {TEMP_SESSIONS_DIR}")
     
+    # Перенос сохранённых сессий обучения старого формата в директории пользователей
+    from src.core.session_persistence import SessionPersistence
+    SessionPersistence.migrate_flat_sessions()
+    
     # Очистка истёкших сессий при старте
     deleted = cleanup_expired_sessions()
     if deleted > 0:
@@ -190,6 +195,9 @@ async def main():
     bot = Bot(token=TELEGRAM_BOT_TOKEN)
     dp = Dispatcher(storage=MemoryStorage())
     
+    # Общий лимит исходящих запросов к Telegram (защита от 429)
+    bot.session.middleware(RateLimitMiddleware())
+    
     logger.info("🤖 Инициализация бота...")
     logger.info(f"🔑 Токен загружен: {TELEGRAM_BOT_TOKEN[:10]}...")
     
@@ -238,6 +246,7 @@ async def main():
         logger.info("⏹️  Бот остановлен пользователем")
     finally:
         await bot.session.close()
+        await OpenRouterClient.aclose()
         logger.info("✅ Сессия закрыта")
 
 
@@ -11,6 +11,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 from src.core.dictionary_manager import DictionaryManager
 from aiogram.fsm.context import FSMContext
 from src.bot.states import DictionaryStates
+from src.bot.keyboards.keyboards import CB_DICT_SELECT
 from src.utils.validators import clean_words_list
 
 logger = logging.getLogger(__name__)
@@ -37,7 +38,7 @@ async def show_dictionaries(user_id: int, message_or_callback, is_callback: bool
     """
     try:
         # Получаем список словарей
-        dictionaries = dict_manager.list_dictionaries(user_id)
+        dictionaries = await dict_manager.alist_dictionaries(user_id)
         
         if not dictionaries:
             text = """📚 **Мои словари**
@@ -72,8 +73,8 @@ async def show_dictionaries(user_id: int, message_or_callback, is_callback: bool
         # Создаём inline клавиатуру для выбора словаря
         keyboard = InlineKeyboardBuilder()
         for dictionary in dictionaries:
-            button_text = f"📖 {dictionary.name} ({len(dictionary.words)} слов)"
-            button_data = f"dict_select:{dictionary.id}"
+            button_text = dictionary.display_label
+            button_data = CB_DICT_SELECT + dictionary.id
             keyboard.button(text=button_text, callback_data=button_data)
         
         keyboard.button(text="➕ Создать новый", callback_data="upload_photo")
@@ -112,7 +113,7 @@ async def callback_select_dictionary(callback: CallbackQuery):
     
     try:
         # Получаем словарь
-        dictionary = dict_manager.get_dictionary(user_id, dict_id)
+        dictionary = await dict_manager.aget_dictionary(user_id, dict_id)
         if not dictionary:
             await callback.answer("❌ Словарь не найден", show_alert=True)
             return
@@ -177,7 +178,7 @@ async def callback_edit_dictionary(callback: CallbackQuery, state: FSMContext):
     logger.info(f"✏️ Пользователь {user_id} редактирует словарь {dict_id}")
     
     try:
-        dictionary = dict_manager.get_dictionary(user_id, dict_id)
+        dictionary = await dict_manager.aget_dictionary(user_id, dict_id)
         if not dictionary:
             await callback.answer("❌ Словарь не найден", show_alert=True)
             return
@@ -309,7 +310,7 @@ async def callback_delete_confirm(callback: CallbackQuery):
     logger.info(f"🗑️ Пользователь {user_id} подтверждает удаление словаря {dict_id}")
     
     try:
-        dictionary = dict_manager.get_dictionary(user_id, dict_id)
+        dictionary = await dict_manager.aget_dictionary(user_id, dict_id)
         if not dictionary:
             await callback.answer("❌ Словарь не найден", show_alert=True)
             return
@@ -347,7 +348,7 @@ async def callback_delete_execute(callback: CallbackQuery):
     logger.info(f"🗑️ Словарь {dict_id} удаляется (пользователь {user_id})")
     
     try:
-        dictionary = dict_manager.get_dictionary(user_id, dict_id)
+        dictionary = await dict_manager.aget_dictionary(user_id, dict_id)
         dict_name = dictionary.name if dictionary else "Словарь"
         
         if dict_manager.delete_dictionary(user_id, dict_id):
@@ -102,7 +102,7 @@ async def callback_start_learning(callback: CallbackQuery, state: FSMContext):
     
     try:
         # Получаем словарь
-        dictionary = dict_manager.get_dictionary(user_id, dict_id)
+        dictionary = await dict_manager.aget_dictionary(user_id, dict_id)
         if not dictionary or not dictionary.words:
             await callback.answer("❌ Словарь не найден или пуст", show_alert=True)
             return
@@ -244,27 +244,42 @@ async def show_next_word(user_id: int, bot, state: FSMContext, send_feedback: st
             await bot.send_message(user_id, "❌ Ошибка при загрузке вариантов ответа.")
             return
         
-        # === АУДИО ПРОИЗНОШЕНИЯ ===
-        audio_bytes = None
-        try:
-            audio_bytes = await tts_service.generate_audio(current_word)
-            if audio_bytes:
-                logger.debug(f"🔊 Аудио получено для слова '{current_word}' ({len(audio_bytes)} байт)")
-        except Exception as e:
-            logger.warning(f"⚠️ Не удалось получить аудио: {e}")
-        
-        # === ОТПРАВЛЯЕМ ГОЛОСОВОЕ СООБЩЕНИЕ ===
+        # === ГОЛОСОВОЕ СООБЩЕНИЕ ===
+        # Если аудио слова уже загружалось в Telegram - отправляем по file_id без повторной загрузки
         voice_message_id = None
-        if audio_bytes:
+        file_id = tts_service.get_telegram_file_id(current_word)
+        if file_id:
             try:
-                voice_msg = await bot.send_voice(
-                    chat_id=user_id,
-                    voice=BufferedInputFile(file=audio_bytes, filename=f"{current_word}.mp3")
-                )
+                voice_msg = await bot.send_voice(chat_id=user_id, voice=file_id)
                 voice_message_id = voice_msg.message_id
-                logger.info(f"🔊 Голосовое сообщение отправлено для слова '{current_word}'")
+                logger.info(f"🔊 Голосовое сообщение отправлено для слова '{current_word}' (file_id)")
             except Exception as e:
-                logger.warning(f"⚠️ Не удалось отправить голосовое сообщение: {e}")
+                logger.warning(f"⚠️ Не удалось отправить аудио по file_id, загружаем заново: {e}")
+                tts_service.remember_telegram_file_id(current_word, None)
+        
+        if voice_message_id is None:
+            # === АУДИО ПРОИЗНОШЕНИЯ ===
+            audio_bytes = None
+            try:
+                audio_bytes = await tts_service.generate_audio(current_word)
+                if audio_bytes:
+                    logger.debug(f"🔊 Аудио получено для слова '{current_word}' ({len(audio_bytes)} байт)")
+            except Exception as e:
+                logger.warning(f"⚠️ Не удалось получить аудио: {e}")
+            
+            # === ОТПРАВЛЯЕМ ГОЛОСОВОЕ СООБЩЕНИЕ ===
+            if audio_bytes:
+                try:
+                    voice_msg = await bot.send_voice(
+                        chat_id=user_id,
+                        voice=BufferedInputFile(file=audio_bytes, filename=f"{current_word}.mp3")
+                    )
+                    voice_message_id = voice_msg.message_id
+                    if voice_msg.voice:
+                        tts_service.remember_telegram_file_id(current_word, voice_msg.voice.file_id)
+                    logger.info(f"🔊 Голосовое сообщение отправлено для слова '{current_word}'")
+                except Exception as e:
+                    logger.warning(f"⚠️ Не удалось отправить голосовое сообщение: {e}")
         
         # === ОТПРАВЛЯЕМ ВАРИАНТЫ ОТВЕТОВ С КНОПКОЙ ПАУЗЫ (ПРОБЛЕМА #1) ===
         keyboard_data = get_answer_variants_keyboard_with_pause(current_word, wrong_variants, session.session_id)
@@ -372,8 +387,18 @@ async def callback_handle_answer(callback: CallbackQuery, state: FSMContext):
         is_correct = (selected_variant == correct_word)
         
         # Записываем результат в сессию
+        mastered_before = session.stats.words_mastered
         session.record_answer(correct_word, is_correct)
         
+        # === КОНТРОЛЬНОЕ СОХРАНЕНИЕ СЕССИИ НА ДИСК ===
+        # Каждые PROGRESS_UPDATE_INTERVAL ответов и при каждом новом выученном слове:
+        # при сбое бота посреди сессии прогресс не теряется. Завершённая сессия
+        # не пишется - finish_learning_session сразу удаляет её файл
+        if not session.is_complete() and (
+            session.stats.words_mastered > mastered_before or session.should_show_progress_update()
+        ):
+            await SessionPersistence.save_session(user_id, session)
+        
         # Получаем объект слова для проверки статуса
         word_obj = session.get_word_data(correct_word)
         
@@ -447,7 +472,7 @@ async def finish_learning_session(user_id: int, bot, state: FSMContext, last_fee
         
         # === СОХРАНЯЕМ ПРОГРЕСС ЧЕРЕЗ PROGRESS TRACKER ===
         try:
-            progress_tracker = ProgressTracker(user_id)
+            progress_tracker = ProgressTracker.get(user_id)
             
             # Обновляем статистику сессии
             progress_tracker.update_session_stats(
@@ -460,16 +485,13 @@ async def finish_learning_session(user_id: int, bot, state: FSMContext, last_fee
             # === СОХРАНЯЕМ SESSIONSTATS В ФАЙЛЫ ===
             try:
                 from pathlib import Path
-                from src.utils.file_helpers import save_json
+                from src.utils.file_helpers import save_bytes
                 user_data_dir = DATA_DIR / "users" / str(user_id)
                 sessions_dir = user_data_dir / "sessions"
-                sessions_dir.mkdir(parents=True, exist_ok=True)
                 
                 stats_file = sessions_dir / f"{session.session_id}.json"
-                stats_dict = stats.model_dump(mode='json')
-                save_json(str(stats_file), stats_dict)
-                
-                logger.info(f"✅ SessionStats сохранены: {stats_file}")
+                if save_bytes(stats_file, stats.model_dump_json(indent=2).encode()):
+                    logger.info(f"✅ SessionStats сохранены: {stats_file}")
             except Exception as save_err:
                 logger.error(f"⚠️ Ошибка при сохранении SessionStats: {save_err}")
             
@@ -480,7 +502,7 @@ async def finish_learning_session(user_id: int, bot, state: FSMContext, last_fee
         # === ОБНОВЛЯЕМ СТАТУС СЛОВАРЯ ===
         if stats.is_complete:
             try:
-                dictionary = dict_manager.get_dictionary(user_id, session.dict_id)
+                dictionary = await dict_manager.aget_dictionary(user_id, session.dict_id)
                 if dictionary:
                     dictionary.is_fully_learned = True
                     dictionary.last_session_date = datetime.now()
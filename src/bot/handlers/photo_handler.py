@@ -12,8 +12,10 @@ from aiogram.filters import Command
 
 from src.services.vision_service import VisionService
 from src.utils.validators import format_words_for_display, validate_words_count
-from src.utils.file_helpers import save_user_session, load_user_session, delete_user_session
+from src.utils.file_helpers import asave_user_session, load_user_session, delete_user_session
 from src.services.tts_service import TTSService
+from src.services.variant_generator_service import VariantGeneratorService
+from src.core.dictionary_manager import DictionaryManager
 from src.utils.error_handlers import APIErrorHandler, ImageValidator, EdgeCaseHandler
 
 
@@ -21,6 +23,12 @@ logger = logging.getLogger(__name__)
 
 router = Router(name="photo_router")
 
+# Инициализация сервисов (один раз на процесс, а не на каждое фото)
+vision_service = VisionService()
+variant_generator = VariantGeneratorService()
+tts_service = TTSService()
+dict_manager = DictionaryManager()
+
 logger.info("✅ Router фото инициализирован")
 
 
@@ -68,9 +76,6 @@ async def handle_photo(message: types.Message):
             await message.answer(error_msg)
             return
         
-        # Инициализация Vision сервиса
-        vision_service = VisionService()
-        
         # Распознавание текста
         logger.info("🔄 Запуск распознавания...")
         words = await vision_service.recognize_text(image_bytes)
@@ -94,7 +99,7 @@ async def handle_photo(message: types.Message):
         
         # Сохранение слов в сессию пользователя (в JSON файл)
         session_data: Dict[str, Any] = {"words": words}
-        if save_user_session(user_id, session_data):
+        if await asave_user_session(user_id, session_data):
             logger.info(f"💾 Слова сохранены в сессию пользователя {user_id}")
         else:
             logger.warning(f"⚠️ Ошибка при сохранении сессии пользователя {user_id}")
@@ -220,9 +225,6 @@ async def handle_photo_from_document(message: types.Message):
             await message.answer(error_msg)
             return
         
-        # Инициализация Vision сервиса
-        vision_service = VisionService()
-        
         # Распознавание текста
         logger.info("🔄 Запуск распознавания...")
         words = await vision_service.recognize_text(image_bytes)
@@ -246,7 +248,7 @@ async def handle_photo_from_document(message: types.Message):
         
         # Сохранение слов в сессию пользователя (в JSON файл)
         session_data: Dict[str, Any] = {"words": words}
-        if save_user_session(user_id, session_data):
+        if await asave_user_session(user_id, session_data):
             logger.info(f"💾 Слова сохранены в сессию пользователя {user_id}")
         else:
             logger.warning(f"⚠️ Ошибка при сохранении сессии пользователя {user_id}")
@@ -342,11 +344,7 @@ async def confirm_words(callback: types.CallbackQuery):
     
     try:
         # === ЭТАП 2: BATCH-ГЕНЕРАЦИЯ ВАРИАНТОВ ===
-        from src.services.variant_generator_service import VariantGeneratorService
-        from src.core.dictionary_manager import DictionaryManager
-        
         logger.info(f"🔄 Запуск batch-генерации вариантов для пользователя {user_id}...")
-        variant_generator = VariantGeneratorService()
         
         # Batch-генерация для всех слов
         all_variants = await variant_generator.generate_variants_batch(words)
@@ -376,7 +374,6 @@ async def confirm_words(callback: types.CallbackQuery):
         logger.info(f"✅ Batch-генерация успешна! Получены варианты для {success_count} слов")
         
         # === ЭТАП 3: BATCH-ГЕНЕРАЦИЯ АУДИО ===
-        tts_service = TTSService()
         logger.info(f"🔄 Запуск batch-генерации аудио для {len(words)} слов...")
         
         try:
@@ -398,7 +395,6 @@ async def confirm_words(callback: types.CallbackQuery):
             logger.warning(f"⚠️ Ошибка при batch-генерации аудио: {e}. Продолжаем без аудио")
         
         # === ЭТАП 4: СОЗДАНИЕ СЛОВАРЯ В МЕНЕДЖЕРЕ ===
-        dict_manager = DictionaryManager()
         dictionary = dict_manager.create_dictionary(
             user_id=user_id,
             words=words
@@ -419,7 +415,7 @@ async def confirm_words(callback: types.CallbackQuery):
         session_data["variants_count"] = success_count
         session_data["dictionary_id"] = dictionary.id
         session_data["dictionary_name"] = dictionary.name
-        save_user_session(user_id, session_data)
+        await asave_user_session(user_id, session_data)
         
         # Показываем успех
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
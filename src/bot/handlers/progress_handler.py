@@ -92,7 +92,7 @@ async def show_session_history(user_id: int, callback: CallbackQuery):
         
         for i, session_file in enumerate(session_files, 1):
             try:
-                session_data = load_json(str(session_file))
+                session_data = load_json(session_file)
                 if session_data:
                     dict_name = session_data.get('dict_name', 'Неизвестный словарь')
                     started_at = session_data.get('started_at', 'N/A')
@@ -156,11 +156,11 @@ async def show_progress_statistics(user_id: int, callback: CallbackQuery = None,
     """
     try:
         # Загружаем прогресс
-        tracker = ProgressTracker(user_id)
+        tracker = ProgressTracker.get(user_id)
         total_progress = tracker.get_total_progress()
         
         # Получаем список словарей пользователя
-        dictionaries = dict_manager.list_dictionaries(user_id)
+        dictionaries = await dict_manager.alist_dictionaries(user_id)
         
         # === КЭШИРУЕМ ПРОГРЕСС ДЛЯ ВСЕХ СЛОВАРЕЙ (ОПТИМИЗАЦИЯ N+1) ===
         dict_progress_cache = {}
@@ -285,8 +285,8 @@ async def show_dictionary_progress_details(user_id: int, callback: CallbackQuery
         callback: CallbackQuery
     """
     try:
-        tracker = ProgressTracker(user_id)
-        dictionaries = dict_manager.list_dictionaries(user_id)
+        tracker = ProgressTracker.get(user_id)
+        dictionaries = await dict_manager.alist_dictionaries(user_id)
         
         if not dictionaries:
             await callback.answer("❌ У вас нет словарей", show_alert=True)
@@ -259,8 +259,7 @@ async def callback_pause_and_menu(callback: CallbackQuery, state: FSMContext):
     session = active_sessions.get(user_id)
     if session:
         # Сохраняем сессию на диск
-        session_persistence = SessionPersistence()
-        session_persistence.save_session(user_id, session)
+        await SessionPersistence.save_session(user_id, session)
         del active_sessions[user_id]
         
         logger.info(f"✅ Сессия {session.session_id} сохранена для пользователя {user_id}")
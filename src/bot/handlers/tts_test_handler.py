@@ -80,8 +80,8 @@ async def cmd_test_tts(message: types.Message):
         logger.info(f"✅ Аудио для '{word}' успешно отправлено")
     
     except Exception as e:
-        logger.error(f"❌ Ошибка при генерации аудио: {e}")
-        await status_msg.edit_text(f"❌ Ошибка: {str(e)}")
+        logger.error(f"❌ Ошибка при генерации аудио для '{word}'", exc_info=True)
+        await status_msg.edit_text(f"❌ Ошибка: {e}")
 
 
 @router.message(Command("tts_cache_info"))
@@ -99,6 +99,7 @@ async def cmd_tts_cache_info(message: types.Message):
         "📊 Информация о кэше аудио:\n\n"
         f"📁 Папка: `{cache_info.get('cache_dir', 'N/A')}`\n"
         f"📦 Файлов: {cache_info.get('total_files', 0)}\n"
+        f"⚡ В памяти: {cache_info.get('memory_entries', 0)}\n"
         f"💾 Размер: {cache_info.get('total_size_mb', 0)} МБ"
     )
     
@@ -120,5 +121,5 @@ async def cmd_clear_tts_cache(message: types.Message):
         await message.answer("✅ Кэш аудио успешно очищен!")
         logger.info("Кэш аудио успешно очищен")
     except Exception as e:
-        logger.error(f"❌ Ошибка при очистке кэша аудио: {e}")
-        await message.answer(f"❌ Ошибка: {str(e)}")
\ No newline at end of file
+        logger.error("❌ Ошибка при очистке кэша аудио", exc_info=True)
+        await message.answer(f"❌ Ошибка: {e}")
\ No newline at end of file
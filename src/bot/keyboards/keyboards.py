@@ -11,6 +11,11 @@ from aiogram.types import InlineKeyboardMarkup
 
 logger = logging.getLogger(__name__)
 
+# Префиксы callback_data для кнопок, создаваемых в циклах
+CB_DICT_SELECT = "dict_select:"
+CB_ANSWER = "answer:"
+CB_PAUSE_SESSION = "pause_session:"
+
 
 # ============================================================================
 # ФУНКЦИИ ФОРМАТИРОВАНИЯ (План 0012)
@@ -65,8 +70,8 @@ def get_dictionary_list_keyboard(dictionaries):
     keyboard = InlineKeyboardBuilder()
     
     for dictionary in dictionaries:
-        button_text = f"📖 {dictionary.name} ({len(dictionary.words)} слов)"
-        button_data = f"dict_select:{dictionary.id}"
+        button_text = dictionary.display_label
+        button_data = CB_DICT_SELECT + dictionary.id
         keyboard.button(text=button_text, callback_data=button_data)
     
     keyboard.button(text="➕ Создать новый", callback_data="upload_photo")
@@ -114,10 +119,10 @@ def get_answer_variants_keyboard(correct_word: str, wrong_variants: List[str]) -
         # Создаём клавиатуру
         keyboard = InlineKeyboardBuilder()
         
+        # Общая часть callback_data собирается один раз на клавиатуру
+        answer_prefix = CB_ANSWER + correct_word + ":"
         for variant in all_variants:
-            is_correct = (variant == correct_word)
-            callback_data = f"answer:{correct_word}:{variant}"
-            keyboard.button(text=variant, callback_data=callback_data)
+            keyboard.button(text=variant, callback_data=answer_prefix + variant)
         
         # Располагаем кнопки 2x2
         keyboard.adjust(2, 2)
@@ -129,8 +134,8 @@ def get_answer_variants_keyboard(correct_word: str, wrong_variants: List[str]) -
             'variants': all_variants
         }
     
-    except Exception as e:
-        logger.error(f"❌ Ошибка при создании клавиатуры ответов: {e}")
+    except Exception:
+        logger.error("❌ Ошибка при создании клавиатуры ответов", exc_info=True)
         return None
 
 
@@ -167,9 +172,10 @@ def get_answer_variants_keyboard_with_pause(correct_word: str, wrong_variants: L
         keyboard = InlineKeyboardBuilder()
         
         # Добавляем варианты ответов в сетке 2x2
+        # Общая часть callback_data собирается один раз на клавиатуру
+        answer_prefix = CB_ANSWER + correct_word + ":"
         for variant in all_variants:
-            callback_data = f"answer:{correct_word}:{variant}"
-            keyboard.button(text=variant, callback_data=callback_data)
+            keyboard.button(text=variant, callback_data=answer_prefix + variant)
         
         keyboard.adjust(2, 2)
         
@@ -177,7 +183,7 @@ def get_answer_variants_keyboard_with_pause(correct_word: str, wrong_variants: L
         from aiogram.types import InlineKeyboardButton
         pause_button = InlineKeyboardButton(
             text="⏸️ Пауза",
-            callback_data=f"pause_session:{session_id}"
+            callback_data=CB_PAUSE_SESSION + session_id
         )
         keyboard.row(pause_button)
         
@@ -188,8 +194,8 @@ def get_answer_variants_keyboard_with_pause(correct_word: str, wrong_variants: L
             'variants': all_variants
         }
     
-    except Exception as e:
-        logger.error(f"❌ Ошибка при создании клавиатуры с паузой: {e}")
+    except Exception:
+        logger.error("❌ Ошибка при создании клавиатуры с паузой", exc_info=True)
         return None
 
 
@@ -224,7 +230,7 @@ def get_learning_session_keyboard(user_id: int, session_id: str) -> dict:
     """
     keyboard = InlineKeyboardBuilder()
     
-    keyboard.button(text="⏸️ Пауза", callback_data=f"pause_session:{session_id}")
+    keyboard.button(text="⏸️ Пауза", callback_data=CB_PAUSE_SESSION + session_id)
     
     keyboard.adjust(1)
     
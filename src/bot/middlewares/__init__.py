@@ -0,0 +1,5 @@
+"""Middleware Telegram бота"""
+
+from .rate_limit import RateLimitMiddleware
+
+__all__ = ["RateLimitMiddleware"]
@@ -0,0 +1,67 @@
+"""
+Ограничение частоты исходящих запросов к Telegram Bot API
+Telegram допускает ~30 сообщений в секунду на бота, превышение приводит к 429 и каскаду повторов
+"""
+
+import asyncio
+import logging
+import time
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+
+from config.settings import TELEGRAM_RATE_LIMIT, TELEGRAM_MAX_CONCURRENT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Request middleware для сессии бота: token bucket + семафор
+    
+    Все исходящие запросы (send_message, answer, edit_text, send_voice и т.д.)
+    проходят через общий лимит, поэтому обработчики не нужно менять.
+    Long polling (getUpdates) не ограничивается.
+    """
+    
+    def __init__(self, rate: int = TELEGRAM_RATE_LIMIT, max_concurrent: int = TELEGRAM_MAX_CONCURRENT_REQUESTS):
+        """
+        Args:
+            rate: Запросов в секунду (ёмкость и скорость пополнения bucket)
+            max_concurrent: Максимум одновременных запросов к API
+        """
+        self.rate = rate
+        self._tokens = float(rate)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        logger.info(f"✅ RateLimitMiddleware инициализирован ({rate} запросов/сек, одновременно: {max_concurrent})")
+    
+    async def _acquire_token(self):
+        """Дождаться свободного токена в bucket"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+        
+        async with self._semaphore:
+            await self._acquire_token()
+            return await make_request(bot, method)
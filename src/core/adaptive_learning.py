@@ -4,7 +4,8 @@
 """
 
 import logging
-from typing import List, Optional, Dict
+from types import MappingProxyType
+from typing import List, Optional, Dict, Mapping, Tuple
 from config.settings import (
     MASTERY_CONSECUTIVE_CORRECT,
     MASTERY_MIN_ATTEMPTS,
@@ -14,6 +15,15 @@ from src.core.models import Word
 
 logger = logging.getLogger(__name__)
 
+# Распределение вариантов по сложности для 0, 1, 2 и 3+ ошибок.
+# Неизменяемые словари: одни и те же объекты отдаются всем вызывающим
+_DIFFICULTY_LEVELS = tuple(MappingProxyType(level) for level in (
+    {"hard": 3, "medium": 0, "easy": 0},
+    {"hard": 2, "medium": 1, "easy": 0},
+    {"hard": 2, "medium": 1, "easy": 0},
+    {"easy": 1, "medium": 2, "hard": 0},
+))
+
 
 class AdaptiveLearning:
     """
@@ -37,39 +47,39 @@ class AdaptiveLearning:
             
         Returns:
             True если статус был обновлён успешно
+        
+        Исключения не перехватываются - их обрабатывает LearningSession.record_answer
         """
-        try:
-            if is_correct:
-                # При правильном ответе
-                word.consecutive_correct += 1
-                word.correct_count += 1
-                word.total_attempts += 1
-                
-                # Проверяем критерии выученности
-                if AdaptiveLearning.is_word_mastered(word):
-                    word.is_mastered = True
-                    logger.info(f"✨ Слово '{word.text}' ВЫУЧЕНО на оценку 5!")
-                
-                # Снижаем приоритет (показывать реже)
-                word.priority_score = max(1, word.priority_score - 20)
-                logger.debug(f"✅ Правильный ответ: '{word.text}' (подряд: {word.consecutive_correct}, попыток: {word.total_attempts})")
+        if is_correct:
+            # При правильном ответе
+            word.consecutive_correct += 1
+            word.correct_count += 1
+            word.total_attempts += 1
             
-            else:
-                # При неправильном ответе
-                word.consecutive_correct = 0  # СБРОС серии!
-                word.incorrect_count += 1
-                word.total_attempts += 1
-                word.is_mastered = False  # Отменяем выученность если была
-                
-                # Повышаем приоритет (показывать чаще)
-                word.priority_score = min(100, word.priority_score + 30)
-                logger.debug(f"❌ Неправильный ответ: '{word.text}' (ошибок: {word.incorrect_count}, попыток: {word.total_attempts})")
+            # Проверяем критерии выученности: только для ещё не выученного слова
+            # и только когда набралась серия (дешёвая проверка до полного расчёта)
+            if (not word.is_mastered
+                    and word.consecutive_correct >= MASTERY_CONSECUTIVE_CORRECT
+                    and AdaptiveLearning.is_word_mastered(word)):
+                word.is_mastered = True
+                logger.info(f"✨ Слово '{word.text}' ВЫУЧЕНО на оценку 5!")
             
-            return True
+            # Снижаем приоритет (показывать реже)
+            word.priority_score = max(1, word.priority_score - 20)
+            logger.debug(f"✅ Правильный ответ: '{word.text}' (подряд: {word.consecutive_correct}, попыток: {word.total_attempts})")
         
-        except Exception as e:
-            logger.error(f"❌ Ошибка при обновлении статуса слова '{word.text}': {e}")
-            return False
+        else:
+            # При неправильном ответе
+            word.consecutive_correct = 0  # СБРОС серии!
+            word.incorrect_count += 1
+            word.total_attempts += 1
+            word.is_mastered = False  # Отменяем выученность если была
+            
+            # Повышаем приоритет (показывать чаще)
+            word.priority_score = min(100, word.priority_score + 30)
+            logger.debug(f"❌ Неправильный ответ: '{word.text}' (ошибок: {word.incorrect_count}, попыток: {word.total_attempts})")
+        
+        return True
     
     
     @staticmethod
@@ -101,14 +111,32 @@ class AdaptiveLearning:
         if word.correct_count < MASTERY_MIN_ATTEMPTS:
             return False
         
-        # Критерий 4: 75% успешности
-        success_rate = word.correct_count / word.total_attempts if word.total_attempts > 0 else 0
-        if success_rate < MASTERY_SUCCESS_RATE:
+        # Критерий 4: 75% успешности (умножение вместо деления - и деления на ноль нет)
+        if word.correct_count < MASTERY_SUCCESS_RATE * word.total_attempts:
             return False
         
         return True
     
     
+    @staticmethod
+    def priority_key(word: Word) -> Tuple[int, int, int]:
+        """
+        Ключ приоритета слова: меньше = показывать раньше
+        
+        Args:
+            word: Объект Word
+            
+        Returns:
+            Tuple для сравнения:
+            - Сначала по recent_error (True перед False)
+            - Потом по priority_score (выше перед ниже)
+            - Потом по total_attempts (меньше перед больше)
+        """
+        # Слова с недавними ошибками (не выучены и были ошибки) - наивысший приоритет
+        has_recent_error = word.incorrect_count > 0 and word.consecutive_correct == 0
+        return (-int(has_recent_error), -word.priority_score, word.total_attempts)
+    
+    
     @staticmethod
     def get_next_word_by_priority(words: Dict[str, Word]) -> Optional[str]:
         """
@@ -127,67 +155,56 @@ class AdaptiveLearning:
             
         Returns:
             Текст слова для показа или None если все выучены
+        
+        Исключения не перехватываются - их обрабатывает LearningSession.get_next_word
         """
-        try:
-            # Фильтруем невыученные слова
-            unmastered_words = [
-                (text, word) for text, word in words.items()
-                if not word.is_mastered
-            ]
-            
-            # Логируем исключённые слова (уже выученные)
+        # Логируем исключённые слова (уже выученные) - список строим только для DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
             mastered_words = [text for text, word in words.items() if word.is_mastered]
             if mastered_words:
                 logger.debug(f"🏆 Уже выученные слова (исключены): {', '.join(mastered_words)}")
-            
-            # Если все слова выучены → сессия завершена
-            if not unmastered_words:
-                logger.info("🎉 ВСЕ СЛОВА ВЫУЧЕНЫ НА ОЦЕНКУ 5!")
-                return None
-            
-            # Сортируем по приоритету
-            # 1. Приоритет: слова с недавними ошибками (error_count > 0 и consecutive_correct == 0)
-            # 2. Затем: по priority_score (выше = важнее)
-            # 3. Затем: по общему количеству попыток (меньше = показывали реже)
-            
-            def sort_key(item):
-                text, word = item
-                # Слова с недавними ошибками (не выучены и были ошибки) - наивысший приоритет
-                has_recent_error = word.incorrect_count > 0 and word.consecutive_correct == 0
-                
-                # Возвращаем tuple для сортировки:
-                # - Сначала по recent_error (True перед False)
-                # - Потом по priority_score (выше перед ниже)
-                # - Потом по total_attempts (меньше перед больше)
-                return (-int(has_recent_error), -word.priority_score, word.total_attempts)
-            
-            unmastered_words.sort(key=sort_key)
-            
-            # Возвращаем слово с наивысшим приоритетом
-            selected_word = unmastered_words[0][0]
-            selected_obj = unmastered_words[0][1]
-            
-            # Добавляю дополнительную проверку
-            if selected_obj.is_mastered:
-                logger.warning(f"⚠️ ВНИМАНИЕ! Слово '{selected_word}' отмечено как выученное, но попало в пул невыученных. Пропускаем.")
-                # Рекурсивно попробуем найти следующее слово (исключая текущее)
-                words_filtered = {k: v for k, v in words.items() if k != selected_word}
-                if words_filtered:
-                    return AdaptiveLearning.get_next_word_by_priority(words_filtered)
-                else:
-                    return None
-            
-            logger.debug(f"🎯 Выбрано слово: '{selected_word}' (приоритет: {selected_obj.priority_score}, ошибок: {selected_obj.incorrect_count}, попыток: {selected_obj.total_attempts})")
-            
-            return selected_word
         
-        except Exception as e:
-            logger.error(f"❌ Ошибка при выборе следующего слова: {e}")
+        # Приоритет выбора:
+        # 1. Приоритет: слова с недавними ошибками (error_count > 0 и consecutive_correct == 0)
+        # 2. Затем: по priority_score (выше = важнее)
+        # 3. Затем: по общему количеству попыток (меньше = показывали реже)
+        
+        def sort_key(item):
+            return AdaptiveLearning.priority_key(item[1])
+        
+        # Один проход по невыученным словам вместо фильтрации в список и полной сортировки
+        # (при равных ключах min() возвращает первое слово - как и стабильная сортировка)
+        selected = min(
+            ((text, word) for text, word in words.items() if not word.is_mastered),
+            key=sort_key,
+            default=None
+        )
+        
+        # Если все слова выучены → сессия завершена
+        if selected is None:
+            logger.info("🎉 ВСЕ СЛОВА ВЫУЧЕНЫ НА ОЦЕНКУ 5!")
             return None
+        
+        # Слово с наивысшим приоритетом
+        selected_word, selected_obj = selected
+        
+        # Добавляю дополнительную проверку
+        if selected_obj.is_mastered:
+            logger.warning(f"⚠️ ВНИМАНИЕ! Слово '{selected_word}' отмечено как выученное, но попало в пул невыученных. Пропускаем.")
+            # Рекурсивно попробуем найти следующее слово (исключая текущее)
+            words_filtered = {k: v for k, v in words.items() if k != selected_word}
+            if words_filtered:
+                return AdaptiveLearning.get_next_word_by_priority(words_filtered)
+            else:
+                return None
+        
+        logger.debug(f"🎯 Выбрано слово: '{selected_word}' (приоритет: {selected_obj.priority_score}, ошибок: {selected_obj.incorrect_count}, попыток: {selected_obj.total_attempts})")
+        
+        return selected_word
     
     
     @staticmethod
-    def get_difficulty_level(incorrect_count: int) -> Dict[str, int]:
+    def get_difficulty_level(incorrect_count: int) -> Mapping[str, int]:
         """
         Определить сложность вариантов на основе количества ошибок
         
@@ -200,18 +217,11 @@ class AdaptiveLearning:
             incorrect_count: Количество ошибок для слова
             
         Returns:
-            Dict с количеством вариантов каждой сложности: {'easy': N, 'medium': N, 'hard': N}
+            Неизменяемый словарь с количеством вариантов каждой сложности: {'easy': N, 'medium': N, 'hard': N}
         """
         # План 0009: распределение по сложности больше не используется
         # Возвращаем стандартное распределение для совместимости
-        difficulty_map = {
-            0: {"hard": 3, "medium": 0, "easy": 0},
-            1: {"hard": 2, "medium": 1, "easy": 0},
-            2: {"hard": 2, "medium": 1, "easy": 0},
-        }
-        if incorrect_count >= 3:
-            return {"easy": 1, "medium": 2, "hard": 0}
-        return difficulty_map.get(incorrect_count, {"hard": 3, "medium": 0, "easy": 0})
+        return _DIFFICULTY_LEVELS[min(max(incorrect_count, 0), 3)]
     
     
     @staticmethod
@@ -249,9 +259,16 @@ class AdaptiveLearning:
             - without_errors: слова где не было ошибок
         """
         try:
-            mastered = sum(1 for word in words.values() if word.is_mastered)
+            # Все счётчики за один проход по словам
+            mastered = 0
+            with_errors = 0
+            for word in words.values():
+                if word.is_mastered:
+                    mastered += 1
+                if word.incorrect_count > 0:
+                    with_errors += 1
+            
             total = len(words)
-            with_errors = sum(1 for word in words.values() if word.incorrect_count > 0)
             without_errors = total - with_errors
             
             return {
@@ -262,6 +279,6 @@ class AdaptiveLearning:
                 "remaining": total - mastered
             }
         
-        except Exception as e:
-            logger.error(f"❌ Ошибка при получении прогресса: {e}")
+        except Exception:
+            logger.error("❌ Ошибка при получении прогресса", exc_info=True)
             return {"mastered": 0, "total": 0, "with_errors": 0, "without_errors": 0, "remaining": 0}
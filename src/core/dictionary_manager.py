@@ -3,18 +3,116 @@
 Сохранение в файловой системе: data/users/{user_id}/dictionaries/
 """
 
+import asyncio
 import logging
 import json
+import os
+import sys
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
-from config.settings import DATA_DIR
+from config.settings import DATA_DIR, DICTIONARY_CACHE_SIZE, DICTIONARY_IO_WORKERS
 from src.core.models import Dictionary
-from src.utils.file_helpers import save_json, load_json, generate_unique_id, ensure_user_directories
+from src.utils.file_helpers import save_bytes, generate_unique_id, ensure_user_directories
 
 logger = logging.getLogger(__name__)
 
+# Общий пул потоков для чтения файлов словарей (потоки создаются по требованию)
+_io_executor = ThreadPoolExecutor(max_workers=DICTIONARY_IO_WORKERS, thread_name_prefix="dict-io")
+
+
+def _read_file_bytes(path: str) -> Optional[bytes]:
+    """
+    Прочитать файл целиком (выполняется в пуле потоков)
+    
+    Args:
+        path: Путь к файлу
+        
+    Returns:
+        Содержимое файла или None если прочитать не удалось
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        logger.warning(f"⚠️ Не удалось прочитать файл {path}: {e}")
+        return None
+
+
+def _file_stamp(stat: os.stat_result) -> Tuple[int, int]:
+    """
+    Отметка версии файла для проверки кэша: mtime в наносекундах и размер
+    (размер ловит перезапись файла в пределах одного тика mtime)
+    
+    Args:
+        stat: Результат stat() файла
+        
+    Returns:
+        (st_mtime_ns, st_size)
+    """
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _scan_dictionary_files(user_dict_dir: Path) -> Optional[List[Tuple[str, Tuple[int, int], str]]]:
+    """
+    Найти файлы словарей в директории пользователя (блокирующие scandir/stat)
+    
+    Args:
+        user_dict_dir: Директория словарей пользователя
+        
+    Returns:
+        Список (dict_id, отметка версии файла, путь) или None если директории нет
+    """
+    # os.scandir отдаёт тип файла из dirent без отдельного stat на каждый файл
+    try:
+        with os.scandir(user_dict_dir) as it:
+            entries = [e for e in it if e.name.endswith(".json") and e.is_file()]
+    except FileNotFoundError:
+        return None
+    
+    found = []
+    for entry in entries:
+        try:
+            found.append((entry.name[:-len(".json")], _file_stamp(entry.stat()), entry.path))
+        except OSError as e:
+            logger.warning(f"⚠️ Ошибка при чтении {entry.path}: {e}")
+    return found
+
+
+def _capitalize_words(words: List[str]) -> List[str]:
+    """
+    Капитализировать первые буквы слов
+    
+    Строки интернируются: одни и те же слова в разных словарях (и во всех
+    словарях в кэше) хранятся в памяти одним объектом
+    
+    Args:
+        words: Список слов
+        
+    Returns:
+        Новый список слов
+    """
+    return [sys.intern(word.capitalize()) if word else word for word in words]
+
+
+@lru_cache(maxsize=256)
+def _user_dictionaries_dir(base_data_dir: Path, user_id: int) -> Path:
+    """
+    Путь к директории словарей пользователя (кэшируется, чтобы не собирать Path заново)
+    
+    Args:
+        base_data_dir: Корневая директория данных
+        user_id: ID пользователя в Telegram
+        
+    Returns:
+        Path к директории словарей пользователя
+    """
+    return base_data_dir / "users" / str(user_id) / "dictionaries"
+
 
 class DictionaryManager:
     """
@@ -22,9 +120,20 @@ class DictionaryManager:
     Операции: создание, чтение, обновление, удаление, список
     """
     
-    def __init__(self):
-        """Инициализация менеджера"""
+    def __init__(self, cache_size: int = DICTIONARY_CACHE_SIZE):
+        """
+        Инициализация менеджера
+        
+        Args:
+            cache_size: Максимум словарей в LRU-кэше в памяти
+        """
         self.base_data_dir = DATA_DIR
+        
+        # LRU-кэш разобранных словарей: {(user_id, dict_id): ((mtime_ns, размер) файла, Dictionary)}
+        # Запись действительна пока файл не изменился (в т.ч. другим экземпляром менеджера).
+        # Объекты в кэше наружу не отдаются: вызывающий код получает копию и может её менять
+        self._cache: "OrderedDict[Tuple[int, str], Tuple[Tuple[int, int], Dictionary]]" = OrderedDict()
+        self._cache_size = cache_size
     
     
     def _get_user_dictionaries_dir(self, user_id: int) -> Path:
@@ -37,7 +146,7 @@ class DictionaryManager:
         Returns:
             Path к директории словарей пользователя
         """
-        return self.base_data_dir / "users" / str(user_id) / "dictionaries"
+        return _user_dictionaries_dir(self.base_data_dir, user_id)
     
     
     def _get_dictionary_filepath(self, user_id: int, dict_id: str) -> Path:
@@ -54,6 +163,101 @@ class DictionaryManager:
         return self._get_user_dictionaries_dir(user_id) / f"{dict_id}.json"
     
     
+    def _cache_put(self, key: Tuple[int, str], stamp: Tuple[int, int], dictionary: Dictionary):
+        """Положить копию словаря в LRU-кэш, вытесняя самые старые записи"""
+        self._cache[key] = (stamp, dictionary.model_copy(deep=True))
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+    
+    
+    def _remember_dictionary(self, user_id: int, dictionary: Dictionary, filepath: Path):
+        """
+        Положить словарь в кэш после записи файла
+        
+        Args:
+            user_id: ID пользователя
+            dictionary: Сохранённый словарь
+            filepath: Путь к файлу словаря
+        """
+        key = (user_id, dictionary.id)
+        try:
+            stamp = _file_stamp(filepath.stat())
+        except OSError:
+            self._cache.pop(key, None)
+            return
+        
+        self._cache_put(key, stamp, dictionary)
+    
+    
+    def _load_dictionary(
+        self,
+        user_id: int,
+        dict_id: str,
+        filepath: Path,
+        stamp: Optional[Tuple[int, int]] = None
+    ) -> Optional[Dictionary]:
+        """
+        Загрузить словарь из кэша или с диска
+        Кэш используется если mtime и размер файла не изменились с момента загрузки
+        
+        Args:
+            user_id: ID пользователя
+            dict_id: ID словаря
+            filepath: Путь к файлу словаря
+            stamp: Уже известная отметка версии файла (например, из os.scandir)
+            
+        Returns:
+            Объект Dictionary или None если файла нет
+        """
+        key = (user_id, dict_id)
+        if stamp is None:
+            try:
+                stamp = _file_stamp(filepath.stat())
+            except FileNotFoundError:
+                self._cache.pop(key, None)
+                return None
+        
+        cached = self._get_cached(key, stamp)
+        if cached is not None:
+            return cached
+        
+        blob = _read_file_bytes(str(filepath))
+        if not blob:
+            return None
+        
+        return self._parse_dictionary(key, stamp, blob)
+    
+    
+    def _get_cached(self, key: Tuple[int, str], stamp: Tuple[int, int]) -> Optional[Dictionary]:
+        """Вернуть копию словаря из кэша, если файл не изменился"""
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            self._cache.move_to_end(key)
+            return cached[1].model_copy(deep=True)
+        return None
+    
+    
+    def _parse_dictionary(self, key: Tuple[int, str], stamp: Tuple[int, int], blob: bytes) -> Dictionary:
+        """
+        Разобрать JSON словаря и положить результат в кэш
+        
+        Args:
+            key: Ключ кэша (user_id, dict_id)
+            stamp: Отметка версии файла (mtime_ns, размер)
+            blob: Содержимое файла
+            
+        Returns:
+            Объект Dictionary
+        """
+        # model_validate_json разбирает и валидирует за один проход без промежуточного dict
+        dictionary = Dictionary.model_validate_json(blob)
+        # Разделяем строки слов с остальными словарями в кэше (см. _capitalize_words)
+        dictionary.words[:] = map(sys.intern, dictionary.words)
+        self._cache_put(key, stamp, dictionary)
+        return dictionary
+    
+    
     def create_dictionary(self, user_id: int, words: List[str], name: Optional[str] = None) -> Optional[Dictionary]:
         """
         Создать новый словарь
@@ -74,27 +278,30 @@ class DictionaryManager:
             dict_id = generate_unique_id()
             
             # === КАПИТАЛИЗАЦИЯ ПЕРВЫХ БУКВ СЛОВ ===
-            capitalized_words = [word.capitalize() if word else word for word in words]
+            capitalized_words = _capitalize_words(words)
             
             # Генерируем название если не передано
             if not name:
                 dict_count = len(self.list_dictionaries(user_id))
                 name = f"Словарь #{dict_count + 1}"
             
-            # Создаём объект словаря
+            # Создаём объект словаря (одна метка времени для создания и обновления)
+            now = datetime.now()
             dictionary = Dictionary(
                 id=dict_id,
                 name=name,
                 words=capitalized_words,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
+                created_at=now,
+                updated_at=now
             )
             
             # Сохраняем в файл
             filepath = self._get_dictionary_filepath(user_id, dict_id)
-            dict_data = dictionary.model_dump(mode='json')
+            # Сериализация в JSON за один проход Pydantic, без промежуточного dict
+            payload = dictionary.model_dump_json(indent=2).encode()
             
-            if save_json(filepath, dict_data):
+            if save_bytes(filepath, payload):
+                self._remember_dictionary(user_id, dictionary, filepath)
                 logger.info(f"✅ Словарь создан: пользователь {user_id}, ID {dict_id}, слов: {len(capitalized_words)}")
                 return dictionary
             else:
@@ -119,10 +326,9 @@ class DictionaryManager:
         """
         try:
             filepath = self._get_dictionary_filepath(user_id, dict_id)
-            data = load_json(filepath, default=None)
+            dictionary = self._load_dictionary(user_id, dict_id, filepath)
             
-            if data:
-                dictionary = Dictionary(**data)
+            if dictionary:
                 logger.debug(f"✅ Словарь загружен: {dict_id}")
                 return dictionary
             else:
@@ -134,6 +340,47 @@ class DictionaryManager:
             return None
     
     
+    async def aget_dictionary(self, user_id: int, dict_id: str) -> Optional[Dictionary]:
+        """
+        Асинхронный вариант get_dictionary: stat и чтение файла выполняются
+        в пуле потоков и не блокируют event loop
+        
+        Args:
+            user_id: ID пользователя
+            dict_id: ID словаря
+            
+        Returns:
+            Объект Dictionary если найден, None иначе
+        """
+        key = (user_id, dict_id)
+        try:
+            loop = asyncio.get_running_loop()
+            filepath = self._get_dictionary_filepath(user_id, dict_id)
+            
+            try:
+                stat = await loop.run_in_executor(_io_executor, filepath.stat)
+            except FileNotFoundError:
+                self._cache.pop(key, None)
+                logger.warning(f"⚠️ Словарь не найден: {dict_id}")
+                return None
+            
+            stamp = _file_stamp(stat)
+            dictionary = self._get_cached(key, stamp)
+            if dictionary is None:
+                blob = await loop.run_in_executor(_io_executor, _read_file_bytes, str(filepath))
+                if not blob:
+                    logger.warning(f"⚠️ Словарь не найден: {dict_id}")
+                    return None
+                dictionary = self._parse_dictionary(key, stamp, blob)
+            
+            logger.debug(f"✅ Словарь загружен: {dict_id}")
+            return dictionary
+        
+        except Exception as e:
+            logger.error(f"❌ Ошибка при загрузке словаря {dict_id}: {e}")
+            return None
+    
+    
     def update_dictionary(self, user_id: int, dict_id: str, words: List[str], name: Optional[str] = None) -> bool:
         """
         Обновить словарь
@@ -148,14 +395,16 @@ class DictionaryManager:
             True если успешно, False иначе
         """
         try:
-            # Получаем существующий словарь
-            dictionary = self.get_dictionary(user_id, dict_id)
+            # Получаем существующий словарь: остальные поля (created_at, is_fully_learned,
+            # total_sessions, ...) нужно сохранить. При попадании в кэш это один stat()
+            filepath = self._get_dictionary_filepath(user_id, dict_id)
+            dictionary = self._load_dictionary(user_id, dict_id, filepath)
             if not dictionary:
                 logger.error(f"❌ Словарь {dict_id} не найден")
                 return False
             
             # === КАПИТАЛИЗАЦИЯ ПЕРВЫХ БУКВ СЛОВ ===
-            capitalized_words = [word.capitalize() if word else word for word in words]
+            capitalized_words = _capitalize_words(words)
             
             # Обновляем данные
             dictionary.words = capitalized_words
@@ -164,10 +413,11 @@ class DictionaryManager:
             dictionary.updated_at = datetime.now()
             
             # Сохраняем обновлённый словарь
-            filepath = self._get_dictionary_filepath(user_id, dict_id)
-            dict_data = dictionary.model_dump(mode='json')
+            # Сериализация в JSON за один проход Pydantic, без промежуточного dict
+            payload = dictionary.model_dump_json(indent=2).encode()
             
-            if save_json(filepath, dict_data):
+            if save_bytes(filepath, payload):
+                self._remember_dictionary(user_id, dictionary, filepath)
                 logger.info(f"✅ Словарь обновлен: {dict_id}, слов: {len(capitalized_words)}")
                 return True
             else:
@@ -192,6 +442,7 @@ class DictionaryManager:
         """
         try:
             filepath = self._get_dictionary_filepath(user_id, dict_id)
+            self._cache.pop((user_id, dict_id), None)
             
             if filepath.exists():
                 filepath.unlink()
@@ -217,35 +468,123 @@ class DictionaryManager:
             Список объектов Dictionary
         """
         try:
-            user_dict_dir = self._get_user_dictionaries_dir(user_id)
-            
-            if not user_dict_dir.exists():
+            found = _scan_dictionary_files(self._get_user_dictionaries_dir(user_id))
+            if found is None:
                 logger.debug(f"ℹ️ У пользователя {user_id} нет словарей (папка не существует)")
                 return []
             
-            dictionaries = []
+            dictionaries, misses = self._split_cached(user_id, found)
             
-            # Читаем все JSON файлы из директории
-            for dict_file in user_dict_dir.glob("*.json"):
-                try:
-                    data = load_json(dict_file, default=None)
-                    if data:
-                        dictionary = Dictionary(**data)
-                        dictionaries.append(dictionary)
-                except Exception as e:
-                    logger.warning(f"⚠️ Ошибка при загрузке словаря из {dict_file}: {e}")
+            # Чтение файлов отпускает GIL, поэтому несколько файлов читаем параллельно
+            paths = [path for _, _, path in misses]
+            if len(paths) > 1:
+                blobs = list(_io_executor.map(_read_file_bytes, paths))
+            else:
+                blobs = [_read_file_bytes(path) for path in paths]
             
-            # Сортируем по дате создания (новые первыми)
-            dictionaries.sort(key=lambda d: d.created_at, reverse=True)
+            return self._finish_list(user_id, dictionaries, misses, blobs)
+        
+        except Exception as e:
+            logger.error(f"❌ Ошибка при получении списка словарей пользователя {user_id}: {e}")
+            return []
+    
+    
+    async def alist_dictionaries(self, user_id: int) -> List[Dictionary]:
+        """
+        Асинхронный вариант list_dictionaries: файловые операции выполняются
+        в пуле потоков и не блокируют event loop, кэш обновляется в текущем потоке
+        
+        Args:
+            user_id: ID пользователя
+            
+        Returns:
+            Список объектов Dictionary
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            found = await loop.run_in_executor(
+                _io_executor, _scan_dictionary_files, self._get_user_dictionaries_dir(user_id)
+            )
+            if found is None:
+                logger.debug(f"ℹ️ У пользователя {user_id} нет словарей (папка не существует)")
+                return []
+            
+            dictionaries, misses = self._split_cached(user_id, found)
+            blobs = await asyncio.gather(*(
+                loop.run_in_executor(_io_executor, _read_file_bytes, path) for _, _, path in misses
+            ))
             
-            logger.debug(f"✅ Загружено {len(dictionaries)} словарей для пользователя {user_id}")
-            return dictionaries
+            return self._finish_list(user_id, dictionaries, misses, blobs)
         
         except Exception as e:
             logger.error(f"❌ Ошибка при получении списка словарей пользователя {user_id}: {e}")
             return []
     
     
+    def _split_cached(
+        self,
+        user_id: int,
+        found: List[Tuple[str, Tuple[int, int], str]]
+    ) -> Tuple[List[Dictionary], List[Tuple[Tuple[int, str], Tuple[int, int], str]]]:
+        """
+        Разделить найденные файлы на словари из кэша и те, что нужно дочитать с диска
+        
+        Args:
+            user_id: ID пользователя
+            found: Результат _scan_dictionary_files
+            
+        Returns:
+            (словари из кэша, [(ключ кэша, отметка версии, путь) для чтения])
+        """
+        dictionaries = []
+        misses = []
+        
+        # Неизменённые файлы берём из кэша, остальные дочитываем с диска
+        for dict_id, stamp, path in found:
+            key = (user_id, dict_id)
+            cached = self._get_cached(key, stamp)
+            if cached is not None:
+                dictionaries.append(cached)
+            else:
+                misses.append((key, stamp, path))
+        
+        return dictionaries, misses
+    
+    
+    def _finish_list(
+        self,
+        user_id: int,
+        dictionaries: List[Dictionary],
+        misses: List[Tuple[Tuple[int, str], Tuple[int, int], str]],
+        blobs: List[Optional[bytes]]
+    ) -> List[Dictionary]:
+        """
+        Разобрать дочитанные файлы и отсортировать список словарей
+        
+        Args:
+            user_id: ID пользователя
+            dictionaries: Словари, уже взятые из кэша
+            misses: Файлы, прочитанные с диска
+            blobs: Содержимое файлов в порядке misses
+            
+        Returns:
+            Список словарей (новые первыми)
+        """
+        for (key, stamp, path), blob in zip(misses, blobs):
+            if not blob:
+                continue
+            try:
+                dictionaries.append(self._parse_dictionary(key, stamp, blob))
+            except Exception as e:
+                logger.warning(f"⚠️ Ошибка при загрузке словаря из {path}: {e}")
+        
+        # Сортируем по дате создания (новые первыми)
+        dictionaries.sort(key=lambda d: d.created_at, reverse=True)
+        
+        logger.debug(f"✅ Загружено {len(dictionaries)} словарей для пользователя {user_id}")
+        return dictionaries
+    
+    
     def dictionary_exists(self, user_id: int, dict_id: str) -> bool:
         """
         Проверить существование словаря
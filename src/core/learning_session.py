@@ -4,10 +4,13 @@
 Слова повторяются с учётом приоритета и сложности вариантов
 """
 
+import heapq
+import itertools
 import logging
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict
+from functools import lru_cache
+from typing import List, Optional, Dict, Mapping, Tuple
 from pathlib import Path
 
 from config.settings import DATA_DIR, PROGRESS_UPDATE_INTERVAL
@@ -18,6 +21,12 @@ from src.utils.file_helpers import save_json, load_json
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _progress_bar(mastered: int, remaining: int) -> str:
+    """Полоска прогресса из символов (кэшируется: размеры словарей повторяются)"""
+    return "█" * mastered + "░" * remaining
+
+
 class LearningSession:
     """
     Менеджер для адаптивной обучающей сессии (Этап 6)
@@ -47,10 +56,24 @@ class LearningSession:
         self.session_id = str(uuid.uuid4())[:8]
         
         # Инициализируем слова как объекты Word с адаптивными параметрами
+        # (dict.fromkeys убирает повторы, не создавая лишних Word)
         self.words: Dict[str, Word] = {
-            word: Word(text=word) for word in words_list
+            word: Word(text=word) for word in dict.fromkeys(words_list)
         }
         
+        # Индекс невыученных слов (подмножество self.words в том же порядке)
+        # Обновляется в record_answer, чтобы выбор слова не просматривал выученные
+        self.unmastered_words: Dict[str, Word] = {}
+        
+        # Куча невыученных слов по AdaptiveLearning.priority_key с ленивым удалением:
+        # после ответа кладём новую запись, устаревшие выбрасываются при просмотре вершины.
+        # Порядковый номер запоминает позицию слова в unmastered_words, чтобы при равных
+        # приоритетах выбор совпадал с get_next_word_by_priority
+        self._priority_heap: List[Tuple[Tuple[int, int, int], int, str]] = []
+        self._heap_entries: Dict[str, Tuple[Tuple[int, int, int], int, str]] = {}
+        self._order_counter = itertools.count()
+        self.rebuild_unmastered_index()
+        
         # Текущее слово (для показа в интерфейсе)
         self.current_word: Optional[str] = None
         self.total_words_shown = 0  # Сколько раз показали любое слово (для промежуточного прогресса)
@@ -65,9 +88,54 @@ class LearningSession:
             total_words=len(words_list)
         )
         
+        # Множество для быстрой проверки членства в stats.words_mastered_list
+        # (сам список остаётся списком - он сериализуется и хранит порядок)
+        self._mastered_set: set = set()
+        
         logger.info(f"✅ AdaptiveLearningSession создана: сессия={self.session_id}, слов={len(words_list)}")
     
     
+    def rebuild_unmastered_index(self):
+        """
+        Пересобрать индекс невыученных слов по флагам is_mastered
+        Нужно вызывать после прямого изменения Word (например, при восстановлении сессии)
+        """
+        self.unmastered_words = {
+            text: word for text, word in self.words.items() if not word.is_mastered
+        }
+        
+        self._order_counter = itertools.count()
+        self._heap_entries = {
+            text: (AdaptiveLearning.priority_key(word), next(self._order_counter), text)
+            for text, word in self.unmastered_words.items()
+        }
+        self._priority_heap = list(self._heap_entries.values())
+        heapq.heapify(self._priority_heap)
+    
+    
+    def _push_priority(self, text: str, word: Word, order: int):
+        """Положить актуальную запись слова в кучу приоритетов"""
+        entry = (AdaptiveLearning.priority_key(word), order, text)
+        self._heap_entries[text] = entry
+        heapq.heappush(self._priority_heap, entry)
+        
+        # Устаревших записей стало слишком много - пересобираем кучу из актуальных
+        if len(self._priority_heap) > 2 * len(self._heap_entries) + 16:
+            self._priority_heap = list(self._heap_entries.values())
+            heapq.heapify(self._priority_heap)
+    
+    
+    def _peek_priority_word(self) -> Optional[str]:
+        """Слово с наивысшим приоритетом среди невыученных (без удаления из кучи)"""
+        heap = self._priority_heap
+        while heap:
+            entry = heap[0]
+            if self._heap_entries.get(entry[2]) is entry:
+                return entry[2]
+            heapq.heappop(heap)
+        return None
+    
+    
     def get_next_word(self) -> Optional[str]:
         """
         Получить следующее слово для показа на основе приоритета адаптивного алгоритма
@@ -83,17 +151,21 @@ class LearningSession:
         """
         try:
             # Проверяем завершена ли сессия
-            if AdaptiveLearning.is_session_complete(self.words):
+            if self.is_complete():
                 logger.info("🎉 СЕССИЯ ЗАВЕРШЕНА! ВСЕ СЛОВА ВЫУЧЕНЫ НА 5!")
                 return None
             
-            # Выбираем следующее слово по приоритету
-            next_word = AdaptiveLearning.get_next_word_by_priority(self.words)
+            # Выбираем следующее слово по приоритету (вершина кучи невыученных)
+            next_word = self._peek_priority_word()
             
             if next_word is None:
                 logger.info("🎉 ВСЕ СЛОВА ВЫУЧЕНЫ НА ОЦЕНКУ 5!")
                 return None
             
+            if logger.isEnabledFor(logging.DEBUG):
+                word_obj = self.unmastered_words[next_word]
+                logger.debug(f"🎯 Выбрано слово: '{next_word}' (приоритет: {word_obj.priority_score}, ошибок: {word_obj.incorrect_count}, попыток: {word_obj.total_attempts})")
+            
             self.current_word = next_word
             self.total_words_shown += 1
             
@@ -122,7 +194,7 @@ class LearningSession:
         return self.words.get(word)
     
     
-    def get_difficulty_for_word(self, word: str) -> Dict[str, int]:
+    def get_difficulty_for_word(self, word: str) -> Mapping[str, int]:
         """
         Получить уровень сложности вариантов для слова
         
@@ -135,7 +207,7 @@ class LearningSession:
             word: Текст слова
             
         Returns:
-            Dict: {'easy': N, 'medium': N, 'hard': N}
+            Mapping: {'easy': N, 'medium': N, 'hard': N} (только для чтения)
         """
         try:
             word_obj = self.words.get(word)
@@ -180,9 +252,21 @@ class LearningSession:
                 self.stats.incorrect_answers += 1
                 logger.debug(f"❌ Ответ неправильный для слова '{word}'")
             
+            # Поддерживаем индекс невыученных слов и кучу приоритетов
+            if word_obj.is_mastered:
+                self.unmastered_words.pop(word, None)
+                self._heap_entries.pop(word, None)
+            elif word not in self.unmastered_words:
+                # Вернувшееся слово встаёт в конец индекса - и в порядке кучи тоже
+                self.unmastered_words[word] = word_obj
+                self._push_priority(word, word_obj, next(self._order_counter))
+            else:
+                self._push_priority(word, word_obj, self._heap_entries[word][1])
+            
             # Проверяем выучено ли слово на 5
             if word_obj.is_mastered:
-                if word not in self.stats.words_mastered_list:
+                if word not in self._mastered_set:
+                    self._mastered_set.add(word)
                     self.stats.words_mastered_list.append(word)
                     self.stats.words_mastered += 1
                     logger.info(f"✨ Слово '{word}' ВЫУЧЕНО НА 5! Осталось: {len(self.words) - self.stats.words_mastered}")
@@ -201,6 +285,9 @@ class LearningSession:
         Returns:
             True если все слова выучены
         """
+        # Пока есть невыученные слова - полный проход не нужен
+        if self.unmastered_words:
+            return False
         return AdaptiveLearning.is_session_complete(self.words)
     
     
@@ -211,7 +298,8 @@ class LearningSession:
         Returns:
             Количество выученных слов
         """
-        return len([w for w in self.words.values() if w.is_mastered])
+        # Индекс невыученных слов поддерживается в record_answer - считать заново не нужно
+        return len(self.words) - len(self.unmastered_words)
     
     
     def get_current_position(self) -> int:
@@ -233,8 +321,7 @@ class LearningSession:
         """
         if not self.words:
             return 0
-        mastered = self.get_mastered_count()
-        return int((mastered / len(self.words)) * 100)
+        return int((self.get_mastered_count() / len(self.words)) * 100)
     
     
     def should_show_progress_update(self) -> bool:
@@ -259,7 +346,7 @@ class LearningSession:
         try:
             progress = AdaptiveLearning.get_session_progress(self.words)
             
-            emoji_completion = "█" * progress["mastered"] + "░" * progress["remaining"]
+            emoji_completion = _progress_bar(progress["mastered"], progress["remaining"])
             
             total_answers = self.stats.correct_answers + self.stats.incorrect_answers
             success_rate = (self.stats.correct_answers / total_answers * 100) if total_answers > 0 else 0
@@ -358,12 +445,9 @@ class LearningSession:
             
             # Группируем по 3 слова в строку
             words = self.stats.words_mastered_list
-            lines = []
-            for i in range(0, len(words), 3):
-                chunk = words[i:i+3]
-                lines.append(" • " + ", ".join(chunk))
-            
-            return "\n".join(lines)
+            return "\n".join(
+                " • " + ", ".join(words[i:i + 3]) for i in range(0, len(words), 3)
+            )
         
         except Exception as e:
             logger.error(f"❌ Ошибка при форматировании слов: {e}")
@@ -1,28 +1,35 @@
 """
 Модели данных для Telegram-бота изучения словарных слов
-Используют Pydantic для валидации данных
+Используют Pydantic для валидации данных (кроме сессионного Word)
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Optional
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass as pydantic_dataclass
 
 
 # ============================================================================
 # МОДЕЛИ ДЛЯ СЛОВ И СЛОВАРЕЙ
 # ============================================================================
 
-class Word(BaseModel):
+@dataclass(slots=True)
+class Word:
     """
     Модель одного словарного слова с отслеживанием прогресса
+    
+    Живёт только внутри сессии и не сериализуется как модель, поэтому это
+    dataclass со слотами: без __dict__ и без валидации на каждом присваивании
+    счётчиков в update_word_status
     """
-    text: str = Field(..., min_length=1, description="Текст слова")
-    consecutive_correct: int = Field(default=0, ge=0, description="Правильные ответы подряд")
-    total_attempts: int = Field(default=0, ge=0, description="Всего попыток в сессии")
-    correct_count: int = Field(default=0, ge=0, description="Количество правильных ответов")
-    incorrect_count: int = Field(default=0, ge=0, description="Количество неправильных ответов")
-    is_mastered: bool = Field(default=False, description="Выучено ли на оценку 5")
-    priority_score: int = Field(default=100, ge=1, le=100, description="Приоритет для показа")
+    text: str                       # Текст слова
+    consecutive_correct: int = 0    # Правильные ответы подряд
+    total_attempts: int = 0         # Всего попыток в сессии
+    correct_count: int = 0          # Количество правильных ответов
+    incorrect_count: int = 0        # Количество неправильных ответов
+    is_mastered: bool = False       # Выучено ли на оценку 5
+    priority_score: int = 100       # Приоритет для показа (1..100)
 
 
 class Dictionary(BaseModel):
@@ -38,10 +45,20 @@ class Dictionary(BaseModel):
     total_sessions: int = Field(default=0, ge=0, description="Количество сессий обучения")
     last_session_date: Optional[datetime] = Field(default=None, description="Дата последней сессии")
 
+    @property
+    def display_label(self) -> str:
+        """Текст кнопки словаря в списке"""
+        return f"📖 {self.name} ({len(self.words)} слов)"
+
 
-class WordProgress(BaseModel):
+@pydantic_dataclass(slots=True)
+class WordProgress:
     """
     Модель прогресса одного слова в словаре (долгосрочное отслеживание)
+    
+    Таких объектов у пользователя тысячи (по одному на слово в каждом словаре),
+    поэтому это pydantic-dataclass со слотами: валидация при загрузке сохраняется,
+    а экземпляр не несёт __dict__
     """
     word: str = Field(..., description="Текст слова")
     total_correct: int = Field(default=0, ge=0, description="Всего правильных ответов за все сессии")
@@ -5,16 +5,21 @@
 
 import logging
 import json
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List
 
-from config.settings import DATA_DIR
+from config.settings import DATA_DIR, PROGRESS_TRACKER_CACHE_SIZE
 from src.core.models import WordProgress, UserProgress
-from src.utils.file_helpers import save_json, load_json
+from src.utils.file_helpers import save_bytes
 
 logger = logging.getLogger(__name__)
 
+# LRU-реестр трекеров по user_id: прогресс разбирается из progress.json один раз,
+# дальше все обработчики работают с одним объектом (файл пишет только он)
+_trackers: "OrderedDict[int, ProgressTracker]" = OrderedDict()
+
 
 class ProgressTracker:
     """
@@ -27,6 +32,32 @@ class ProgressTracker:
         self.user_data_dir = DATA_DIR / "users" / str(user_id)
         self.progress_file = self.user_data_dir / "progress.json"
         self.progress = self._load_progress()
+        
+        # Суммы по словарям {dict_id: {...}}: строятся при первом запросе
+        # и дальше поддерживаются в update_word_progress без прохода по словам
+        self._dict_totals: Dict[str, Dict] = {}
+    
+    
+    @classmethod
+    def get(cls, user_id: int) -> "ProgressTracker":
+        """
+        Получить трекер пользователя из реестра (создаётся при первом обращении)
+        
+        Args:
+            user_id: ID пользователя в Telegram
+            
+        Returns:
+            ProgressTracker пользователя
+        """
+        tracker = _trackers.get(user_id)
+        if tracker is None:
+            tracker = cls(user_id)
+            _trackers[user_id] = tracker
+            while len(_trackers) > PROGRESS_TRACKER_CACHE_SIZE:
+                _trackers.popitem(last=False)
+        else:
+            _trackers.move_to_end(user_id)
+        return tracker
     
     
     def _load_progress(self) -> UserProgress:
@@ -38,17 +69,10 @@ class ProgressTracker:
         """
         try:
             if self.progress_file.exists():
-                data = load_json(str(self.progress_file))
-                if data:
-                    # Явная конвертация Dict[str, dict] → Dict[str, WordProgress]
-                    if 'dictionaries_progress' in data:
-                        for dict_id, dict_words in data['dictionaries_progress'].items():
-                            if isinstance(dict_words, dict):
-                                for word, word_data in dict_words.items():
-                                    if isinstance(word_data, dict):
-                                        dict_words[word] = WordProgress(**word_data)
-                    
-                    return UserProgress(**data)
+                raw = self.progress_file.read_bytes()
+                if raw.strip():
+                    # Разбор и валидация (включая вложенные WordProgress) за один проход
+                    return UserProgress.model_validate_json(raw)
             
             # Если файла нет - создаём новый прогресс
             logger.info(f"📝 Создан новый прогресс для пользователя {self.user_id}")
@@ -70,11 +94,13 @@ class ProgressTracker:
             # Обновляем время последней активности
             self.progress.last_activity = datetime.now()
             
-            # Конвертируем в dict для JSON
-            progress_dict = self.progress.model_dump(mode='json')
+            # Сериализуем в JSON за один проход Pydantic, без промежуточного dict
+            payload = self.progress.model_dump_json(indent=2).encode()
             
             # Сохраняем файл
-            save_json(str(self.progress_file), progress_dict)
+            if not save_bytes(self.progress_file, payload):
+                logger.error(f"❌ Не удалось записать прогресс пользователя {self.user_id}")
+                return False
             logger.debug(f"✅ Прогресс сохранён для пользователя {self.user_id}")
             return True
         
@@ -97,43 +123,49 @@ class ProgressTracker:
             True если успешно обновлено
         """
         try:
-            # Получаем или создаём словарь для этого словаря
-            if dict_id not in self.progress.dictionaries_progress:
-                self.progress.dictionaries_progress[dict_id] = {}
+            progress = self.progress
             
-            dict_progress = self.progress.dictionaries_progress[dict_id]
+            # Получаем или создаём словарь для этого словаря
+            dict_progress = progress.dictionaries_progress.get(dict_id)
+            if dict_progress is None:
+                dict_progress = progress.dictionaries_progress[dict_id] = {}
             
             # Получаем или создаём прогресс для слова
-            if word not in dict_progress:
+            word_progress = dict_progress.get(word)
+            is_new_word = word_progress is None
+            if is_new_word:
                 word_progress = WordProgress(word=word)
                 dict_progress[word] = word_progress
-            else:
-                word_progress = dict_progress[word]
+            was_mastered = word_progress.times_mastered > 0
             
-            # Обновляем статистику
+            # Обновляем статистику слова и общий прогресс
+            progress.total_attempts += 1
             if is_correct:
                 word_progress.total_correct += 1
+                progress.total_correct += 1
             else:
                 word_progress.total_incorrect += 1
+                progress.total_incorrect += 1
             
             word_progress.last_attempted = datetime.now()
             
-            # Если слово только что выучено
-            if is_mastered and not word_progress.times_mastered:
-                word_progress.times_mastered = 1
-            elif is_mastered:
+            # Если слово выучено - увеличиваем счётчик; в первый раз - учитываем в общем прогрессе
+            if is_mastered:
                 word_progress.times_mastered += 1
+                if word_progress.times_mastered == 1:
+                    progress.total_words_learned += 1
             
-            # Обновляем общий прогресс
-            self.progress.total_attempts += 1
-            if is_correct:
-                self.progress.total_correct += 1
-            else:
-                self.progress.total_incorrect += 1
-            
-            # Проверяем если слово выучено на 5 в первый раз
-            if is_mastered and word_progress.times_mastered == 1:
-                self.progress.total_words_learned += 1
+            # Обновляем суммы по словарю, если они уже построены
+            totals = self._dict_totals.get(dict_id)
+            if totals is not None:
+                totals["total_words"] += is_new_word
+                totals["words_mastered"] += not was_mastered and word_progress.times_mastered > 0
+                if is_correct:
+                    totals["total_correct"] += 1
+                else:
+                    totals["total_incorrect"] += 1
+                if totals["last_activity"] is None or word_progress.last_attempted > totals["last_activity"]:
+                    totals["last_activity"] = word_progress.last_attempted
             
             # Сохраняем
             return self._save_progress()
@@ -220,22 +252,25 @@ class ProgressTracker:
                     "last_activity": None
                 }
             
-            total_words = len(dict_progress)
-            words_mastered = sum(1 for wp in dict_progress.values() if wp.times_mastered > 0)
-            total_attempts = sum(wp.total_correct + wp.total_incorrect for wp in dict_progress.values())
-            total_correct = sum(wp.total_correct for wp in dict_progress.values())
-            total_incorrect = sum(wp.total_incorrect for wp in dict_progress.values())
+            totals = self._dict_totals.get(dict_id)
+            if totals is None:
+                totals = self._build_dict_totals(dict_progress)
+                self._dict_totals[dict_id] = totals
+            
+            total_correct = totals["total_correct"]
+            total_incorrect = totals["total_incorrect"]
+            total_attempts = total_correct + total_incorrect
             
             success_rate = (total_correct / total_attempts * 100) if total_attempts > 0 else 0
             
             return {
-                "total_words": total_words,
-                "words_mastered": words_mastered,
+                "total_words": totals["total_words"],
+                "words_mastered": totals["words_mastered"],
                 "success_rate": success_rate,
                 "total_attempts": total_attempts,
                 "total_correct": total_correct,
                 "total_incorrect": total_incorrect,
-                "last_activity": max([wp.last_attempted for wp in dict_progress.values() if wp.last_attempted], default=None)
+                "last_activity": totals["last_activity"]
             }
         
         except Exception as e:
@@ -243,6 +278,39 @@ class ProgressTracker:
             return {}
     
     
+    @staticmethod
+    def _build_dict_totals(dict_progress: Dict[str, WordProgress]) -> Dict:
+        """
+        Посчитать суммы по словарю одним проходом по словам
+        
+        Args:
+            dict_progress: Прогресс слов словаря {word: WordProgress}
+            
+        Returns:
+            Dict с total_words, words_mastered, total_correct, total_incorrect, last_activity
+        """
+        words_mastered = 0
+        total_correct = 0
+        total_incorrect = 0
+        last_activity = None
+        
+        for wp in dict_progress.values():
+            if wp.times_mastered > 0:
+                words_mastered += 1
+            total_correct += wp.total_correct
+            total_incorrect += wp.total_incorrect
+            if wp.last_attempted and (last_activity is None or wp.last_attempted > last_activity):
+                last_activity = wp.last_attempted
+        
+        return {
+            "total_words": len(dict_progress),
+            "words_mastered": words_mastered,
+            "total_correct": total_correct,
+            "total_incorrect": total_incorrect,
+            "last_activity": last_activity
+        }
+    
+    
     def get_total_progress(self) -> Dict:
         """
         Получить общий прогресс пользователя
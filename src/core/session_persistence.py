@@ -3,6 +3,7 @@ Persistence слой для сохранения и восстановления
 ПРОБЛЕМА #7: Сессии сохраняются на диск для восстановления при перезагрузке бота
 """
 
+import asyncio
 import logging
 import json
 from pathlib import Path
@@ -24,6 +25,55 @@ class SessionPersistence:
         """Создать директорию для сессий если её нет"""
         cls.SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
     
+    @classmethod
+    def _user_dir(cls, user_id: int) -> Path:
+        """
+        Директория сессий пользователя
+        
+        Файлы раскладываются по шардам user_id % 256, чтобы поиск сессий
+        пользователя перебирал только его файлы, а не всю общую папку
+        
+        Args:
+            user_id: ID пользователя
+            
+        Returns:
+            Путь к директории сессий пользователя
+        """
+        return cls.SESSIONS_DIR / f"{user_id % 256:02x}" / str(user_id)
+    
+    @classmethod
+    def _session_file(cls, user_id: int, session_id: str) -> Path:
+        """Путь к файлу сессии пользователя"""
+        return cls._user_dir(user_id) / f"{session_id}.json"
+    
+    @classmethod
+    def migrate_flat_sessions(cls) -> int:
+        """
+        Перенести файлы сессий старого формата ({user_id}_{session_id}.json в корне
+        SESSIONS_DIR) в директории пользователей (выполняется один раз при старте)
+        
+        Returns:
+            Количество перенесённых файлов
+        """
+        cls._ensure_dir()
+        
+        moved = 0
+        for session_file in cls.SESSIONS_DIR.glob("*_*.json"):
+            user_part, _, session_id = session_file.stem.partition("_")
+            if not user_part.isdigit() or not session_id:
+                continue
+            try:
+                target = cls._session_file(int(user_part), session_id)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                session_file.replace(target)
+                moved += 1
+            except OSError as e:
+                logger.warning(f"⚠️ Не удалось перенести сессию {session_file.name}: {e}")
+        
+        if moved > 0:
+            logger.info(f"📦 Перенесено {moved} сессий в директории пользователей")
+        return moved
+    
     @classmethod
     async def save_session(cls, user_id: int, session: LearningSession) -> bool:
         """
@@ -37,9 +87,7 @@ class SessionPersistence:
             True если успешно, False если ошибка
         """
         try:
-            cls._ensure_dir()
-            
-            session_file = cls.SESSIONS_DIR / f"{user_id}_{session.session_id}.json"
+            session_file = cls._session_file(user_id, session.session_id)
             
             # Конвертируем сессию в JSON
             session_data = {
@@ -49,21 +97,24 @@ class SessionPersistence:
                 'dict_name': session.dict_name,
                 'words_list': list(session.words.keys()),           # ✅ Используем существующие ключи
                 'current_word': session.current_word,              # ✅ Исправлено: current_word_index → current_word
-                'stats': session.stats.model_dump(mode='json') if hasattr(session.stats, 'model_dump') else session.stats.__dict__,
+                'stats': session.stats.model_dump(),               # datetime сериализует orjson в save_json
                 'words_stats': {                                   # ✅ Вместо words_progress берём из Word объектов
                     word: {
                         'correct_count': word_obj.correct_count,
                         'incorrect_count': word_obj.incorrect_count,
                         'total_attempts': word_obj.total_attempts,
-                        'times_mastered': word_obj.times_mastered,
-                        'is_mastered': word_obj.is_mastered,
-                        'last_attempted': word_obj.last_attempted.isoformat() if hasattr(word_obj, 'last_attempted') and word_obj.last_attempted else None
+                        'consecutive_correct': word_obj.consecutive_correct,
+                        'priority_score': word_obj.priority_score,
+                        'is_mastered': word_obj.is_mastered
                     }
                     for word, word_obj in session.words.items()
                 }
             }
             
-            save_json(str(session_file), session_data)
+            # Данные собраны в текущем потоке (снимок состояния), запись - в потоке пула
+            if not await asyncio.to_thread(save_json, session_file, session_data):
+                return False
+            
             logger.info(f"💾 Сессия {session.session_id} сохранена на диск для пользователя {user_id}")
             return True
             
@@ -71,6 +122,61 @@ class SessionPersistence:
             logger.error(f"❌ Ошибка при сохранении сессии на диск: {e}")
             return False
     
+    @classmethod
+    def _session_from_data(cls, session_data: dict) -> LearningSession:
+        """
+        Восстановить LearningSession из уже загруженных данных файла сессии
+        
+        Args:
+            session_data: Содержимое JSON файла сессии
+            
+        Returns:
+            Восстановленный объект LearningSession
+        """
+        # Восстанавливаем сессию
+        session = LearningSession(
+            user_id=session_data['user_id'],
+            dict_id=session_data['dict_id'],
+            dict_name=session_data['dict_name'],
+            words_list=session_data['words_list']
+        )
+        
+        session.session_id = session_data['session_id']
+        session.current_word = session_data.get('current_word')  # ✅ Исправлено: current_word_index → current_word
+        
+        # Восстанавливаем прогресс слов из words_stats
+        if 'words_stats' in session_data:  # ✅ Ищем words_stats вместо words_progress
+            for word, stats_data in session_data['words_stats'].items():
+                if word in session.words:
+                    word_obj = session.words[word]
+                    word_obj.correct_count = stats_data.get('correct_count', 0)
+                    word_obj.incorrect_count = stats_data.get('incorrect_count', 0)
+                    word_obj.total_attempts = stats_data.get('total_attempts', 0)
+                    word_obj.consecutive_correct = stats_data.get('consecutive_correct', 0)
+                    word_obj.priority_score = stats_data.get('priority_score', 100)
+                    word_obj.is_mastered = stats_data.get('is_mastered', False)
+            
+            session.rebuild_unmastered_index()
+        
+        return session
+    
+    @classmethod
+    def _read_session_file(cls, session_file: Path) -> Optional[LearningSession]:
+        """
+        Прочитать файл сессии и восстановить из него LearningSession (выполняется в потоке)
+        
+        Args:
+            session_file: Путь к файлу сессии
+            
+        Returns:
+            LearningSession или None если в файле нет session_id
+        """
+        # Файл читается один раз - сессия собирается из тех же данных
+        session_data = load_json(session_file)
+        if not session_data or not session_data.get('session_id'):
+            return None
+        return cls._session_from_data(session_data)
+    
     @classmethod
     async def load_session(cls, user_id: int, session_id: str) -> Optional[LearningSession]:
         """
@@ -84,37 +190,14 @@ class SessionPersistence:
             LearningSession объект или None если не найдена
         """
         try:
-            cls._ensure_dir()
+            session_file = cls._session_file(user_id, session_id)
             
-            session_file = cls.SESSIONS_DIR / f"{user_id}_{session_id}.json"
-            
-            if not session_file.exists():
+            session_data = await asyncio.to_thread(load_json, session_file)
+            if session_data is None:
                 logger.warning(f"⚠️ Файл сессии не найден: {session_file}")
                 return None
             
-            session_data = load_json(str(session_file))
-            
-            # Восстанавливаем сессию
-            session = LearningSession(
-                user_id=session_data['user_id'],
-                dict_id=session_data['dict_id'],
-                dict_name=session_data['dict_name'],
-                words_list=session_data['words_list']
-            )
-            
-            session.session_id = session_data['session_id']
-            session.current_word = session_data.get('current_word')  # ✅ Исправлено: current_word_index → current_word
-            
-            # Восстанавливаем прогресс слов из words_stats
-            if 'words_stats' in session_data:  # ✅ Ищем words_stats вместо words_progress
-                for word, stats_data in session_data['words_stats'].items():
-                    if word in session.words:
-                        word_obj = session.words[word]
-                        word_obj.correct_count = stats_data.get('correct_count', 0)
-                        word_obj.incorrect_count = stats_data.get('incorrect_count', 0)
-                        word_obj.total_attempts = stats_data.get('total_attempts', 0)
-                        word_obj.times_mastered = stats_data.get('times_mastered', 0)
-                        word_obj.is_mastered = stats_data.get('is_mastered', False)
+            session = cls._session_from_data(session_data)
             
             logger.info(f"📂 Сессия {session_id} загружена с диска для пользователя {user_id}")
             return session
@@ -136,15 +219,16 @@ class SessionPersistence:
             True если успешно, False если ошибка
         """
         try:
-            session_file = cls.SESSIONS_DIR / f"{user_id}_{session_id}.json"
+            session_file = cls._session_file(user_id, session_id)
             
-            if session_file.exists():
-                session_file.unlink()
-                logger.info(f"🗑️ Сессия {session_id} удалена с диска для пользователя {user_id}")
-                return True
-            else:
+            try:
+                await asyncio.to_thread(session_file.unlink)
+            except FileNotFoundError:
                 logger.warning(f"⚠️ Файл сессии не найден для удаления: {session_file}")
                 return False
+            
+            logger.info(f"🗑️ Сессия {session_id} удалена с диска для пользователя {user_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Ошибка при удалении сессии с диска: {e}")
@@ -162,23 +246,22 @@ class SessionPersistence:
             Словарь {session_id: LearningSession} найденных сессий
         """
         try:
-            cls._ensure_dir()
-            
             sessions = {}
-            pattern = f"{user_id}_*.json"
-            
-            for session_file in cls.SESSIONS_DIR.glob(pattern):
-                try:
-                    session_data = load_json(str(session_file))
-                    session_id = session_data.get('session_id')
-                    
-                    if session_id:
-                        session = await cls.load_session(user_id, session_id)
-                        if session:
-                            sessions[session_id] = session
-                except Exception as e:
-                    logger.warning(f"⚠️ Ошибка при загрузке сессии {session_file}: {e}")
-                    continue
+            user_dir = cls._user_dir(user_id)
+            
+            # Поиск, чтение и разбор файлов выполняются в потоках параллельно,
+            # не блокируя event loop; перебирается только директория пользователя
+            session_files = await asyncio.to_thread(lambda: list(user_dir.glob("*.json")))
+            results = await asyncio.gather(
+                *(asyncio.to_thread(cls._read_session_file, session_file) for session_file in session_files),
+                return_exceptions=True
+            )
+            
+            for session_file, result in zip(session_files, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"⚠️ Ошибка при загрузке сессии {session_file}: {result}")
+                elif result is not None:
+                    sessions[result.session_id] = result
             
             logger.info(f"📂 Загружено {len(sessions)} сохранённых сессий для пользователя {user_id}")
             return sessions
@@ -3,10 +3,14 @@ OpenRouter API клиент для работы с Vision, TTS и LLM APIs
 """
 
 import base64
+import hashlib
 import logging
 import asyncio
-from typing import Optional, Dict, Any, List
+import random
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Union
 import httpx
+import orjson
 
 from config.settings import OPENROUTER_API_KEY
 from config.models import (
@@ -14,17 +18,36 @@ from config.models import (
     OPENROUTER_API_URL,
     OPENROUTER_API_TIMEOUT,
     OPENROUTER_MAX_RETRIES,
+    OPENROUTER_MAX_RETRY_AFTER,
+    OPENROUTER_MAX_CONNECTIONS,
+    OPENROUTER_MAX_KEEPALIVE,
+    OPENROUTER_KEEPALIVE_EXPIRY,
+    OPENROUTER_RESPONSE_CACHE_SIZE,
 )
 
 
 logger = logging.getLogger(__name__)
 
+# Метка на месте data URL изображения: после сериализации payload заменяется на base64-байты
+_IMAGE_URL_PLACEHOLDER = "__image_data_url__"
+_IMAGE_URL_PLACEHOLDER_JSON = orjson.dumps(_IMAGE_URL_PLACEHOLDER)
+
 
 class OpenRouterClient:
     """
     Асинхронный HTTP клиент для работы с OpenRouter API
     """
     
+    # Общий httpx клиент для всех экземпляров: соединения (TCP + TLS) переиспользуются
+    # между запросами, даже если сервисы создают OpenRouterClient заново
+    _http_client: Optional[httpx.AsyncClient] = None
+    _http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    # LRU-кэш ответов по хэшу запроса: одинаковый детерминированный chat запрос
+    # не отправляется в API второй раз (vision не кэшируется: ответ недетерминирован,
+    # а пригодность ответа проверяет только VisionService)
+    _response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+    
     def __init__(self, api_key: str = OPENROUTER_API_KEY):
         """
         Инициализация клиента OpenRouter
@@ -44,11 +67,141 @@ class OpenRouterClient:
         
         logger.info(f"✅ OpenRouterClient инициализирован (ключ: {self.api_key[:10]}...)")
     
+    @classmethod
+    async def _get_http_client(cls) -> httpx.AsyncClient:
+        """Получить общий HTTP клиент (создаётся при первом запросе)"""
+        # Соединения пула привязаны к event loop - в новом loop нужен новый клиент
+        loop = asyncio.get_running_loop()
+        client = cls._http_client
+        if client is not None and not client.is_closed and cls._http_client_loop is loop:
+            return client
+        
+        stale_client, stale_loop = client, cls._http_client_loop
+        # Новый клиент публикуется до await, чтобы параллельные запросы не создавали свои
+        cls._http_client_loop = loop
+        cls._http_client = new_client = httpx.AsyncClient(
+            timeout=OPENROUTER_API_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=OPENROUTER_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENROUTER_MAX_KEEPALIVE,
+                keepalive_expiry=OPENROUTER_KEEPALIVE_EXPIRY,
+            ),
+        )
+        if stale_client is not None and not stale_client.is_closed:
+            await cls._close_stale_client(stale_client, stale_loop)
+        return new_client
+    
+    @staticmethod
+    async def _close_stale_client(client: httpx.AsyncClient, client_loop: Optional[asyncio.AbstractEventLoop]):
+        """
+        Закрыть клиент, созданный в другом event loop, чтобы не утекали
+        соединения его пула
+        
+        Args:
+            client: Старый HTTP клиент
+            client_loop: Event loop, в котором клиент был создан
+        """
+        if client_loop is None or client_loop.is_closed():
+            # Транспорты закрытого loop уже не закрыть штатно (call_soon недоступен);
+            # сокеты освобождаются вместе с объектом клиента
+            return
+        
+        if client_loop.is_running():
+            # Loop ещё работает (в другом потоке) - закрываем клиент в нём самом
+            asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+            return
+        
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug("⚠️ Ошибка при закрытии HTTP клиента прошлого event loop: %s", e)
+    
+    @classmethod
+    async def aclose(cls):
+        """Закрыть общий HTTP клиент (при остановке бота)"""
+        client, client_loop = cls._http_client, cls._http_client_loop
+        cls._http_client = None
+        cls._http_client_loop = None
+        if client is None:
+            return
+        if client_loop is asyncio.get_running_loop():
+            await client.aclose()
+        else:
+            await cls._close_stale_client(client, client_loop)
+    
+    @staticmethod
+    def _cache_key(*parts: Union[str, bytes]) -> bytes:
+        """Ключ кэша ответов: хэш частей запроса (bytes хэшируются без перекодирования)"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else part.encode())
+            digest.update(b"\0")
+        return digest.digest()
+    
+    @classmethod
+    def _cache_get(cls, key: bytes) -> Optional[str]:
+        """Достать ответ из кэша (с обновлением позиции в LRU)"""
+        content = cls._response_cache.get(key)
+        if content is not None:
+            cls._response_cache.move_to_end(key)
+        return content
+    
+    @classmethod
+    def _cache_put(cls, key: bytes, content: str):
+        """Положить ответ в кэш, вытесняя самые старые записи"""
+        cls._response_cache[key] = content
+        cls._response_cache.move_to_end(key)
+        while len(cls._response_cache) > OPENROUTER_RESPONSE_CACHE_SIZE:
+            cls._response_cache.popitem(last=False)
+    
+    @staticmethod
+    def _retry_delay(response: httpx.Response, default: float) -> float:
+        """
+        Задержка перед повтором запроса
+        
+        Args:
+            response: Ответ API (берётся заголовок Retry-After в секундах, если он есть
+                и не больше OPENROUTER_MAX_RETRY_AFTER)
+            default: Задержка экспоненциального backoff
+            
+        Returns:
+            Задержка в секундах со случайной добавкой до 1 сек, чтобы одновременные
+            запросы разных пользователей не повторялись синхронно
+        """
+        delay = default
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                server_delay = max(0.0, float(retry_after))
+            except ValueError:
+                server_delay = None  # Формат HTTP-даты не разбираем - остаётся backoff
+            # Обработчик пользователя ждёт внутри запроса: час по Retry-After не ждём
+            if server_delay is not None and server_delay <= OPENROUTER_MAX_RETRY_AFTER:
+                delay = server_delay
+            elif server_delay is not None:
+                logger.warning(f"⚠️ Retry-After {server_delay:.0f} сек больше допустимого - используется backoff {default} сек")
+        return delay + random.uniform(0, 1.0)
+    
+    @staticmethod
+    async def _encode_image(raw: bytes) -> bytes:
+        """
+        Закодировать изображение в base64 в отдельном потоке
+        
+        Args:
+            raw: Байты изображения
+            
+        Returns:
+            Base64 в виде bytes (кодирование нескольких МБ не блокирует event loop;
+            без промежуточной str - байты сразу вставляются в тело запроса)
+        """
+        return await asyncio.to_thread(base64.b64encode, raw)
+    
     async def vision_request(
         self,
-        image_base64: str,
-        prompt: str,
-        model: Optional[str] = None
+        image_base64: Optional[str] = None,
+        prompt: str = "",
+        model: Optional[str] = None,
+        image_bytes: Optional[bytes] = None
     ) -> str:
         """
         Отправить запрос для распознавания текста с изображения
@@ -57,6 +210,7 @@ class OpenRouterClient:
             image_base64: Изображение в формате base64
             prompt: Текстовый промпт для модели
             model: Модель для использования (если не указана, используется VISION_MODEL)
+            image_bytes: Байты изображения (кодируются в base64 внутри, вместо image_base64)
             
         Returns:
             Распознанный текст от модели
@@ -67,6 +221,13 @@ class OpenRouterClient:
         if not model:
             model = VISION_MODEL
         
+        if image_base64 is not None:
+            image_b64 = image_base64.encode('ascii')
+        elif image_bytes is not None:
+            image_b64 = await self._encode_image(image_bytes)
+        else:
+            raise ValueError("Не передано изображение для Vision запроса")
+        
         logger.info(f"📸 Vision запрос: модель {model}")
         
         payload = {
@@ -82,7 +243,7 @@ class OpenRouterClient:
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}"
+                                "url": _IMAGE_URL_PLACEHOLDER
                             }
                         }
                     ]
@@ -91,21 +252,27 @@ class OpenRouterClient:
             "max_tokens": 1024,
         }
         
+        # Base64 вставляется в уже сериализованное тело как bytes: символы base64
+        # не требуют экранирования в JSON, а многомегабайтная str не создаётся
+        head, tail = orjson.dumps(payload).split(_IMAGE_URL_PLACEHOLDER_JSON, 1)
+        body = b"".join((head, b'"data:image/jpeg;base64,', image_b64, b'"', tail))
+        
         response = await self._make_request(
             endpoint="/chat/completions",
             payload=payload,
-            method="POST"
+            method="POST",
+            body=body
         )
         
         try:
             # Извлечение текста из ответа
             content = response["choices"][0]["message"]["content"]
             logger.info(f"✅ Vision API ответ получен")
-            logger.debug(f"📝 Содержимое ответа Vision API:\n{content}")
+            logger.debug("📝 Содержимое ответа Vision API:\n%s", content)
             return content
         except (KeyError, IndexError, TypeError) as e:
             logger.error(f"❌ Ошибка парсинга ответа Vision API: {e}")
-            logger.debug(f"Ответ: {response}")
+            logger.debug("Ответ: %s", response)
             raise ValueError(f"Невозможно спарсить ответ Vision API: {e}")
     
     async def chat_completion(
@@ -136,6 +303,16 @@ class OpenRouterClient:
             "max_tokens": max_tokens,
         }
         
+        # Кэшируем только детерминированные запросы: при temperature > 0
+        # повторный запрос должен давать новый ответ
+        cache_key = None
+        if temperature == 0:
+            cache_key = self._cache_key("chat", orjson.dumps(payload).decode())
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("⚡ Chat completion ответ взят из кэша")
+                return cached
+        
         response = await self._make_request(
             endpoint="/chat/completions",
             payload=payload,
@@ -144,6 +321,8 @@ class OpenRouterClient:
         
         try:
             content = response["choices"][0]["message"]["content"]
+            if cache_key is not None:
+                self._cache_put(cache_key, content)
             logger.info(f"✅ Chat completion ответ получен")
             return content
         except (KeyError, IndexError, TypeError) as e:
@@ -154,7 +333,8 @@ class OpenRouterClient:
         self,
         endpoint: str,
         payload: Dict[str, Any],
-        method: str = "POST"
+        method: str = "POST",
+        body: Optional[bytes] = None
     ) -> Dict[str, Any]:
         """
         Базовый метод для выполнения HTTP запросов к OpenRouter
@@ -163,6 +343,7 @@ class OpenRouterClient:
             endpoint: Путь к API endpoint (/chat/completions, /audio/speech, etc.)
             payload: Тело запроса
             method: HTTP метод (POST, GET, etc.)
+            body: Уже сериализованное тело запроса (если None - сериализуется payload)
             
         Returns:
             Распарсенный JSON ответ
@@ -178,32 +359,46 @@ class OpenRouterClient:
         
         for attempt in range(self.max_retries):
             try:
-                logger.debug(f"🔄 Попытка {attempt + 1}/{self.max_retries}: {method} {url}")
+                logger.debug("🔄 Попытка %s/%s: %s %s", attempt + 1, self.max_retries, method, url)
                 
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    if method == "POST":
-                        response = await client.post(url, json=payload, headers=headers)
-                    elif method == "GET":
-                        response = await client.get(url, headers=headers)
-                    else:
-                        raise ValueError(f"Неподдерживаемый HTTP метод: {method}")
+                client = await self._get_http_client()
+                if method == "POST":
+                    # Тело сериализуем orjson один раз: длинная base64-строка изображения
+                    # не проходит через посимвольное экранирование stdlib json
+                    if body is None:
+                        body = orjson.dumps(payload)
+                    response = await client.post(url, content=body, headers=headers, timeout=self.timeout)
+                elif method == "GET":
+                    response = await client.get(url, headers=headers, timeout=self.timeout)
+                else:
+                    raise ValueError(f"Неподдерживаемый HTTP метод: {method}")
                 
                 # Проверка статуса ответа
                 if response.status_code == 200:
-                    logger.debug(f"✅ Успешный ответ (статус 200)")
+                    logger.debug("✅ Успешный ответ (статус 200)")
                     return response.json()
                 
                 elif response.status_code == 429:  # Rate limit
                     logger.warning(f"⚠️ Rate limit (429). Попытка {attempt + 1}/{self.max_retries}")
                     if attempt < self.max_retries - 1:
-                        # Экспоненциальная задержка перед повтором
-                        wait_time = (2 ** attempt) * 5  # 5, 10, 20, 40 секунд
-                        logger.info(f"⏳ Ожидание {wait_time} сек перед повторением...")
+                        # Экспоненциальная задержка (или Retry-After сервера) со случайной добавкой
+                        wait_time = self._retry_delay(response, (2 ** attempt) * 5)  # 5, 10, 20, 40 секунд
+                        logger.info(f"⏳ Ожидание {wait_time:.1f} сек перед повторением...")
                         await asyncio.sleep(wait_time)
                         continue
                     else:
                         raise RuntimeError(f"Rate limit после {self.max_retries} попыток")
                 
+                elif response.status_code >= 500:  # Временная ошибка сервера
+                    logger.warning(f"⚠️ Ошибка сервера ({response.status_code}). Попытка {attempt + 1}/{self.max_retries}")
+                    if attempt < self.max_retries - 1:
+                        wait_time = self._retry_delay(response, 2 ** attempt)
+                        logger.info(f"⏳ Ожидание {wait_time:.1f} сек перед повторением...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    else:
+                        raise RuntimeError(f"API ошибка: статус {response.status_code} после {self.max_retries} попыток")
+                
                 elif response.status_code == 401:
                     logger.error(f"❌ Неавторизованный запрос (401) - проверьте API ключ")
                     raise RuntimeError("API ключ невалиден или отсутствует")
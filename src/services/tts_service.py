@@ -5,12 +5,26 @@
 
 import logging
 import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Dict, Optional, Tuple
 import asyncio
-import tempfile
+import io
+import os
+import threading
 
-from config.settings import AUDIO_CACHE_DIR
+from config.settings import (
+    AUDIO_CACHE_DIR,
+    AUDIO_MEMORY_CACHE_SIZE,
+    AUDIO_MEMORY_CACHE_MAX_BYTES,
+    AUDIO_DISK_CACHE_MAX_MB,
+    AUDIO_DISK_CACHE_LOW_WATER,
+    TELEGRAM_FILE_ID_CACHE_SIZE,
+    AUDIO_PREFETCH_FILES,
+    TTS_WORKERS,
+)
 from config.models import TTS_MODEL_CONFIG
 from gtts import gTTS
 
@@ -18,22 +32,155 @@ logger = logging.getLogger(__name__)
 
 MAX_AUDIO_SIZE = 10 * 1024 * 1024 # 10 MB
 
+# Общий пул потоков для блокирующих запросов gTTS: генерации разных слов
+# идут параллельно, а размер пула ограничивает число одновременных запросов к Google
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+
+# Прогрев дискового кэша выполняется один раз на процесс
+_cache_warmed = False
+
+
+def _warm_cache(cache_dir: Path, limit: int = AUDIO_PREFETCH_FILES):
+    """
+    Подсказать ОС заранее прочитать в page cache недавно использованные аудио
+    (выполняется в фоне; первые ответы сессии читают файлы уже из памяти)
+    
+    Args:
+        cache_dir: Директория кэша аудио
+        limit: Сколько самых свежих файлов прогреть
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return  # Нет posix_fadvise (Windows) - прогрев не нужен
+    
+    try:
+        with os.scandir(cache_dir) as it:
+            mp3_entries = [e for e in it if e.name.endswith(".mp3") and e.is_file()]
+    except OSError as e:
+        logger.debug(f"⚠️ Прогрев кэша аудио пропущен: {e}")
+        return
+    
+    # Ошибка по одному файлу (например, его уже удалила очистка кэша) не прерывает прогрев остальных
+    entries = []
+    for entry in mp3_entries:
+        try:
+            entries.append((entry.stat().st_atime_ns, entry.path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    
+    warmed = 0
+    for _, path in entries[:limit]:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"⚠️ Не удалось прогреть {path}: {e}")
+            continue
+        warmed += 1
+    
+    logger.debug(f"🔥 Прогрето {warmed} аудио из кэша")
+
+
+@lru_cache(maxsize=4096)
+def _file_hash(word: str) -> str:
+    """
+    Хеш имени файла дискового кэша (md5 сохранён ради совместимости с уже
+    накопленными файлами; слова сессии повторяются, поэтому результат запоминается)
+    
+    Args:
+        word: Словарное слово
+        
+    Returns:
+        Хеш слова (8 первых символов)
+    """
+    return hashlib.md5(word.lower().strip().encode()).hexdigest()[:8]
+
+
+@lru_cache(maxsize=4096)
+def _cache_file(cache_dir: Path, word: str) -> Path:
+    """
+    Путь к файлу дискового кэша: Path собирается один раз на слово
+    
+    Args:
+        cache_dir: Директория кэша
+        word: Словарное слово
+        
+    Returns:
+        Полный путь к файлу кэша
+    """
+    return cache_dir / f"{_file_hash(word)}.mp3"
+
+
+@lru_cache(maxsize=4096)
+def _memory_key(word: str, lang: str, slow: bool) -> str:
+    """
+    Ключ LRU-кэша в памяти: blake2b нормализованного слова с языком и скоростью голоса в ключе
+    
+    Args:
+        word: Словарное слово
+        lang: Язык gTTS
+        slow: Замедленная речь
+        
+    Returns:
+        Шестнадцатеричный дайджест (16 байт)
+    """
+    return hashlib.blake2b(
+        word.lower().strip().encode('utf-8'),
+        digest_size=16,
+        key=f"{lang}:{int(slow)}".encode('utf-8')
+    ).hexdigest()
+
 
 class TTSService:
     """
     Сервис для генерации и кэширования аудио произношения слов
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        memory_cache_size: int = AUDIO_MEMORY_CACHE_SIZE,
+        memory_cache_max_bytes: int = AUDIO_MEMORY_CACHE_MAX_BYTES
+    ):
         """
         Инициализация TTS сервиса с gTTS
+        
+        Args:
+            memory_cache_size: Максимум аудио в LRU-кэше в памяти
+            memory_cache_max_bytes: Максимальный суммарный размер аудио в LRU-кэше
         """
         self.cache_dir = AUDIO_CACHE_DIR
         self.lang = TTS_MODEL_CONFIG.get("voice", "ru")  # Язык для gTTS
         self.slow = TTS_MODEL_CONFIG.get("slow", False)  # Нормальная скорость речи
         
+        # LRU-кэш в памяти перед дисковым кэшем: {blake2b(слово, ключ=язык+скорость): аудио_bytes}
+        self._memory_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_cache_size = memory_cache_size
+        self._memory_cache_max_bytes = memory_cache_max_bytes
+        self._memory_cache_bytes = 0
+        
+        # LRU-индекс дискового кэша: {имя файла: размер}, строится при первом обращении
+        self._disk_index: "Optional[OrderedDict[str, int]]" = None
+        self._disk_bytes = 0
+        self._disk_max_bytes = AUDIO_DISK_CACHE_MAX_MB * 1024 * 1024
+        
+        # file_id уже загруженных в Telegram аудио: {ключ слова: file_id}
+        # Повторная отправка по file_id не передаёт байты аудио вовсе
+        self._telegram_file_ids: "OrderedDict[str, str]" = OrderedDict()
+        
+        # Генерации в процессе: {ключ слова: Future с аудио}
+        # Одновременные запросы одного слова ждут одну генерацию
+        self._inflight: Dict[str, "asyncio.Future[Optional[bytes]]"] = {}
+        
         # Создание папки кэша если не существует
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        global _cache_warmed
+        if not _cache_warmed:
+            _cache_warmed = True
+            _tts_executor.submit(_warm_cache, self.cache_dir)
         logger.info(f"✅ TTSService инициализирован (язык: {self.lang}, кэш: {self.cache_dir})")
     
     def _get_word_hash(self, word: str) -> str:
@@ -46,9 +193,7 @@ class TTSService:
         Returns:
             Хеш слова (8 первых символов)
         """
-        word_lower = word.lower().strip()
-        word_hash = hashlib.md5(word_lower.encode()).hexdigest()[:8]
-        return word_hash
+        return _file_hash(word)
     
     def _get_cache_path(self, word: str) -> Path:
         """
@@ -60,33 +205,213 @@ class TTSService:
         Returns:
             Полный путь к файлу кэша
         """
-        word_hash = self._get_word_hash(word)
-        return self.cache_dir / f"{word_hash}.mp3"
+        return _cache_file(self.cache_dir, word)
     
-    def get_cached_audio(self, word: str) -> Optional[bytes]:
+    def _get_memory_key(self, word: str) -> str:
         """
-        Получить аудио из кэша если существует
+        Ключ для LRU-кэша в памяти
         
         Args:
             word: Словарное слово
             
         Returns:
-            Аудиофайл в формате bytes или None если нет в кэше
+            Дайджест нормализованного слова с учётом языка и скорости голоса
         """
-        cache_path = self._get_cache_path(word)
+        return _memory_key(word, self.lang, self.slow)
+    
+    def _remember_audio(self, key: str, audio_bytes: bytes):
+        """
+        Положить аудио в LRU-кэш в памяти, вытесняя самые старые записи
+        при превышении лимита по количеству или по суммарному размеру
+        
+        Args:
+            key: Ключ из _get_memory_key
+            audio_bytes: Аудиофайл в формате bytes
+        """
+        previous = self._memory_cache.pop(key, None)
+        if previous is not None:
+            self._memory_cache_bytes -= len(previous)
+        
+        self._memory_cache[key] = audio_bytes
+        self._memory_cache_bytes += len(audio_bytes)
+        while self._memory_cache and (
+            len(self._memory_cache) > self._memory_cache_size
+            or self._memory_cache_bytes > self._memory_cache_max_bytes
+        ):
+            _, evicted = self._memory_cache.popitem(last=False)
+            self._memory_cache_bytes -= len(evicted)
+    
+    def _load_disk_index(self) -> "OrderedDict[str, int]":
+        """
+        Построить LRU-индекс дискового кэша одним проходом по директории
+        (файлы упорядочены по времени последнего доступа, старые - в начале)
+        
+        Returns:
+            Индекс {имя файла: размер}
+        """
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".mp3") and entry.is_file():
+                        stat = entry.stat()
+                        # При noatime время доступа не обновляется - берём более позднее из atime/mtime
+                        entries.append((max(stat.st_atime_ns, stat.st_mtime_ns), entry.name, stat.st_size))
+        except FileNotFoundError:
+            pass
+        
+        entries.sort()
+        self._disk_index = OrderedDict((name, size) for _, name, size in entries)
+        self._disk_bytes = sum(self._disk_index.values())
+        return self._disk_index
+    
+    def _touch_disk_entry(self, name: str, size: int):
+        """
+        Отметить файл дискового кэша как недавно использованный
+        
+        Args:
+            name: Имя файла в директории кэша
+            size: Размер файла в байтах
+        """
+        index = self._disk_index if self._disk_index is not None else self._load_disk_index()
+        previous = index.pop(name, None)
+        if previous is not None:
+            self._disk_bytes -= previous
+        index[name] = size
+        self._disk_bytes += size
+    
+    def _evict_disk_cache(self):
+        """
+        Удалить давно не использованные файлы, если дисковый кэш превысил предел
+        (удаление идёт до нижней границы, чтобы не вытеснять по одному файлу на каждое сохранение)
+        """
+        index = self._disk_index
+        if index is None or self._disk_bytes <= self._disk_max_bytes:
+            return
         
-        if cache_path.exists():
+        low_water = self._disk_max_bytes * AUDIO_DISK_CACHE_LOW_WATER
+        evicted = 0
+        while index and self._disk_bytes > low_water:
+            name, size = index.popitem(last=False)
+            self._disk_bytes -= size
             try:
-                audio_bytes = cache_path.read_bytes()
-                logger.info(f"📦 Аудио для '{word}' получено из кэша ({len(audio_bytes)} байт)")
-                return audio_bytes
+                (self.cache_dir / name).unlink()
+                evicted += 1
+            except FileNotFoundError:
+                pass
             except Exception as e:
-                logger.error(f"❌ Ошибка при чтении кэша для '{word}': {e}")
-                return None
+                logger.warning(f"⚠️ Не удалось удалить файл кэша {name}: {e}")
+        
+        logger.info(f"🧹 Из дискового кэша аудио вытеснено {evicted} файлов ({self._disk_bytes / (1024 * 1024):.1f} МБ осталось)")
+    
+    def get_telegram_file_id(self, word: str) -> Optional[str]:
+        """
+        Получить file_id аудио, уже загруженного в Telegram
+        
+        Args:
+            word: Словарное слово
+            
+        Returns:
+            file_id или None если аудио этого слова ещё не отправлялось
+        """
+        key = self._get_memory_key(word)
+        file_id = self._telegram_file_ids.get(key)
+        if file_id is not None:
+            self._telegram_file_ids.move_to_end(key)
+        return file_id
+    
+    def remember_telegram_file_id(self, word: str, file_id: Optional[str]):
+        """
+        Запомнить file_id загруженного в Telegram аудио (None - забыть устаревший)
+        
+        Args:
+            word: Словарное слово
+            file_id: file_id из ответа Telegram
+        """
+        key = self._get_memory_key(word)
+        if file_id is None:
+            self._telegram_file_ids.pop(key, None)
+            return
+        
+        self._telegram_file_ids[key] = file_id
+        self._telegram_file_ids.move_to_end(key)
+        while len(self._telegram_file_ids) > TELEGRAM_FILE_ID_CACHE_SIZE:
+            self._telegram_file_ids.popitem(last=False)
+    
+    def _get_memory_audio(self, word: str) -> Optional[bytes]:
+        """
+        Получить аудио из LRU-кэша в памяти
+        
+        Args:
+            word: Словарное слово
+            
+        Returns:
+            Аудиофайл в формате bytes или None если в памяти нет
+        """
+        memory_key = self._get_memory_key(word)
+        audio_bytes = self._memory_cache.get(memory_key)
+        if audio_bytes is not None:
+            self._memory_cache.move_to_end(memory_key)
+            logger.debug(f"⚡ Аудио для '{word}' получено из памяти ({len(audio_bytes)} байт)")
+        return audio_bytes
+    
+    @staticmethod
+    def _read_disk_audio(word: str, cache_path: Path) -> Optional[bytes]:
+        """
+        Прочитать аудио из файла дискового кэша (не трогает состояние сервиса,
+        поэтому может выполняться в потоке пула)
         
-        logger.debug(f"📭 Аудио для '{word}' не найдено в кэше")
+        Args:
+            word: Словарное слово (для логов)
+            cache_path: Путь к файлу кэша
+            
+        Returns:
+            Аудиофайл в формате bytes или None если файла нет
+        """
+        # Файл читается сразу, без отдельной проверки exists() - отсутствие видно по исключению
+        try:
+            return cache_path.read_bytes()
+        except FileNotFoundError:
+            logger.debug(f"📭 Аудио для '{word}' не найдено в кэше")
+        except Exception as e:
+            logger.error(f"❌ Ошибка при чтении кэша для '{word}': {e}")
         return None
     
+    def _remember_disk_audio(self, word: str, cache_path: Path, audio_bytes: bytes):
+        """
+        Учесть попадание в дисковый кэш: положить аудио в память и обновить LRU-индекс диска
+        
+        Args:
+            word: Словарное слово
+            cache_path: Путь к файлу кэша
+            audio_bytes: Прочитанное аудио
+        """
+        self._remember_audio(self._get_memory_key(word), audio_bytes)
+        if self._disk_index is not None:
+            self._touch_disk_entry(cache_path.name, len(audio_bytes))
+        logger.info(f"📦 Аудио для '{word}' получено из кэша ({len(audio_bytes)} байт)")
+    
+    def get_cached_audio(self, word: str) -> Optional[bytes]:
+        """
+        Получить аудио из кэша если существует
+        Сначала проверяется LRU-кэш в памяти, затем файл на диске
+        
+        Args:
+            word: Словарное слово
+            
+        Returns:
+            Аудиофайл в формате bytes или None если нет в кэше
+        """
+        audio_bytes = self._get_memory_audio(word)
+        if audio_bytes is not None:
+            return audio_bytes
+        
+        cache_path = self._get_cache_path(word)
+        audio_bytes = self._read_disk_audio(word, cache_path)
+        if audio_bytes is not None:
+            self._remember_disk_audio(word, cache_path, audio_bytes)
+        return audio_bytes
+    
     def save_to_cache(self, word: str, audio_bytes: bytes) -> bool:
         """
         Сохранить аудио в кэш
@@ -104,9 +429,21 @@ class TTSService:
             logger.warning(f"⚠️ Аудио для '{word}' слишком большое ({len(audio_bytes)} байт), не будет сохранено.")
             return False
 
+        self._remember_audio(self._get_memory_key(word), audio_bytes)
+        
+        # Запись во временный файл и атомарная подмена: читатели видят либо старый,
+        # либо полный новый файл. fsync не нужен - кэш можно сгенерировать заново
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
         try:
-            cache_path.write_bytes(audio_bytes)
+            try:
+                tmp_path.write_bytes(audio_bytes)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
             logger.info(f"💾 Аудио для '{word}' сохранено в кэш ({len(audio_bytes)} байт)")
+            self._touch_disk_entry(cache_path.name, len(audio_bytes))
+            self._evict_disk_cache()
             return True
         except Exception as e:
             logger.error(f"❌ Ошибка при сохранении аудио в кэш для '{word}': {e}")
@@ -117,10 +454,11 @@ class TTSService:
         Генерация или получение аудио для слова
         
         Алгоритм:
-        1. Проверка кэша - если есть, возвращаем готовое аудио
-        2. Если нет в кэше - генерация через gTTS
-        3. Сохранение в кэш
-        4. Возврат аудио
+        1. Проверка кэша (память → диск) - если есть, возвращаем готовое аудио
+        2. Если это слово уже генерируется - ждём ту же генерацию
+        3. Если нет в кэше - генерация через gTTS
+        4. Сохранение в кэш
+        5. Возврат аудио
         
         Args:
             word: Словарное слово для озвучивания
@@ -135,96 +473,159 @@ class TTSService:
         if cached_audio:
             return cached_audio
         
-        # Шаг 2: Генерация аудио через gTTS
+        # Шаг 2: Присоединяемся к уже идущей генерации этого слова
+        key = self._get_memory_key(word)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.debug(f"⏳ Аудио для '{word}' уже генерируется, ожидаем результат")
+            return await asyncio.shield(inflight)
+        
+        # Шаг 3: Генерация через gTTS (с сохранением в кэш)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        audio_bytes = None
         try:
-            # Используем временный файл для сохранения MP3 с gTTS
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp_file:
-                tmp_path = tmp_file.name
+            audio_bytes = await self._synthesize(word)
+        finally:
+            self._inflight.pop(key, None)
+            future.set_result(audio_bytes)
+        
+        return audio_bytes
+    
+    def _sync_generate(self, word: str) -> bytes:
+        """
+        Синхронная генерация аудио через gTTS (выполняется в потоке пула)
+        
+        Args:
+            word: Словарное слово для озвучивания
             
-            try:
-                # Генерируем аудио через gTTS
-                tts = gTTS(text=word, lang=self.lang, slow=self.slow)
-                tts.save(tmp_path)
-                
-                # Читаем аудиофайл
-                audio_bytes = Path(tmp_path).read_bytes()
-                
-                # Шаг 3: Сохранение в кэш
-                self.save_to_cache(word, audio_bytes)
-                
-                logger.info(f"✅ Аудио для '{word}' успешно сгенерировано ({len(audio_bytes)} байт)")
-                return audio_bytes
+        Returns:
+            Аудиофайл в формате bytes
+        """
+        # Генерируем аудио сразу в память, без временного файла
+        tts = gTTS(text=word, lang=self.lang, slow=self.slow)
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        return buffer.getvalue()
+    
+    async def _synthesize(self, word: str) -> Optional[bytes]:
+        """
+        Генерация аудио через gTTS и сохранение в кэш
+        
+        Args:
+            word: Словарное слово для озвучивания
             
-            finally:
-                # Удаляем временный файл
-                temp_path_obj = Path(tmp_path)
-                if temp_path_obj.exists():
-                    temp_path_obj.unlink()
+        Returns:
+            Аудиофайл в формате bytes или None при ошибке
+        """
+        try:
+            # Сетевой запрос gTTS блокирующий - выполняется в пуле потоков
+            audio_bytes = await asyncio.get_running_loop().run_in_executor(
+                _tts_executor, self._sync_generate, word
+            )
+            
+            # Сохранение в кэш
+            self.save_to_cache(word, audio_bytes)
+            
+            logger.info(f"✅ Аудио для '{word}' успешно сгенерировано ({len(audio_bytes)} байт)")
+            return audio_bytes
         
         except Exception as e:
             logger.error(f"❌ Ошибка при генерации аудио для '{word}': {e}")
             return None
     
-    async def batch_generate_audio(self, words: list) -> dict:
+    async def _generate_pair(self, word: str) -> Tuple[str, Optional[bytes]]:
         """
-        Генерация аудио для списка слов
-        Слова из кэша получаются последовательно (быстро), но новые генерируются параллельно
+        Сгенерировать аудио и вернуть его вместе со словом (для as_completed)
         
         Args:
-            words: Список слов для озвучивания
+            word: Словарное слово для озвучивания
             
         Returns:
-            Словарь {слово: аудио_bytes или None при ошибке}
+            Кортеж (слово, аудио_bytes или None при ошибке)
         """
-        logger.info(f"🔊 Batch-генерация аудио для {len(words)} слов (параллельная обработка)")
+        try:
+            return word, await self.generate_audio(word)
+        except Exception as e:
+            logger.error(f"❌ Ошибка при генерации аудио для '{word}': {e}")
+            return word, None
+    
+    async def batch_generate_audio_iter(self, words: list) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """
+        Генерация аудио для списка слов с выдачей результатов по мере готовности
+        Сначала сразу выдаются слова из кэша, затем сгенерированные - в порядке завершения
         
-        results = {}
-        cached_count = 0
+        Args:
+            words: Список слов для озвучивания (повторы обрабатываются один раз)
+            
+        Yields:
+            Кортежи (слово, аудио_bytes или None при ошибке)
+        """
         words_to_generate = []  # Слова, которые нужно сгенерировать
-        words_positions = {}  # Для сохранения позиции слова
+        words_on_disk = []  # Слова, которых нет в памяти - проверяются на диске
         
-        # Шаг 1: Проверяем кэш для всех слов
-        for word in words:
-            cached_audio = self.get_cached_audio(word)
+        # Шаг 1: Слова из памяти отдаём сразу
+        for word in dict.fromkeys(words):
+            cached_audio = self._get_memory_audio(word)
             if cached_audio:
-                results[word] = cached_audio
-                cached_count += 1
+                yield word, cached_audio
             else:
-                words_to_generate.append(word)
-                words_positions[word] = len(results)
+                words_on_disk.append(word)
+        
+        # Шаг 2: Файлы дискового кэша читаются параллельно в пуле потоков, не блокируя event loop;
+        # учёт попаданий (память, LRU-индекс) - снова в event loop.
+        # Чтение идёт не через _tts_executor: попадания в кэш не ждут медленных запросов gTTS
+        if words_on_disk:
+            paths = [self._get_cache_path(word) for word in words_on_disk]
+            disk_audios = await asyncio.gather(*(
+                asyncio.to_thread(self._read_disk_audio, word, path)
+                for word, path in zip(words_on_disk, paths)
+            ))
+            for word, path, cached_audio in zip(words_on_disk, paths, disk_audios):
+                if cached_audio:
+                    self._remember_disk_audio(word, path, cached_audio)
+                    yield word, cached_audio
+                else:
+                    words_to_generate.append(word)
         
-        logger.info(f"📦 Найдено в кэше: {cached_count}, требуется генерация: {len(words_to_generate)}")
+        if not words_to_generate:
+            return
         
-        # Шаг 2: Генерируем новые аудио параллельно
-        if words_to_generate:
-            generate_tasks = [
-                self.generate_audio(word) for word in words_to_generate
-            ]
-            generated_audios = await asyncio.gather(*generate_tasks, return_exceptions=True)
-            
-            generated_count = 0
-            failed_count = 0
+        logger.info(f"🔄 Требуется генерация аудио: {len(words_to_generate)} слов")
+        
+        # Шаг 3: Новые аудио генерируются параллельно и отдаются по мере готовности
+        tasks = [asyncio.ensure_future(self._generate_pair(word)) for word in words_to_generate]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Если вызывающий прекратил итерацию раньше - не оставляем висящих задач
+            for task in tasks:
+                task.cancel()
+    
+    async def batch_generate_audio(self, words: list) -> dict:
+        """
+        Генерация аудио для списка слов
+        Слова из кэша получаются последовательно (быстро), но новые генерируются параллельно
+        
+        Args:
+            words: Список слов для озвучивания
             
-            for word, audio in zip(words_to_generate, generated_audios):
-                if isinstance(audio, Exception):
-                    logger.error(f"❌ Ошибка при генерации аудио для '{word}': {audio}")
-                    results[word] = None
-                    failed_count += 1
-                elif audio is not None:
-                    results[word] = audio
-                    generated_count += 1
-                else:
-                    results[word] = None
-                    failed_count += 1
-        else:
-            generated_count = 0
-            failed_count = 0
+        Returns:
+            Словарь {слово: аудио_bytes или None при ошибке}
+        """
+        logger.info(f"🔊 Batch-генерация аудио для {len(words)} слов (параллельная обработка)")
         
+        # Результаты заранее в порядке исходного списка (без повторов), по умолчанию None
+        results = dict.fromkeys(words)
+        async for word, audio in self.batch_generate_audio_iter(words):
+            results[word] = audio
+        
+        ready_count = sum(1 for audio in results.values() if audio is not None)
         logger.info(
             f"✅ Batch-генерация завершена: "
-            f"{generated_count} новых, "
-            f"{cached_count} из кэша, "
-            f"{failed_count} ошибок"
+            f"{ready_count} готово, "
+            f"{len(results) - ready_count} ошибок"
         )
         
         return results
@@ -236,11 +637,25 @@ class TTSService:
         Returns:
             True если успешно, False если ошибка
         """
+        self._memory_cache.clear()
+        self._memory_cache_bytes = 0
+        self._disk_index = None
+        self._disk_bytes = 0
+        self._telegram_file_ids.clear()
+        
         try:
-            import shutil
-            shutil.rmtree(self.cache_dir)
+            # Удаляем файлы по одному, сама директория остаётся на месте
             self.cache_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"✅ Кэш аудио очищен")
+            deleted = 0
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".mp3"):
+                        try:
+                            os.unlink(entry.path)
+                            deleted += 1
+                        except FileNotFoundError:
+                            pass
+            logger.info(f"✅ Кэш аудио очищен ({deleted} файлов)")
             return True
         except Exception as e:
             logger.error(f"❌ Ошибка при очистке кэша: {e}")
@@ -254,13 +669,26 @@ class TTSService:
             Словарь с информацией о кэше
         """
         if not self.cache_dir.exists():
-            return {"total_files": 0, "total_size_mb": 0}
+            return {
+                "total_files": 0,
+                "total_size_mb": 0,
+                "memory_entries": len(self._memory_cache),
+                "memory_size_mb": round(self._memory_cache_bytes / (1024 * 1024), 2)
+            }
         
-        total_files = len(list(self.cache_dir.glob("*.mp3")))
-        total_size = sum(f.stat().st_size for f in self.cache_dir.glob("*.mp3"))
+        # Один проход по директории: и количество, и суммарный размер
+        total_files = 0
+        total_size = 0
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".mp3") and entry.is_file():
+                    total_files += 1
+                    total_size += entry.stat().st_size
         
         return {
             "total_files": total_files,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
+            "memory_entries": len(self._memory_cache),
+            "memory_size_mb": round(self._memory_cache_bytes / (1024 * 1024), 2),
             "cache_dir": str(self.cache_dir)
         }
@@ -6,11 +6,29 @@
 import json
 import logging
 import asyncio
+import os
+import orjson
+from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
-from config.settings import VARIANTS_CACHE_DIR, VARIANTS_COUNT
-from config.models import VARIANT_GENERATION_MODEL
+from config.settings import (
+    VARIANTS_CACHE_DIR,
+    VARIANTS_COUNT,
+    VARIANTS_ALGORITHMIC_FIRST,
+    VARIANTS_MEMORY_CACHE_SIZE,
+)
+from config.models import (
+    VARIANT_GENERATION_MODEL,
+    FALLBACK_MODEL,
+    VARIANT_RESPONSE_BASE_TOKENS,
+    VARIANT_RESPONSE_TOKENS_PER_WORD,
+    VARIANT_BATCH_CHUNK_SIZE,
+    VARIANT_BATCH_CONCURRENCY,
+    VARIANT_FALLBACK_CONCURRENCY,
+    VARIANT_MODEL_HEDGE_DELAY,
+)
 from config.prompts import (
     get_variant_generation_batch_prompt,
     get_variant_generation_single_prompt,
@@ -28,6 +46,80 @@ from src.utils.word_helpers import (
 
 logger = logging.getLogger(__name__)
 
+# Индекс файлов кэша вариантов: {директория кэша: {хеш слова: путь к файлу}}
+# Общий для всех экземпляров сервиса (у photo_handler и learning_handler они свои),
+# строится одним проходом по директории и пополняется при сохранении
+_cache_indexes: Dict[Path, Dict[str, Path]] = {}
+
+
+def _get_cache_index(cache_dir: Path) -> Dict[str, Path]:
+    """
+    Получить индекс файлов кэша вариантов (при первом обращении - одним os.scandir)
+    
+    Args:
+        cache_dir: Директория кэша вариантов
+        
+    Returns:
+        Словарь {хеш слова: путь к файлу кэша}
+    """
+    index = _cache_indexes.get(cache_dir)
+    if index is None:
+        index = {}
+        try:
+            with os.scandir(cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json"):
+                        index[entry.name[:-5]] = Path(entry.path)
+        except FileNotFoundError:
+            pass
+        _cache_indexes[cache_dir] = index
+        logger.debug(f"📇 Индекс кэша вариантов построен: {len(index)} файлов")
+    return index
+
+
+# LRU-кэш вариантов в памяти перед диском: {(директория кэша, хеш слова): [варианты]}
+# Общий для всех экземпляров, чтобы сохранение из одного экземпляра сразу видели остальные
+_memory_cache: "OrderedDict[Tuple[Path, str], List[str]]" = OrderedDict()
+_memory_stats = {"hits": 0, "misses": 0}
+
+
+def _remember_variants(cache_dir: Path, word_hash: str, variants: List[str]):
+    """
+    Положить варианты в LRU-кэш в памяти (с вытеснением самых старых)
+    
+    Args:
+        cache_dir: Директория кэша вариантов
+        word_hash: Хеш слова
+        variants: Список неправильных вариантов
+    """
+    key = (cache_dir, word_hash)
+    _memory_cache[key] = variants
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > VARIANTS_MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+
+# Запасной разбор JSON из ответа LLM прямо по исходной строке (raw_decode),
+# если между первой и последней скобкой не чистый JSON
+_JSON_DECODER = json.JSONDecoder()
+
+# Таблицы замен для алгоритмической генерации вариантов
+_VOWEL_SUBSTITUTIONS = (('о', 'а'), ('а', 'о'), ('е', 'и'), ('и', 'е'), ('я', 'е'))
+_PAIRED_CONSONANTS = (
+    ('д', 'т'), ('т', 'д'), ('б', 'п'), ('п', 'б'),
+    ('г', 'к'), ('к', 'г'), ('в', 'ф'), ('ф', 'в'),
+    ('ж', 'ш'), ('ш', 'ж'), ('з', 'с'), ('с', 'з'),
+)
+_DOUBLABLE_CONSONANTS = 'крлнмстбпвгджзшщ'
+_VOWELS = frozenset('аеиоуюяё')
+_CONSONANTS = frozenset('бвгджзклмнпрстфхцчшщ')
+_INSERTED_VOWELS = 'аеиоу'
+
+
+# Генерации вариантов в процессе: {хеш слова: Future с вариантами или None}
+# Общие для всех экземпляров: одновременные вызовы не запрашивают одно слово дважды
+_inflight: Dict[str, "asyncio.Future[Optional[List[str]]]"] = {}
+
 
 class VariantGeneratorService:
     """
@@ -78,7 +170,7 @@ class VariantGeneratorService:
         
         # Шаг 1: Проверка кэша для всех слов
         logger.debug(f"🔍 Проверка кэша для всех слов...")
-        cached_variants = self._load_cached_variants(words_list)
+        cached_variants = await self._aload_cached_variants(words_list)
         cached_words = set(cached_variants.keys())
         uncached_words = [w for w in words_list if w not in cached_words]
         
@@ -91,6 +183,136 @@ class VariantGeneratorService:
             logger.info(f"✅ Все варианты уже в кэше! Возвращаю из кэша...")
             return cached_variants
         
+        # Шаги 2-5: генерация; слова, которые уже генерирует другой вызов, не запрашиваются повторно
+        parsed_variants = await self._generate_coalesced(uncached_words)
+        
+        # Шаг 6: Комбинируем с уже закэшированными
+        result = {**cached_variants, **parsed_variants}
+        
+        logger.info(f"✅ Batch-генерация завершена! Всего вариантов: {len(result)}")
+        return result
+    
+    async def _generate_coalesced(self, uncached_words: List[str]) -> Dict[str, List[str]]:
+        """
+        Сгенерировать варианты для слов, объединяя одновременные запросы:
+        слова, которые уже генерирует другой вызов, ожидают его результат,
+        а в LLM отправляются только остальные
+        
+        Args:
+            uncached_words: Слова, которых нет в кэше
+            
+        Returns:
+            Словарь {слово: [варианты]} для слов, которые удалось сгенерировать
+        """
+        loop = asyncio.get_running_loop()
+        waiting = {}     # Слова, которые генерирует другой вызов: {слово: Future}
+        owned = {}       # Собственные генерации: {хеш слова: Future}
+        to_request = []  # Слова для собственного запроса
+        
+        for word in uncached_words:
+            key = get_word_hash(word)
+            if key in owned:
+                continue  # Повтор слова в том же списке
+            future = _inflight.get(key)
+            if future is not None:
+                waiting[word] = future
+                continue
+            future = loop.create_future()
+            _inflight[key] = future
+            owned[key] = future
+            to_request.append(word)
+        
+        generated = {}
+        if to_request:
+            try:
+                generated = await self._generate_uncached(to_request)
+            finally:
+                # Результат (или None при ошибке) получают и ожидающие вызовы
+                for word in to_request:
+                    key = get_word_hash(word)
+                    _inflight.pop(key, None)
+                    future = owned[key]
+                    if not future.done():
+                        future.set_result(generated.get(word))
+        
+        if waiting:
+            logger.info(f"⏳ {len(waiting)} слов уже генерируются другим запросом, ожидаю результат")
+            for word, future in waiting.items():
+                variants = await asyncio.shield(future)
+                if variants:
+                    generated[word] = variants
+        
+        return generated
+    
+    async def _generate_uncached(self, uncached_words: List[str]) -> Dict[str, List[str]]:
+        """
+        Сгенерировать варианты для слов без кэша: batch-запрос к LLM, валидация,
+        fallback для непрошедших слов и сохранение в кэш
+        
+        Args:
+            uncached_words: Слова, которых нет в кэше
+            
+        Returns:
+            Словарь {слово: [варианты]} для слов, которые удалось сгенерировать
+        """
+        # Дешёвая ступень (если включена): алгоритмическая генерация без API,
+        # в LLM уходят только слова, для которых она не справилась
+        if VARIANTS_ALGORITHMIC_FIRST:
+            cheap_variants = await asyncio.to_thread(self._algorithmic_generation_many, uncached_words)
+            need_llm = [word for word in uncached_words if word not in cheap_variants]
+            
+            await self._asave_variants_bulk(cheap_variants)
+            logger.info(f"🔧 Алгоритмически: {len(cheap_variants)} слов, в LLM: {len(need_llm)}")
+            if not need_llm:
+                return cheap_variants
+            
+            generated = await self._generate_uncached_llm(need_llm)
+            return {**cheap_variants, **generated}
+        
+        return await self._generate_uncached_llm(uncached_words)
+    
+    async def _generate_uncached_llm(self, uncached_words: List[str]) -> Dict[str, List[str]]:
+        """
+        Сгенерировать варианты через LLM: длинный список делится на части по
+        VARIANT_BATCH_CHUNK_SIZE слов, части запрашиваются параллельно (не больше
+        VARIANT_BATCH_CONCURRENCY одновременно), ошибка одной части не затрагивает остальные
+        
+        Args:
+            uncached_words: Слова для генерации
+            
+        Returns:
+            Словарь {слово: [варианты]} для слов, которые удалось сгенерировать
+        """
+        if len(uncached_words) <= VARIANT_BATCH_CHUNK_SIZE:
+            return await self._generate_chunk_llm(uncached_words)
+        
+        chunks = [
+            uncached_words[i:i + VARIANT_BATCH_CHUNK_SIZE]
+            for i in range(0, len(uncached_words), VARIANT_BATCH_CHUNK_SIZE)
+        ]
+        logger.info(f"✂️ {len(uncached_words)} слов разбиты на {len(chunks)} batch-запросов")
+        
+        semaphore = asyncio.Semaphore(VARIANT_BATCH_CONCURRENCY)
+        
+        async def generate_chunk(chunk: List[str]) -> Dict[str, List[str]]:
+            async with semaphore:
+                return await self._generate_chunk_llm(chunk)
+        
+        generated = {}
+        for chunk_variants in await asyncio.gather(*(generate_chunk(chunk) for chunk in chunks)):
+            generated.update(chunk_variants)
+        return generated
+    
+    async def _generate_chunk_llm(self, uncached_words: List[str]) -> Dict[str, List[str]]:
+        """
+        Сгенерировать варианты через LLM (batch-запрос, валидация, fallback) и сохранить в кэш
+        
+        Args:
+            uncached_words: Слова для генерации (одна часть списка)
+            
+        Returns:
+            Словарь {слово: [варианты]} для слов, которые удалось сгенерировать
+        """
         # Шаг 2-3: Batch-запрос к OpenRouter для uncached_words
         logger.info(f"📤 Отправляю batch-запрос для {len(uncached_words)} слов...")
         batch_response = await self._request_batch_variants(uncached_words)
@@ -99,19 +321,12 @@ class VariantGeneratorService:
             logger.error(f"❌ Batch-запрос вернул пустой результат")
             # Используем алгоритмическую генерацию как fallback
             logger.info(f"🔧 Используем алгоритмическую генерацию для {len(uncached_words)} слов...")
-            for word in uncached_words:
-                try:
-                    variants = self._algorithmic_generation(word)
-                    if variants:
-                        self._save_variants_to_cache(word, variants)
-                        logger.info(f"✅ Алгоритмическая генерация для '{word}'")
-                except Exception as e:
-                    logger.warning(f"⚠️ Ошибка при алгоритмической генерации '{word}': {e}")
+            generated = await asyncio.to_thread(self._algorithmic_generation_many, uncached_words)
             
-            # Загружаем алгоритмически сгенерированные варианты
-            cached_variants.update(self._load_cached_variants(uncached_words))
-            logger.info(f"✅ Алгоритмическая генерация завершена! Вариантов: {len(cached_variants)}")
-            return cached_variants
+            # Сохраняем все алгоритмически сгенерированные варианты одним шагом
+            await self._asave_variants_bulk(generated)
+            logger.info(f"✅ Алгоритмическая генерация завершена! Вариантов: {len(generated)}")
+            return generated
         
         # Шаг 4: Парсинг и валидация
         logger.debug(f"🔍 Парсинг и валидация batch-ответа...")
@@ -122,9 +337,8 @@ class VariantGeneratorService:
         # Если были ошибки валидации - fallback
         if validation_errors:
             logger.warning(f"⚠️ Ошибки при валидации {len(validation_errors)} слов: {validation_errors}")
-            await self._fallback_generation_for_failed_words(validation_errors)
-            # Загружаем только те варианты, которые успешно были сгенерированы в fallback
-            fallback_variants = self._load_cached_variants(validation_errors)
+            # Fallback возвращает результаты сразу; в кэш они попадут вместе с остальными на шаге 5
+            fallback_variants = await self._fallback_generation_for_failed_words(validation_errors)
             if fallback_variants:
                 parsed_variants.update(fallback_variants)
                 logger.info(f"✅ Fallback восстановил {len(fallback_variants)} слов")
@@ -133,16 +347,10 @@ class VariantGeneratorService:
         
         # Шаг 5: Сохранение в кэш
         logger.debug(f"💾 Сохранение вариантов в кэш...")
-        for word, variants in parsed_variants.items():
-            self._save_variants_to_cache(word, variants)
+        await self._asave_variants_bulk(parsed_variants)
         
         logger.info(f"✅ Успешно сгенерировано вариантов для {len(parsed_variants)} слов")
-        
-        # Шаг 6: Комбинируем с уже закэшированными
-        result = {**cached_variants, **parsed_variants}
-        
-        logger.info(f"✅ Batch-генерация завершена! Всего вариантов: {len(result)}")
-        return result
+        return parsed_variants
     
     # ========================================================================
     # ЗАПРОС К LLM
@@ -177,13 +385,12 @@ class VariantGeneratorService:
                 }
             ]
             
-            # Запрос к OpenRouter
+            # Запрос к OpenRouter (с резервной моделью при 403 или долгом ответе)
             logger.info(f"🔄 Отправляю запрос к {VARIANT_GENERATION_MODEL}...")
-            response = await self.client.chat_completion(
-                messages=messages,
-                model=VARIANT_GENERATION_MODEL,
-                temperature=0.7,
-                max_tokens=1000 + len(words_list) * 100  # Динамически зависит от количества слов
+            response = await self._request_with_model_hedge(
+                messages,
+                # Динамически зависит от количества слов: ответ - короткий JSON, лишний резерв только замедляет
+                max_tokens=VARIANT_RESPONSE_BASE_TOKENS + len(words_list) * VARIANT_RESPONSE_TOKENS_PER_WORD
             )
             
             logger.debug(f"✅ Получен ответ ({len(response)} символов)")
@@ -191,35 +398,76 @@ class VariantGeneratorService:
             return response
         
         except Exception as e:
-            error_msg = str(e)
             logger.error(f"❌ Ошибка при batch-запросе: {e}")
+            logger.info(f"🔄 Пробую алгоритмическую генерацию для {len(words_list)} слов...")
+            # Последний resort - используем алгоритмическую генерацию
+            return None
+    
+    async def _request_with_model_hedge(self, messages: List[Dict], max_tokens: int) -> str:
+        """
+        Запрос к основной модели с резервной моделью наперегонки
+        
+        Если основная модель не ответила за VARIANT_MODEL_HEDGE_DELAY секунд, параллельно
+        запускается запрос к резервной: побеждает первый успешный ответ, второй запрос отменяется.
+        Ошибка 403 основной модели сразу переключает на резервную.
+        
+        Args:
+            messages: Сообщения для chat_completion
+            max_tokens: Максимум токенов в ответе
             
-            # Проверяем если это ошибка 403 (доступ запрещен)
-            if "403" in error_msg:
-                logger.warning(f"⚠️ Ошибка 403 при работе с {VARIANT_GENERATION_MODEL}")
-                logger.warning(f"   Пробую резервную модель: {VARIANT_GENERATION_MODEL}")
-                
-                # Пробуем fallback модель
-                from config.models import FALLBACK_MODEL
-                logger.info(f"🔄 Переключаюсь на резервную модель {FALLBACK_MODEL}...")
-                
-                try:
-                    response = await self.client.chat_completion(
-                        messages=messages,
-                        model=FALLBACK_MODEL,
-                        temperature=0.7,
-                        max_tokens=1000 + len(words_list) * 100
-                    )
-                    logger.info(f"✅ Резервная модель работает! Получен ответ ({len(response)} символов)")
-                    return response
-                
-                except Exception as fallback_error:
-                    logger.error(f"❌ Ошибка и при резервной модели: {fallback_error}")
-                    logger.info(f"🔄 Пробую алгоритмическую генерацию для {len(words_list)} слов...")
-                    # Последний resort - используем алгоритмическую генерацию
-                    return None
+        Returns:
+            Текст ответа модели
             
-            return None
+        Raises:
+            Exception: Ошибка последнего запроса, если ни одна модель не ответила
+        """
+        def start(model: str) -> asyncio.Task:
+            return asyncio.create_task(self.client.chat_completion(
+                messages=messages,
+                model=model,
+                temperature=0.7,
+                max_tokens=max_tokens
+            ))
+        
+        primary = start(VARIANT_GENERATION_MODEL)
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=VARIANT_MODEL_HEDGE_DELAY)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        
+        if done:
+            error = primary.exception()
+            if error is None:
+                return primary.result()
+            # Проверяем если это ошибка 403 (доступ запрещен)
+            if "403" not in str(error):
+                raise error
+            logger.warning(f"⚠️ Ошибка 403 при работе с {VARIANT_GENERATION_MODEL}")
+            logger.info(f"🔄 Переключаюсь на резервную модель {FALLBACK_MODEL}...")
+            pending = {start(FALLBACK_MODEL)}
+        else:
+            logger.warning(
+                f"⏱️ {VARIANT_GENERATION_MODEL} не ответила за {VARIANT_MODEL_HEDGE_DELAY} сек, "
+                f"параллельно запрашиваю {FALLBACK_MODEL}"
+            )
+            pending = {primary, start(FALLBACK_MODEL)}
+        
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            logger.info(f"✅ Ответ получен от резервной модели {FALLBACK_MODEL}")
+                        return task.result()
+                    error = task.exception()
+                    logger.error(f"❌ Ошибка запроса к модели: {error}")
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
     
     # ========================================================================
     # ПАРСИНГ И ВАЛИДАЦИЯ
@@ -247,8 +495,7 @@ class VariantGeneratorService:
             # Парсинг JSON
             logger.debug(f"🔍 Парсинг JSON ответа...")
             # Ищем JSON в ответе (иногда LLM добавляет текст вокруг)
-            json_text = self._extract_json_from_response(response_text)
-            response_dict = json.loads(json_text)
+            response_dict = self._decode_json_from_response(response_text, '{')
             
             logger.debug(f"✅ JSON спаршен, найдено слов в ответе: {len(response_dict)}")
         
@@ -284,13 +531,14 @@ class VariantGeneratorService:
             
             # Дополнительная валидация каждого варианта
             try:
+                word_lower = word.lower()
                 for variant in variants_list:
                     # Проверяем что это строка
                     if not isinstance(variant, str):
                         raise ValueError(f"Вариант должен быть строкой, получено: {type(variant)}")
                     
                     # Проверяем что вариант отличается от оригинала
-                    if variant.lower() == word.lower():
+                    if variant.lower() == word_lower:
                         raise ValueError(f"Вариант '{variant}' совпадает с оригиналом")
                     
                     # Проверяем только русские буквы
@@ -308,65 +556,93 @@ class VariantGeneratorService:
         
         return parsed_variants, error_words
     
-    def _extract_json_from_response(self, text: str) -> str:
+    def _decode_json_from_response(self, text: str, opener: str = '{'):
         """
-        Извлечь JSON из текста ответа (LLM может добавить текст вокруг)
+        Разобрать JSON из текста ответа (LLM может добавить текст вокруг)
+        Основной путь - orjson по тексту от первой открывающей до последней закрывающей скобки;
+        если там не чистый JSON - raw_decode с первой скобки, текст после JSON игнорируется
         
         Args:
             text: Текст ответа
+            opener: Ожидаемая открывающая скобка: '{' для объекта, '[' для списка
             
         Returns:
-            JSON строка
+            Разобранный JSON
+            
+        Raises:
+            ValueError: Если JSON не найден или не разбирается
         """
-        # Ищем первый { и последний }
-        start = text.find('{')
-        end = text.rfind('}')
-        
-        if start == -1 or end == -1:
+        start = text.find(opener)
+        if start == -1:
             logger.error(f"❌ Не найдены граница JSON в ответе")
             raise ValueError("JSON not found in response")
         
-        json_text = text[start:end+1]
-        logger.debug(f"🔍 Извлечен JSON ({len(json_text)} символов)")
-        return json_text
+        end = text.rfind('}' if opener == '{' else ']')
+        if end > start:
+            try:
+                data = orjson.loads(text[start:end + 1])
+                logger.debug(f"🔍 Извлечен JSON ({end + 1 - start} символов)")
+                return data
+            except orjson.JSONDecodeError:
+                pass
+        
+        data, end = _JSON_DECODER.raw_decode(text, start)
+        logger.debug(f"🔍 Извлечен JSON ({end - start} символов)")
+        return data
     
     # ========================================================================
     # FALLBACK ГЕНЕРАЦИЯ
     # ========================================================================
     
-    async def _fallback_generation_for_failed_words(self, failed_words: List[str]):
+    async def _fallback_generation_for_failed_words(self, failed_words: List[str]) -> Dict[str, List[str]]:
         """
         Fallback: генерация вариантов для конкретных слов, которые не прошли валидацию
         
+        Результаты не сохраняются в кэш - это делает вызывающий код
+        
         Args:
             failed_words: Список слов, для которых не удалась batch-генерация
+            
+        Returns:
+            Словарь {слово: [варианты]} для слов, которые удалось сгенерировать
         """
         logger.warning(
             f"⚠️ Fallback-генерация для {len(failed_words)} слов: {failed_words[:3]}..."
         )
         
-        for word in failed_words:
+        # Запросы для отдельных слов идут параллельно, семафор бережёт лимиты OpenRouter
+        semaphore = asyncio.Semaphore(VARIANT_FALLBACK_CONCURRENCY)
+        results = {}
+        
+        async def fallback_one(word: str):
             try:
                 # Пробуем сгенерировать для одного слова
-                variants = await self.generate_variants_single(word)
+                async with semaphore:
+                    variants = await self.generate_variants_single(word, save=False)
                 if variants:
                     logger.info(f"✅ Fallback-генерация успешна для '{word}'")
                 else:
                     logger.warning(f"⚠️ Fallback-генерация не дала результата для '{word}'")
                     # Используем алгоритмическую генерацию
-                    variants = self._algorithmic_generation(word)
+                    variants = await asyncio.to_thread(self._algorithmic_generation, word, False)
                     if variants:
                         logger.info(f"✅ Алгоритмическая генерация для '{word}'")
+                if variants:
+                    results[word] = variants
             
             except Exception as e:
                 logger.error(f"❌ Ошибка fallback для '{word}': {e}")
+        
+        await asyncio.gather(*(fallback_one(word) for word in failed_words))
+        return results
     
-    async def generate_variants_single(self, word: str) -> Optional[List[str]]:
+    async def generate_variants_single(self, word: str, save: bool = True) -> Optional[List[str]]:
         """
         Fallback: генерация вариантов для одного слова
         
         Args:
             word: Слово для генерации
+            save: Сохранить результат в кэш (False - вызывающий сохранит сам)
             
         Returns:
             Список из 3 неправильных вариантов или None
@@ -390,12 +666,11 @@ class VariantGeneratorService:
                 messages=messages,
                 model=VARIANT_GENERATION_MODEL,
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=VARIANT_RESPONSE_BASE_TOKENS + VARIANT_RESPONSE_TOKENS_PER_WORD
             )
             
-            # Парсим JSON
-            json_text = self._extract_json_from_response(response)
-            variants_list = json.loads(json_text)
+            # Парсим JSON (ожидается список вариантов)
+            variants_list = self._decode_json_from_response(response, '[')
             
             # Валидируем - проверяем что это список из 3 элементов
             if not isinstance(variants_list, list):
@@ -407,11 +682,12 @@ class VariantGeneratorService:
                 return None
             
             # Проверяем каждый вариант
+            word_lower = word.lower()
             for variant in variants_list:
                 if not isinstance(variant, str):
                     logger.warning(f"⚠️ Вариант должен быть строкой: {type(variant)}")
                     return None
-                if variant.lower() == word.lower():
+                if variant.lower() == word_lower:
                     logger.warning(f"⚠️ Вариант совпадает с оригиналом: {variant}")
                     return None
                 if not is_russian_word(variant):
@@ -419,7 +695,8 @@ class VariantGeneratorService:
                     return None
             
             # Сохраняем в кэш
-            self._save_variants_to_cache(word, variants_list)
+            if save:
+                self._save_variants_to_cache(word, variants_list)
             logger.info(f"✅ Fallback-генерация успешна для '{word}': {variants_list}")
             
             return variants_list
@@ -428,7 +705,7 @@ class VariantGeneratorService:
             logger.error(f"❌ Ошибка fallback-генерации для '{word}': {e}")
             return None
     
-    def _algorithmic_generation(self, word: str) -> Optional[List[str]]:
+    def _algorithmic_generation(self, word: str, save: bool = True) -> Optional[List[str]]:
         """
         Алгоритмическая генерация вариантов (без API)
         
@@ -437,6 +714,7 @@ class VariantGeneratorService:
         
         Args:
             word: Слово для генерации
+            save: Сохранить результат в кэш (False - вызывающий сохранит сам)
             
         Returns:
             Список из 3 неправильных вариантов или None
@@ -445,123 +723,77 @@ class VariantGeneratorService:
         
         try:
             word_lower = word.lower()
-            variants = set()  # Используем set чтобы избежать дубликатов
-            
-            # СТРАТЕГИЯ 1: Замена безударной гласной (о→а, е→и, я→е, и→е)
-            for old, new in [('о', 'а'), ('а', 'о'), ('е', 'и'), ('и', 'е'), ('я', 'е'), ('ю', 'ю')]:
-                idx = word_lower.find(old)
-                if idx != -1:
-                    variant = word_lower[:idx] + new + word_lower[idx+1:]
-                    if variant != word_lower:
-                        variants.add(variant)
-                        if len(variants) >= VARIANTS_COUNT:
-                            break
+            # dict как упорядоченное множество: без дубликатов, в порядке приоритета стратегий
+            variants = {}
             
-            if len(variants) >= VARIANTS_COUNT:
-                result = [v.capitalize() for v in list(variants)[:VARIANTS_COUNT]]
-                self._save_variants_to_cache(word, result)
-                logger.info(f"✅ Алгоритмическая генерация успешна для '{word}': {result}")
-                return result
-            
-            # СТРАТЕГИЯ 2: Замена парной согласной (д↔т, б↔п, г↔к, в↔ф, ж↔ш, з↔с)
-            consonant_pairs = [('д', 'т'), ('т', 'д'), ('б', 'п'), ('п', 'б'), 
-                              ('г', 'к'), ('к', 'г'), ('в', 'ф'), ('ф', 'в'), 
-                              ('ж', 'ш'), ('ш', 'ж'), ('з', 'с'), ('с', 'з')]
-            
-            for old, new in consonant_pairs:
-                idx = word_lower.find(old)
-                if idx != -1:
-                    variant = word_lower[:idx] + new + word_lower[idx+1:]
-                    if variant != word_lower:
-                        variants.add(variant)
-                        if len(variants) >= VARIANTS_COUNT:
+            # Позиция первого вхождения каждой буквы - один проход вместо find() на каждую пару
+            first_index = {}
+            for i, char in enumerate(word_lower):
+                first_index.setdefault(char, i)
+            
+            def add_variant(variant: str) -> bool:
+                """Добавить вариант; True когда набрано достаточно"""
+                if variant != word_lower:
+                    variants[variant] = None
+                return len(variants) >= VARIANTS_COUNT
+            
+            def strategies():
+                """Стратегии по приоритету; каждая останавливается, как только вариантов достаточно"""
+                # СТРАТЕГИЯ 1: Замена безударной гласной (о→а, е→и, я→е, и→е)
+                # СТРАТЕГИЯ 2: Замена парной согласной (д↔т, б↔п, г↔к, в↔ф, ж↔ш, з↔с)
+                for substitutions in (_VOWEL_SUBSTITUTIONS, _PAIRED_CONSONANTS):
+                    for old, new in substitutions:
+                        idx = first_index.get(old)
+                        if idx is not None and add_variant(word_lower[:idx] + new + word_lower[idx+1:]):
                             break
-            
-            if len(variants) >= VARIANTS_COUNT:
-                result = [v.capitalize() for v in list(variants)[:VARIANTS_COUNT]]
-                self._save_variants_to_cache(word, result)
-                logger.info(f"✅ Алгоритмическая генерация успешна для '{word}': {result}")
-                return result
-            
-            # СТРАТЕГИЯ 3: Удвоение согласной (к→кк, р→рр, л→лл, н→нн, м→мм)
-            for char in 'крлнмстбпвгджзшщ':
-                idx = word_lower.find(char)
-                if idx != -1 and idx > 0:
+                    yield
+                
+                # СТРАТЕГИЯ 3: Удвоение согласной (к→кк, р→рр, л→лл, н→нн, м→мм)
+                for char in _DOUBLABLE_CONSONANTS:
+                    idx = first_index.get(char)
                     # Проверяем что это еще не удвоенная согласная
-                    if idx + 1 < len(word_lower) and word_lower[idx + 1] != char:
-                        variant = word_lower[:idx+1] + char + word_lower[idx+1:]
-                        if variant != word_lower:
-                            variants.add(variant)
-                            if len(variants) >= VARIANTS_COUNT:
-                                break
-            
-            if len(variants) >= VARIANTS_COUNT:
-                result = [v.capitalize() for v in list(variants)[:VARIANTS_COUNT]]
-                self._save_variants_to_cache(word, result)
-                logger.info(f"✅ Алгоритмическая генерация успешна для '{word}': {result}")
-                return result
-            
-            # СТРАТЕГИЯ 4: Пропуск гласной (убираем гласную)
-            for i, char in enumerate(word_lower):
-                if char in 'аеиоуюяё':
-                    variant = word_lower[:i] + word_lower[i+1:]
-                    if variant and variant != word_lower:
-                        variants.add(variant)
-                        if len(variants) >= VARIANTS_COUNT:
+                    if idx and idx + 1 < len(word_lower) and word_lower[idx + 1] != char:
+                        if add_variant(word_lower[:idx+1] + char + word_lower[idx+1:]):
                             break
-            
-            if len(variants) >= VARIANTS_COUNT:
-                result = [v.capitalize() for v in list(variants)[:VARIANTS_COUNT]]
-                self._save_variants_to_cache(word, result)
-                logger.info(f"✅ Алгоритмическая генерация успешна для '{word}': {result}")
-                return result
-            
-            # СТРАТЕГИЯ 5: Пропуск согласной (убираем согласную)
-            for i, char in enumerate(word_lower):
-                if char in 'бвгджзклмнпрстфхцчшщ' and i < len(word_lower) - 1:
-                    variant = word_lower[:i] + word_lower[i+1:]
-                    if variant != word_lower:
-                        variants.add(variant)
-                        if len(variants) >= VARIANTS_COUNT:
+                yield
+                
+                # СТРАТЕГИЯ 4: Пропуск гласной (убираем гласную)
+                for i, char in enumerate(word_lower):
+                    if char in _VOWELS:
+                        variant = word_lower[:i] + word_lower[i+1:]
+                        if variant and add_variant(variant):
                             break
-            
-            if len(variants) >= VARIANTS_COUNT:
-                result = [v.capitalize() for v in list(variants)[:VARIANTS_COUNT]]
-                self._save_variants_to_cache(word, result)
-                logger.info(f"✅ Алгоритмическая генерация успешна для '{word}': {result}")
-                return result
-            
-            # СТРАТЕГИЯ 6: Транспозиция (перестановка рядом стоящих букв)
-            for i in range(len(word_lower) - 1):
-                if word_lower[i] != word_lower[i+1]:
-                    variant = word_lower[:i] + word_lower[i+1] + word_lower[i] + word_lower[i+2:]
-                    if variant != word_lower:
-                        variants.add(variant)
-                        if len(variants) >= VARIANTS_COUNT:
+                yield
+                
+                # СТРАТЕГИЯ 5: Пропуск согласной (убираем согласную)
+                for i, char in enumerate(word_lower[:-1]):
+                    if char in _CONSONANTS and add_variant(word_lower[:i] + word_lower[i+1:]):
+                        break
+                yield
+                
+                # СТРАТЕГИЯ 6: Транспозиция (перестановка рядом стоящих букв)
+                for i in range(len(word_lower) - 1):
+                    if word_lower[i] != word_lower[i+1]:
+                        if add_variant(word_lower[:i] + word_lower[i+1] + word_lower[i] + word_lower[i+2:]):
                             break
+                yield
+                
+                # СТРАТЕГИЯ 7: Добавление гласной
+                for i in range(len(word_lower) + 1):
+                    if any(add_variant(word_lower[:i] + vowel + word_lower[i:]) for vowel in _INSERTED_VOWELS):
+                        break
+                yield
             
-            if len(variants) >= VARIANTS_COUNT:
-                result = [v.capitalize() for v in list(variants)[:VARIANTS_COUNT]]
-                self._save_variants_to_cache(word, result)
-                logger.info(f"✅ Алгоритмическая генерация успешна для '{word}': {result}")
-                return result
-            
-            # СТРАТЕГИЯ 7: Добавление гласной
-            for i in range(len(word_lower) + 1):
-                for vowel in 'аеиоу':
-                    variant = word_lower[:i] + vowel + word_lower[i:]
-                    if variant != word_lower and len(variant) <= len(word_lower) + 2:
-                        variants.add(variant)
-                        if len(variants) >= VARIANTS_COUNT:
-                            break
+            for _ in strategies():
                 if len(variants) >= VARIANTS_COUNT:
                     break
             
-            # Финальная проверка
-            result = [v.capitalize() for v in list(variants)[:VARIANTS_COUNT]]
+            # Финальная проверка (стратегии останавливаются ровно на VARIANTS_COUNT вариантах)
+            result = [v.capitalize() for v in variants]
             
             if len(result) >= VARIANTS_COUNT:
-                self._save_variants_to_cache(word, result)
+                if save:
+                    self._save_variants_to_cache(word, result)
                 logger.info(f"✅ Алгоритмическая генерация успешна для '{word}': {result}")
                 return result
             else:
@@ -572,27 +804,70 @@ class VariantGeneratorService:
             logger.error(f"❌ Ошибка алгоритмической генерации для '{word}': {e}")
             return None
     
+    def _algorithmic_generation_many(self, words_list: List[str]) -> Dict[str, List[str]]:
+        """
+        Алгоритмическая генерация для списка слов без сохранения в кэш
+        
+        Вызывается через asyncio.to_thread одним переходом в поток на весь список,
+        чтобы длинный цикл не занимал event loop
+        
+        Args:
+            words_list: Список слов
+            
+        Returns:
+            Словарь {слово: [варианты]} для слов, которые удалось сгенерировать
+        """
+        generated = {}
+        for word in words_list:
+            variants = self._algorithmic_generation(word, save=False)
+            if variants:
+                generated[word] = variants
+        return generated
+    
     # ========================================================================
     # КЭШИРОВАНИЕ
     # ========================================================================
     
-    def _load_cached_variants(self, words_list: List[str]) -> Dict[str, Dict]:
+    async def _aload_cached_variants(self, words_list: List[str]) -> Dict[str, List[str]]:
         """
-        Загрузить варианты для слов из кэша
+        Загрузить варианты для слов из кэша: файлы читаются параллельно в потоках,
+        не блокируя event loop
         
         Args:
             words_list: Список слов
             
         Returns:
-            Словарь {слово: {easy: [...], medium: [...], hard: [...]}}
+            Словарь {слово: [варианты]}
         """
         cached = {}
-        
+        index = _get_cache_index(self.cache_dir)
+        pairs = []
         for word in words_list:
-            variants = self.get_cached_variants(word)
-            if variants:
+            word_hash = get_word_hash(word)
+            variants = _memory_cache.get((self.cache_dir, word_hash))
+            if variants is not None:
+                _memory_cache.move_to_end((self.cache_dir, word_hash))
+                _memory_stats["hits"] += 1
                 cached[word] = variants
+            elif word_hash in index:
+                _memory_stats["misses"] += 1
+                pairs.append((word, index[word_hash]))
+        if not pairs:
+            return cached
+        
+        results = await asyncio.gather(
+            *(asyncio.to_thread(load_json, cache_file) for _, cache_file in pairs),
+            return_exceptions=True
+        )
         
+        for (word, _), data in zip(pairs, results):
+            if isinstance(data, Exception):
+                logger.error(f"❌ Ошибка при загрузке кэша для '{word}': {data}")
+            elif data and data.get("variants"):
+                cached[word] = data["variants"]
+                _remember_variants(self.cache_dir, get_word_hash(word), data["variants"])
+        
+        logger.debug(f"📖 Из кэша загружены варианты для {len(cached)} слов")
         return cached
     
     def get_cached_variants(self, word: str) -> Optional[List[str]]:
@@ -606,14 +881,22 @@ class VariantGeneratorService:
             Список из 3 неправильных вариантов или None
         """
         word_hash = get_word_hash(word)
-        cache_file = self.cache_dir / f"{word_hash}.json"
-        
-        if not cache_file.exists():
+        key = (self.cache_dir, word_hash)
+        variants = _memory_cache.get(key)
+        if variants is not None:
+            _memory_cache.move_to_end(key)
+            _memory_stats["hits"] += 1
+            return variants
+        _memory_stats["misses"] += 1
+        
+        cache_file = _get_cache_index(self.cache_dir).get(word_hash)
+        if cache_file is None:
             return None
         
         try:
             data = load_json(cache_file)
             if data and "variants" in data:
+                _remember_variants(self.cache_dir, word_hash, data["variants"])
                 logger.debug(f"📖 Варианты '{word}' загружены из кэша")
                 return data["variants"]
         
@@ -622,6 +905,21 @@ class VariantGeneratorService:
         
         return None
     
+    def get_memory_cache_info(self) -> dict:
+        """
+        Получить статистику LRU-кэша вариантов в памяти
+        
+        Returns:
+            Словарь с количеством записей, попаданий и промахов
+        """
+        total = _memory_stats["hits"] + _memory_stats["misses"]
+        return {
+            "memory_entries": len(_memory_cache),
+            "hits": _memory_stats["hits"],
+            "misses": _memory_stats["misses"],
+            "hit_rate": round(_memory_stats["hits"] / total, 3) if total else 0.0
+        }
+    
     def get_all_variants(self, word: str) -> Optional[List[str]]:
         """
         Получить все 3 неправильных варианта для слова
@@ -655,7 +953,6 @@ class VariantGeneratorService:
             word_hash = get_word_hash(word)
             cache_file = self.cache_dir / f"{word_hash}.json"
             
-            from datetime import datetime
             cache_data = {
                 "word": word,
                 "word_hash": word_hash,
@@ -663,7 +960,10 @@ class VariantGeneratorService:
                 "variants": variants_dict
             }
             
-            if save_json(cache_file, cache_data):
+            # Кэш вариантов можно сгенерировать заново (как кэш аудио), поэтому без fsync
+            if save_json(cache_file, cache_data, durable=False):
+                _get_cache_index(self.cache_dir)[word_hash] = cache_file
+                _remember_variants(self.cache_dir, word_hash, variants_dict)
                 logger.debug(f"💾 Варианты '{word}' сохранены в кэш")
                 return True
             else:
@@ -673,3 +973,49 @@ class VariantGeneratorService:
         except Exception as e:
             logger.error(f"❌ Ошибка при сохранении в кэш: {e}")
             return False
+    
+    async def _asave_variants_bulk(self, variants_by_word: Dict[str, List[str]]) -> int:
+        """
+        Сохранить варианты нескольких слов в кэш: файлы пишутся параллельно в потоках,
+        не блокируя event loop
+        
+        Args:
+            variants_by_word: Словарь {слово: [варианты]}
+            
+        Returns:
+            Количество успешно сохранённых слов
+        """
+        if not variants_by_word:
+            return 0
+        
+        generated_at = datetime.now().isoformat()
+        entries = []
+        for word, variants in variants_by_word.items():
+            word_hash = get_word_hash(word)
+            cache_data = {
+                "word": word,
+                "word_hash": word_hash,
+                "generated_at": generated_at,
+                "variants": variants
+            }
+            entries.append((word, word_hash, self.cache_dir / f"{word_hash}.json", cache_data))
+        
+        # Без fsync: файлы кэша восстанавливаются повторной генерацией, атомарная
+        # подмена защищает от обрезанного JSON
+        results = await asyncio.gather(
+            *(asyncio.to_thread(save_json, cache_file, cache_data, False) for _, _, cache_file, cache_data in entries),
+            return_exceptions=True
+        )
+        
+        index = _get_cache_index(self.cache_dir)
+        saved = 0
+        for (word, word_hash, cache_file, _), ok in zip(entries, results):
+            if ok is True:
+                index[word_hash] = cache_file
+                _remember_variants(self.cache_dir, word_hash, variants_by_word[word])
+                saved += 1
+            else:
+                logger.error(f"❌ Ошибка при сохранении кэша для '{word}': {ok}")
+        
+        logger.debug(f"💾 Сохранены варианты для {saved}/{len(entries)} слов")
+        return saved
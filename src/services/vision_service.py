@@ -2,17 +2,31 @@
 Сервис распознавания текста с изображений через Vision API
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import List
+from collections import OrderedDict
+from typing import List, Tuple
 
 from config.prompts import VISION_PROMPT
-from src.utils.image_processor import validate_image, preprocess_image, convert_to_base64
+from config.settings import IMAGE_PREPROCESS_CACHE_SIZE, RECOGNIZED_PHOTO_CACHE_SIZE
+from src.utils.image_processor import preprocess_image_with_validation
 from src.utils.validators import parse_recognized_text
 from src.services.openrouter_client import OpenRouterClient
 
 
 logger = logging.getLogger(__name__)
 
+# LRU предобработанных изображений: {blake2b исходных байт: байты после preprocess_image}
+# Повторная попытка распознавания (или то же фото от другого пользователя)
+# не декодирует и не перекодирует изображение заново
+_preprocessed_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+
+# LRU результатов распознавания: {blake2b исходных байт: распознанные слова}
+# Сюда попадают только ответы, из которых удалось получить слова: пустой или
+# неудачный ответ не кэшируется, и повторная отправка фото снова идёт в Vision API
+_recognized_cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+
 
 class VisionService:
     """
@@ -44,25 +58,40 @@ class VisionService:
         """
         logger.info("📸 Начало распознавания текста с изображения...")
         
-        # 1. Валидация изображения
-        is_valid, error_msg = validate_image(image_bytes)
-        if not is_valid:
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        # Работа Pillow (декодирование, ресайз, кодирование JPEG) идёт в потоках:
+        # event loop не блокируется, а Pillow отпускает GIL и фото разных пользователей
+        # обрабатываются параллельно
+        cache_key = hashlib.blake2b(image_bytes, digest_size=16).digest()
         
-        # 2. Предобработка изображения (улучшение контраста, размер и т.д.)
-        logger.debug("🔧 Предобработка изображения...")
-        processed_image = preprocess_image(image_bytes)
+        recognized = _recognized_cache.get(cache_key)
+        if recognized is not None:
+            _recognized_cache.move_to_end(cache_key)
+            logger.info(f"⚡ Слова взяты из кэша распознавания: {len(recognized)} слов")
+            return list(recognized)
         
-        # 3. Конвертация в base64 для API
-        logger.debug("🔐 Конвертация в base64...")
-        image_base64 = convert_to_base64(processed_image)
+        processed_image = _preprocessed_cache.get(cache_key)
         
-        # 4. Отправка запроса к Vision API
+        if processed_image is not None:
+            _preprocessed_cache.move_to_end(cache_key)
+            logger.debug("⚡ Предобработанное изображение взято из кэша")
+        else:
+            # 1-2. Валидация и предобработка (улучшение контраста, размер и т.д.)
+            # за одно открытие изображения и один переход в поток
+            logger.debug("🔧 Валидация и предобработка изображения...")
+            processed_image, error_msg = await asyncio.to_thread(preprocess_image_with_validation, image_bytes)
+            if processed_image is None:
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            
+            _preprocessed_cache[cache_key] = processed_image
+            while len(_preprocessed_cache) > IMAGE_PREPROCESS_CACHE_SIZE:
+                _preprocessed_cache.popitem(last=False)
+        
+        # 3. Отправка запроса к Vision API (base64 кодируется клиентом вне event loop)
         logger.info("📤 Отправка запроса к Vision API...")
         try:
             response_text = await self.client.vision_request(
-                image_base64=image_base64,
+                image_bytes=processed_image,
                 prompt=VISION_PROMPT
             )
             logger.info(f"📥 Ответ получен ({len(response_text)} символов)")
@@ -70,17 +99,21 @@ class VisionService:
             logger.error(f"❌ Ошибка при запросе к Vision API: {e}")
             raise ValueError(f"Ошибка распознавания текста: {e}")
         
-        # 5. Парсинг и очистка распознанного текста
+        # 4. Парсинг и очистка распознанного текста
         logger.debug("🔍 Парсинг распознанного текста...")
-        logger.info(f"📝 Исходный ответ Vision API:\n{response_text}")
+        logger.debug("📝 Исходный ответ Vision API:\n%s", response_text)
         words = parse_recognized_text(response_text)
         
         if not words:
             logger.warning("⚠️ Слова не распознаны из изображения")
             raise ValueError("❌ Не удалось распознать слова с изображения. Попробуйте загрузить чёткое фото со списком слов.")
         
+        _recognized_cache[cache_key] = tuple(words)
+        while len(_recognized_cache) > RECOGNIZED_PHOTO_CACHE_SIZE:
+            _recognized_cache.popitem(last=False)
+        
         logger.info(f"✅ Распознавание завершено: {len(words)} слов")
-        logger.debug(f"Слова: {words}")
+        logger.debug("Слова: %s", words)
         
         return words
     
@@ -3,6 +3,7 @@
 from .image_processor import (
     validate_image,
     preprocess_image,
+    preprocess_image_with_validation,
     convert_to_base64,
     resize_image,
 )
@@ -19,6 +20,7 @@ __all__ = [
     # Image processing
     "validate_image",
     "preprocess_image",
+    "preprocess_image_with_validation",
     "convert_to_base64",
     "resize_image",
     # Validators
@@ -4,34 +4,20 @@
 """
 
 import logging
+import re
 from typing import Optional, List
 import asyncio
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# ОТВЕТЫ НА ОШИБКИ
+# ============================================================================
+# Неизменяемые шаблоны собраны один раз при импорте; обработчики возвращают их копии
 
-class APIErrorHandler:
-    """Обработчик ошибок API с fallback механизмами"""
-    
-    @staticmethod
-    async def handle_vision_error(error: Exception, context: dict = None) -> dict:
-        """
-        Обработка ошибок Vision API (распознавание текста)
-        
-        Args:
-            error: Exception из Vision Service
-            context: Контекст ошибки (например, размер фото)
-            
-        Returns:
-            Словарь с сообщением об ошибке для пользователя
-        """
-        error_str = str(error).lower()
-        logger.error(f"❌ Vision API ошибка: {error}")
-        
-        # Классификация ошибок
-        if "timeout" in error_str or "request timeout" in error_str:
-            return {
-                'user_message': """❌ **Тайм-аут при распознавании текста**
+_VISION_TIMEOUT = MappingProxyType({
+    'user_message': """❌ **Тайм-аут при распознавании текста**
 
 Сервис распознавания временно перегружен. 
 
@@ -39,13 +25,12 @@ class APIErrorHandler:
 1️⃣ Попробуй загрузить фото снова через 10 секунд
 2️⃣ Убедись что фото чёткое и хорошо освещено
 3️⃣ Если ошибка повторяется, попробуй в другом словаре""",
-                'error_code': 'VISION_TIMEOUT',
-                'retry_allowed': True
-            }
-        
-        elif "invalid" in error_str or "bad request" in error_str or "400" in error_str:
-            return {
-                'user_message': """❌ **Фотография не соответствует требованиям**
+    'error_code': 'VISION_TIMEOUT',
+    'retry_allowed': True
+})
+
+_VISION_INVALID_IMAGE = MappingProxyType({
+    'user_message': """❌ **Фотография не соответствует требованиям**
 
 **Требования к фото:**
 ✅ Чёткий текст на белом/светлом фоне
@@ -55,25 +40,23 @@ class APIErrorHandler:
 ❌ Не подходят: размытые, косые, тёмные фото
 
 **Совет:** Используй встроенную камеру, а не скриншот!""",
-                'error_code': 'VISION_INVALID_IMAGE',
-                'retry_allowed': True
-            }
-        
-        elif "429" in error_str or "rate limit" in error_str:
-            return {
-                'user_message': """⏳ **Слишком много запросов**
+    'error_code': 'VISION_INVALID_IMAGE',
+    'retry_allowed': True
+})
+
+_VISION_RATE_LIMIT = MappingProxyType({
+    'user_message': """⏳ **Слишком много запросов**
 
 Ты отправляешь фото слишком часто. 
 
 **Подожди 30 секунд и попробуй снова** ⏰""",
-                'error_code': 'VISION_RATE_LIMIT',
-                'retry_allowed': True,
-                'retry_delay': 30
-            }
-        
-        else:
-            return {
-                'user_message': """❌ **Ошибка распознавания текста**
+    'error_code': 'VISION_RATE_LIMIT',
+    'retry_allowed': True,
+    'retry_delay': 30
+})
+
+_VISION_UNKNOWN = MappingProxyType({
+    'user_message': """❌ **Ошибка распознавания текста**
 
 Что-то пошло не так при обработке фото. 
 
@@ -81,9 +64,95 @@ class APIErrorHandler:
 1️⃣ Переделать фото в лучшем освещении
 2️⃣ Отправить файл меньшего размера
 3️⃣ Если проблема в сервисе - подожди и попробуй позже""",
-                'error_code': 'VISION_UNKNOWN',
-                'retry_allowed': True
-            }
+    'error_code': 'VISION_UNKNOWN',
+    'retry_allowed': True
+})
+
+_VARIANT_TIMEOUT = MappingProxyType({
+    'user_message': "⏳ Генерируем варианты... (может занять время)",
+    'error_code': 'VARIANT_TIMEOUT',
+    'fallback_action': 'use_cached_or_algorithmic',
+    'retry_allowed': True,
+    'retry_delay': 5
+})
+
+_VARIANT_RATE_LIMIT = MappingProxyType({
+    'user_message': "⏳ Слишком много запросов, подожди...",
+    'error_code': 'VARIANT_RATE_LIMIT',
+    'fallback_action': 'use_cached_or_algorithmic',
+    'retry_allowed': True,
+    'retry_delay': 10
+})
+
+_VARIANT_PARSE_ERROR = MappingProxyType({
+    'user_message': "⚙️ Переформатируем варианты...",
+    'error_code': 'VARIANT_PARSE_ERROR',
+    'fallback_action': 'use_algorithmic_generation'
+})
+
+_VARIANT_UNKNOWN = MappingProxyType({
+    'user_message': "⚙️ Подготавливаем варианты альтернативным способом...",
+    'error_code': 'VARIANT_UNKNOWN',
+    'fallback_action': 'use_algorithmic_generation'
+})
+
+# Короткие сообщения по коду ошибки (см. get_user_friendly_error_message)
+_USER_FRIENDLY_MESSAGES = MappingProxyType({
+    'VISION_TIMEOUT': "⏳ Распознавание занимает дольше обычного. Пожалуйста, подожди...",
+    'VISION_INVALID_IMAGE': "📸 Фото не читается. Попробуй загрузить более чёткую фотографию.",
+    'VISION_RATE_LIMIT': "⚡ Слишком много запросов. Подожди немного перед следующей попыткой.",
+    'TTS_TIMEOUT': "🔊 Звук генерируется... Продолжаем без аудио.",
+    'TTS_RATE_LIMIT': "⏳ Временно нет доступа к звуку. Продолжаем учить слова.",
+    'VARIANT_TIMEOUT': "⚙️ Варианты генерируются дольше обычного...",
+    'VARIANT_RATE_LIMIT': "⏳ API перегружен, подожди и попробуй снова.",
+    'VARIANT_PARSE_ERROR': "⚙️ Переформатируем данные...",
+    'VARIANT_UNKNOWN': "⚙️ Подготавливаем варианты...",
+})
+_DEFAULT_USER_MESSAGE = "❌ Произошла ошибка. Попробуй ещё раз."
+
+# Ключевые слова для классификации ошибок: все находятся одним проходом регулярного выражения
+# (без lower() и отдельного поиска каждой подстроки), приоритет задаёт порядок проверок в обработчике
+_ERROR_KEYWORDS = re.compile(r"timeout|invalid|bad request|parse|rate limit|400|429", re.IGNORECASE)
+_RATE_LIMIT_KEYWORDS = frozenset({"429", "rate limit"})
+_INVALID_IMAGE_KEYWORDS = frozenset({"invalid", "bad request", "400"})
+_PARSE_KEYWORDS = frozenset({"invalid", "parse"})
+
+
+def _error_keywords(error: Exception) -> frozenset:
+    """Множество ключевых слов классификации, найденных в тексте ошибки (в нижнем регистре)"""
+    return frozenset(match.lower() for match in _ERROR_KEYWORDS.findall(str(error)))
+
+
+class APIErrorHandler:
+    """Обработчик ошибок API с fallback механизмами"""
+    
+    @staticmethod
+    async def handle_vision_error(error: Exception, context: dict = None) -> dict:
+        """
+        Обработка ошибок Vision API (распознавание текста)
+        
+        Args:
+            error: Exception из Vision Service
+            context: Контекст ошибки (например, размер фото)
+            
+        Returns:
+            Словарь с сообщением об ошибке для пользователя
+        """
+        keywords = _error_keywords(error)
+        logger.error(f"❌ Vision API ошибка: {error}")
+        
+        # Классификация ошибок
+        if "timeout" in keywords:
+            return dict(_VISION_TIMEOUT)
+        
+        elif keywords & _INVALID_IMAGE_KEYWORDS:
+            return dict(_VISION_INVALID_IMAGE)
+        
+        elif keywords & _RATE_LIMIT_KEYWORDS:
+            return dict(_VISION_RATE_LIMIT)
+        
+        else:
+            return dict(_VISION_UNKNOWN)
     
     @staticmethod
     async def handle_tts_error(word: str, error: Exception) -> dict:
@@ -97,17 +166,17 @@ class APIErrorHandler:
         Returns:
             Словарь с информацией о fallback
         """
-        error_str = str(error).lower()
+        keywords = _error_keywords(error)
         logger.error(f"❌ TTS API ошибка для слова '{word}': {error}")
         
-        if "timeout" in error_str:
+        if "timeout" in keywords:
             return {
                 'user_message': f"🔊 Аудио для '{word}' генерируется... (может быть без звука)",
                 'error_code': 'TTS_TIMEOUT',
                 'fallback_action': 'show_word_without_audio'
             }
         
-        elif "429" in error_str or "rate limit" in error_str:
+        elif keywords & _RATE_LIMIT_KEYWORDS:
             return {
                 'user_message': f"🔊 Временно нет доступа к аудио для '{word}'",
                 'error_code': 'TTS_RATE_LIMIT',
@@ -133,41 +202,21 @@ class APIErrorHandler:
         Returns:
             Словарь с информацией о fallback
         """
-        error_str = str(error).lower()
+        keywords = _error_keywords(error)
         word_count = len(words) if isinstance(words, list) else 1
         logger.error(f"❌ Ошибка генерации вариантов для {word_count} слов: {error}")
         
-        if "timeout" in error_str:
-            return {
-                'user_message': f"⏳ Генерируем варианты... (может занять время)",
-                'error_code': 'VARIANT_TIMEOUT',
-                'fallback_action': 'use_cached_or_algorithmic',
-                'retry_allowed': True,
-                'retry_delay': 5
-            }
+        if "timeout" in keywords:
+            return dict(_VARIANT_TIMEOUT)
         
-        elif "429" in error_str or "rate limit" in error_str:
-            return {
-                'user_message': f"⏳ Слишком много запросов, подожди...",
-                'error_code': 'VARIANT_RATE_LIMIT',
-                'fallback_action': 'use_cached_or_algorithmic',
-                'retry_allowed': True,
-                'retry_delay': 10
-            }
+        elif keywords & _RATE_LIMIT_KEYWORDS:
+            return dict(_VARIANT_RATE_LIMIT)
         
-        elif "invalid" in error_str or "parse" in error_str:
-            return {
-                'user_message': f"⚙️ Переформатируем варианты...",
-                'error_code': 'VARIANT_PARSE_ERROR',
-                'fallback_action': 'use_algorithmic_generation'
-            }
+        elif keywords & _PARSE_KEYWORDS:
+            return dict(_VARIANT_PARSE_ERROR)
         
         else:
-            return {
-                'user_message': f"⚙️ Подготавливаем варианты альтернативным способом...",
-                'error_code': 'VARIANT_UNKNOWN',
-                'fallback_action': 'use_algorithmic_generation'
-            }
+            return dict(_VARIANT_UNKNOWN)
 
 
 class ImageValidator:
@@ -270,13 +319,14 @@ class EdgeCaseHandler:
         Returns:
             Кортеж (валидно ли, сообщение об ошибке)
         """
-        if not word or len(word.strip()) == 0:
+        if not word or word.isspace():
             return False, "❌ Пустое слово"
         
-        if len(word) > 50:
+        length = len(word)
+        if length > 50:
             return False, "❌ Слово слишком длинное (максимум 50 символов)"
         
-        if len(word) < 2:
+        if length < 2:
             return False, "❌ Слово слишком короткое (минимум 2 символа)"
         
         return True, None
@@ -293,16 +343,4 @@ def get_user_friendly_error_message(error_code: str, context: dict = None) -> st
     Returns:
         Сообщение для пользователя
     """
-    messages = {
-        'VISION_TIMEOUT': "⏳ Распознавание занимает дольше обычного. Пожалуйста, подожди...",
-        'VISION_INVALID_IMAGE': "📸 Фото не читается. Попробуй загрузить более чёткую фотографию.",
-        'VISION_RATE_LIMIT': "⚡ Слишком много запросов. Подожди немного перед следующей попыткой.",
-        'TTS_TIMEOUT': "🔊 Звук генерируется... Продолжаем без аудио.",
-        'TTS_RATE_LIMIT': "⏳ Временно нет доступа к звуку. Продолжаем учить слова.",
-        'VARIANT_TIMEOUT': "⚙️ Варианты генерируются дольше обычного...",
-        'VARIANT_RATE_LIMIT': "⏳ API перегружен, подожди и попробуй снова.",
-        'VARIANT_PARSE_ERROR': "⚙️ Переформатируем данные...",
-        'VARIANT_UNKNOWN': "⚙️ Подготавливаем варианты...",
-    }
-    
-    return messages.get(error_code, "❌ Произошла ошибка. Попробуй ещё раз.")
+    return _USER_FRIENDLY_MESSAGES.get(error_code, _DEFAULT_USER_MESSAGE)
@@ -2,13 +2,19 @@
 Утилиты для работы с файловой системой: сохранение/загрузка JSON, управление сессиями
 """
 
-import json
+import asyncio
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
+from secrets import token_hex
 from typing import Any, Dict, Optional
 
-from config.settings import DATA_DIR
+import orjson
+
+from config.settings import DATA_DIR, TEMP_SESSION_CACHE_SIZE
 
 
 logger = logging.getLogger(__name__)
@@ -17,30 +23,82 @@ logger = logging.getLogger(__name__)
 TEMP_SESSIONS_DIR = DATA_DIR / "temp_sessions"
 SESSION_TIMEOUT = 3600  # 1 час
 
+# LRU временных сессий в памяти: {user_id: сериализованная сессия}
+# Храним байты, а не dict: вызывающий код может менять загруженную сессию без сохранения
+_session_cache: "OrderedDict[int, bytes]" = OrderedDict()
+
+# Директория сессий, для которой уже выполнен mkdir
+_sessions_dir_ready: Optional[Path] = None
+
 
 # ============================================================================
 # РАБОТА С JSON ФАЙЛАМИ
 # ============================================================================
 
-def save_json(filepath: Path, data: Any) -> bool:
+def save_json(filepath: Path, data: Any, durable: bool = True) -> bool:
     """
     Сохранить данные в JSON файл с обработкой ошибок
     
     Args:
         filepath: Путь к файлу
         data: Данные для сохранения
+        durable: fsync перед подменой файла (см. save_bytes)
         
     Returns:
         True если успешно, False если ошибка
     """
     try:
-        # Создаем папку если её нет
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+        # orjson пишет UTF-8 без экранирования кириллицы (как ensure_ascii=False),
+        # нестроковые ключи приводятся к строкам как в stdlib json
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    
+    except Exception as e:
+        logger.error(f"❌ Ошибка при сохранении JSON: {e}")
+        return False
+    
+    return save_bytes(filepath, payload, durable)
+
+
+def save_bytes(filepath: Path, payload: bytes, durable: bool = True) -> bool:
+    """
+    Сохранить уже сериализованный JSON в файл (например, из model_dump_json)
+    
+    Args:
+        filepath: Путь к файлу
+        payload: Содержимое файла
+        durable: fsync перед подменой файла (False - для временных данных, которые
+            не страшно потерять при сбое питания; атомарность rename сохраняется)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    Returns:
+        True если успешно, False если ошибка
+    """
+    try:
+        # Пишем во временный файл рядом и атомарно подменяем: при сбое
+        # посреди записи старый файл остаётся целым
+        # Имя временного файла уникально для процесса и потока: одновременные записи
+        # одного файла из разных потоков не пишут в один временный файл
+        tmp_path = filepath.with_name(f"{filepath.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+        try:
+            # Папка создаётся только если её нет (обычно она есть - без лишнего mkdir)
+            try:
+                f = open(tmp_path, "wb")
+            except FileNotFoundError:
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                f = open(tmp_path, "wb")
+            
+            # Один write() на весь файл; fsync до rename, чтобы после сбоя питания
+            # на месте файла не оказался переименованный, но пустой временный файл
+            with f:
+                f.write(payload)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         
-        logger.debug(f"💾 JSON сохранен: {filepath}")
+        logger.debug("💾 JSON сохранен: %s", filepath)
         return True
     
     except Exception as e:
@@ -61,16 +119,15 @@ def load_json(filepath: Path, default: Optional[Any] = None) -> Any:
     """
     try:
         if not filepath.exists():
-            logger.debug(f"⚠️ JSON файл не найден: {filepath}")
+            logger.debug("⚠️ JSON файл не найден: %s", filepath)
             return default
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = orjson.loads(filepath.read_bytes())
         
-        logger.debug(f"📖 JSON загружен: {filepath}")
+        logger.debug("📖 JSON загружен: %s", filepath)
         return data
     
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"❌ Ошибка при парсинге JSON {filepath}: {e}")
         return default
     
@@ -85,10 +142,47 @@ def load_json(filepath: Path, default: Optional[Any] = None) -> Any:
 
 def ensure_sessions_directory():
     """
-    Создать директорию для сессий если её нет
+    Создать директорию для сессий если её нет (mkdir - только при первом вызове)
     """
+    global _sessions_dir_ready
+    if _sessions_dir_ready == TEMP_SESSIONS_DIR:
+        return
     TEMP_SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
-    logger.debug(f"✅ Директория сессий проверена: {TEMP_SESSIONS_DIR}")
+    _sessions_dir_ready = TEMP_SESSIONS_DIR
+    logger.debug("✅ Директория сессий проверена: %s", TEMP_SESSIONS_DIR)
+
+
+def _remember_session(user_id: int, payload: bytes):
+    """Положить сериализованную сессию в LRU в памяти (с вытеснением самых старых)"""
+    _session_cache[user_id] = payload
+    _session_cache.move_to_end(user_id)
+    while len(_session_cache) > TEMP_SESSION_CACHE_SIZE:
+        _session_cache.popitem(last=False)
+
+
+def _prepare_session(user_id: int, session_data: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Подготовить сессию к сохранению: timestamp для TTL и компактный JSON
+    
+    Args:
+        user_id: ID пользователя в Telegram
+        session_data: Данные сессии
+        
+    Returns:
+        Сериализованная сессия или None при ошибке
+    """
+    ensure_sessions_directory()
+    
+    # Добавляем timestamp для отслеживания TTL
+    session_data['timestamp'] = time.time()
+    
+    try:
+        # Файл - компактный JSON (его никто не читает глазами); сессия живёт час,
+        # поэтому пишется без fsync - атомарная подмена защищает от обрезанного файла
+        return orjson.dumps(session_data, option=orjson.OPT_NON_STR_KEYS)
+    except Exception as e:
+        logger.error(f"❌ Ошибка при сохранении JSON сессии {user_id}: {e}")
+        return None
 
 
 def save_user_session(user_id: int, session_data: Dict[str, Any]) -> bool:
@@ -102,13 +196,39 @@ def save_user_session(user_id: int, session_data: Dict[str, Any]) -> bool:
     Returns:
         True если успешно, False если ошибка
     """
-    ensure_sessions_directory()
+    payload = _prepare_session(user_id, session_data)
+    if payload is None or not save_bytes(TEMP_SESSIONS_DIR / f"{user_id}.json", payload, durable=False):
+        _session_cache.pop(user_id, None)
+        return False
     
-    # Добавляем timestamp для отслеживания TTL
-    session_data['timestamp'] = time.time()
+    _remember_session(user_id, payload)
+    return True
+
+
+async def asave_user_session(user_id: int, session_data: Dict[str, Any]) -> bool:
+    """
+    Сохранить сессию пользователя, не блокируя event loop: запись файла идёт в потоке,
+    копия в памяти обновляется в event loop
     
-    session_file = TEMP_SESSIONS_DIR / f"{user_id}.json"
-    return save_json(session_file, session_data)
+    Args:
+        user_id: ID пользователя в Telegram
+        session_data: Данные сессии (слова, timestamp и т.д.)
+        
+    Returns:
+        True если успешно, False если ошибка
+    """
+    payload = _prepare_session(user_id, session_data)
+    if payload is None:
+        _session_cache.pop(user_id, None)
+        return False
+    
+    # Копия в памяти обновляется до записи: следующая загрузка уже видит новую сессию
+    _remember_session(user_id, payload)
+    if not await asyncio.to_thread(save_bytes, TEMP_SESSIONS_DIR / f"{user_id}.json", payload, False):
+        if _session_cache.get(user_id) is payload:
+            _session_cache.pop(user_id, None)
+        return False
+    return True
 
 
 def load_user_session(user_id: int) -> Optional[Dict[str, Any]]:
@@ -121,10 +241,14 @@ def load_user_session(user_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Данные сессии если существует и не истекла, иначе None
     """
-    ensure_sessions_directory()
-    
-    session_file = TEMP_SESSIONS_DIR / f"{user_id}.json"
-    session_data = load_json(session_file, default=None)
+    payload = _session_cache.get(user_id)
+    if payload is not None:
+        _session_cache.move_to_end(user_id)
+        session_data = orjson.loads(payload)
+    else:
+        ensure_sessions_directory()
+        session_file = TEMP_SESSIONS_DIR / f"{user_id}.json"
+        session_data = load_json(session_file, default=None)
     
     if session_data is None:
         return None
@@ -151,6 +275,7 @@ def delete_user_session(user_id: int) -> bool:
         True если успешно, False если ошибка
     """
     session_file = TEMP_SESSIONS_DIR / f"{user_id}.json"
+    _session_cache.pop(user_id, None)
     
     try:
         if session_file.exists():
@@ -177,17 +302,22 @@ def cleanup_expired_sessions() -> int:
     current_time = time.time()
     
     try:
-        for session_file in TEMP_SESSIONS_DIR.glob("*.json"):
-            try:
-                session_data = load_json(session_file, default=None)
-                if session_data:
-                    timestamp = session_data.get('timestamp', 0)
-                    if current_time - timestamp > SESSION_TIMEOUT:
-                        session_file.unlink()
+        # Сессия пишется целиком при каждом сохранении, поэтому mtime файла совпадает
+        # с полем timestamp: достаточно stat() из scandir, без чтения и разбора JSON
+        with os.scandir(TEMP_SESSIONS_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if current_time - entry.stat().st_mtime > SESSION_TIMEOUT:
+                        os.unlink(entry.path)
                         deleted_count += 1
-                        logger.debug(f"🗑️ Удалена истёкшая сессия: {session_file.name}")
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка при проверке сессии {session_file.name}: {e}")
+                        user_id = entry.name[:-5]
+                        if user_id.isdigit():
+                            _session_cache.pop(int(user_id), None)
+                        logger.debug("🗑️ Удалена истёкшая сессия: %s", entry.name)
+                except OSError as e:
+                    logger.warning(f"⚠️ Ошибка при проверке сессии {entry.name}: {e}")
         
         if deleted_count > 0:
             logger.info(f"✅ Удалено {deleted_count} истёкших сессий")
@@ -208,10 +338,9 @@ def generate_unique_id() -> str:
     Генерировать уникальный ID (для словарей и т.д.)
     
     Returns:
-        Уникальный ID на основе timestamp
+        Уникальный ID из 8 шестнадцатеричных символов (4 случайных байта)
     """
-    import uuid
-    return str(uuid.uuid4())[:8]
+    return token_hex(4)
 
 
 def ensure_user_directories(user_id: int):
@@ -228,4 +357,4 @@ def ensure_user_directories(user_id: int):
     dictionaries_dir.mkdir(parents=True, exist_ok=True)
     sessions_dir.mkdir(parents=True, exist_ok=True)
     
-    logger.debug(f"✅ Папки пользователя {user_id} созданы")
+    logger.debug("✅ Папки пользователя %s созданы", user_id)
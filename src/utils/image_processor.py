@@ -1,37 +1,54 @@
 """
 Утилиты для обработки изображений перед отправкой в Vision API
+
+VisionService использует preprocess_image_with_validation (одно открытие файла);
+validate_image и preprocess_image оставлены для отдельных проверок и совместимости
 """
 
 import base64
 import logging
 from io import BytesIO
-from typing import Tuple
+from typing import Optional, Tuple
 
-from PIL import Image, ImageEnhance, ImageOps
+from PIL import Image, ImageEnhance, ImageOps, ImageStat
 
-from config.settings import MAX_FILE_SIZE
+from config.settings import (
+    MAX_FILE_SIZE,
+    IMAGE_MAX_WIDTH,
+    IMAGE_JPEG_QUALITY,
+    IMAGE_JPEG_SUBSAMPLING,
+    IMAGE_JPEG_OPTIMIZE,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Сигнатуры поддерживаемых форматов (JPEG, PNG, GIF, WebP/RIFF) - отсев не-изображений без Pillow
+_IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG', b'GIF8', b'RIFF')
 
-def validate_image(image_bytes: bytes) -> Tuple[bool, str]:
+
+def _open_validated(image_bytes: bytes) -> Tuple[Optional[Image.Image], str]:
     """
-    Проверить валидность изображения (формат, размер)
+    Проверить изображение и открыть его (Image.open читает только заголовок)
     
     Args:
         image_bytes: Байты изображения
         
     Returns:
-        Кортеж (валиден, сообщение об ошибке)
+        Кортеж (открытое изображение или None, сообщение об ошибке)
     """
     # Проверка размера файла
     if len(image_bytes) > MAX_FILE_SIZE:
         error_msg = f"❌ Файл слишком большой: {len(image_bytes) / (1024*1024):.1f} МБ (максимум {MAX_FILE_SIZE / (1024*1024):.0f} МБ)"
         logger.warning(error_msg)
-        return False, error_msg
+        return None, error_msg
+    
+    if not image_bytes.startswith(_IMAGE_SIGNATURES):
+        error_msg = "❌ Файл не похож на изображение. Используйте JPEG, PNG, GIF или WebP"
+        logger.warning(error_msg)
+        return None, error_msg
     
-    # Проверка формата изображения
+    # Проверка формата изображения: пиксели здесь не декодируются (без полного прохода verify())
     try:
         image = Image.open(BytesIO(image_bytes))
         
@@ -39,20 +56,73 @@ def validate_image(image_bytes: bytes) -> Tuple[bool, str]:
         if image.format not in ['JPEG', 'PNG', 'GIF', 'WEBP']:
             error_msg = f"❌ Неподдерживаемый формат: {image.format}. Используйте JPEG, PNG, GIF или WebP"
             logger.warning(error_msg)
-            return False, error_msg
+            return None, error_msg
         
-        # Базовая проверка - изображение загружается без ошибок
-        image.verify()
         logger.info(f"✅ Изображение валидно: {image.format} ({image.width}x{image.height})")
-        return True, ""
+        return image, ""
     
     except Exception as e:
         error_msg = f"❌ Ошибка при проверке изображения: {str(e)}"
         logger.error(error_msg)
-        return False, error_msg
+        return None, error_msg
+
+
+def validate_image(image_bytes: bytes) -> Tuple[bool, str]:
+    """
+    Проверить валидность изображения (формат, размер)
+    
+    Args:
+        image_bytes: Байты изображения
+        
+    Returns:
+        Кортеж (валиден, сообщение об ошибке)
+    """
+    image, error_msg = _open_validated(image_bytes)
+    return image is not None, error_msg
 
 
-def preprocess_image(image_bytes: bytes, max_width: int = 2048) -> bytes:
+def preprocess_image_with_validation(
+    image_bytes: bytes,
+    max_width: int = IMAGE_MAX_WIDTH
+) -> Tuple[Optional[bytes], str]:
+    """
+    Проверить и предобработать изображение за одно открытие
+    (вместо validate_image + preprocess_image, каждый из которых открывает файл заново)
+    
+    Args:
+        image_bytes: Исходные байты изображения
+        max_width: Максимальная ширина изображения
+        
+    Returns:
+        Кортеж (предобработанные байты или None, сообщение об ошибке)
+    """
+    image, error_msg = _open_validated(image_bytes)
+    if image is None:
+        return None, error_msg
+    return _preprocess_opened(image, image_bytes, max_width), ""
+
+
+def _enhance_contrast(image: Image.Image, factor: float) -> Image.Image:
+    """
+    Повысить контраст RGB-изображения одним проходом по таблице (LUT)
+    
+    Результат совпадает с ImageEnhance.Contrast: таблица строится тем же Image.blend,
+    но по 256 значениям, а не по всему изображению с серым фоном того же размера
+    
+    Args:
+        image: Изображение в режиме RGB
+        factor: Коэффициент контраста (1.0 - без изменений)
+        
+    Returns:
+        Изображение с повышенным контрастом
+    """
+    mean = int(ImageStat.Stat(image.convert('L')).mean[0] + 0.5)
+    gradient = Image.frombytes('L', (256, 1), bytes(range(256)))
+    lut = Image.blend(Image.new('L', (256, 1), mean), gradient, factor).tobytes()
+    return image.point(list(lut) * 3)
+
+
+def preprocess_image(image_bytes: bytes, max_width: int = IMAGE_MAX_WIDTH) -> bytes:
     """
     Предобработка изображения для улучшения качества распознавания текста:
     - Улучшение контраста
@@ -67,9 +137,34 @@ def preprocess_image(image_bytes: bytes, max_width: int = 2048) -> bytes:
         Предобработанные байты изображения
     """
     try:
-        # Открытие изображения
         image = Image.open(BytesIO(image_bytes))
-        logger.debug(f"📸 Исходное изображение: {image.format} {image.size}")
+    except Exception as e:
+        logger.error(f"❌ Ошибка при предобработке изображения: {e}")
+        logger.info("⚠️ Возвращаем исходное изображение")
+        return image_bytes
+    
+    return _preprocess_opened(image, image_bytes, max_width)
+
+
+def _preprocess_opened(image: Image.Image, image_bytes: bytes, max_width: int) -> bytes:
+    """
+    Предобработка уже открытого изображения (см. preprocess_image)
+    
+    Args:
+        image: Изображение, открытое из image_bytes (пиксели ещё не декодированы)
+        image_bytes: Исходные байты (возвращаются при ошибке обработки)
+        max_width: Максимальная ширина изображения
+        
+    Returns:
+        Предобработанные байты изображения
+    """
+    try:
+        logger.debug("📸 Исходное изображение: %s %s", image.format, image.size)
+        
+        # JPEG шире max_width декодируем сразу в уменьшенном масштабе (1/2, 1/4, 1/8 через DCT),
+        # но не меньше max_width: меньше пикселей на декодирование и на все следующие проходы
+        if image.format == 'JPEG' and image.width > max_width:
+            image.draft('RGB', (max_width, image.height * max_width // image.width))
         
         # Преобразование в RGB если нужно (для PNG с альфа-каналом и т.д.)
         if image.mode in ['RGBA', 'LA', 'P']:
@@ -82,18 +177,17 @@ def preprocess_image(image_bytes: bytes, max_width: int = 2048) -> bytes:
             logger.debug("🎨 Преобразовано в RGB")
         elif image.mode != 'RGB':
             image = image.convert('RGB')
-            logger.debug(f"🎨 Преобразовано в RGB (было {image.mode})")
+            logger.debug("🎨 Преобразовано в RGB (было %s)", image.mode)
         
         # Оптимизация размера - не больше max_width
         if image.width > max_width:
             ratio = max_width / image.width
             new_height = int(image.height * ratio)
             image = image.resize((max_width, new_height), Image.Resampling.LANCZOS)
-            logger.debug(f"📏 Изображение уменьшено до {image.size}")
+            logger.debug("📏 Изображение уменьшено до %s", image.size)
         
         # Улучшение контраста для лучшего распознавания текста
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.3)  # Увеличиваем контраст на 30%
+        image = _enhance_contrast(image, 1.3)  # Увеличиваем контраст на 30%
         logger.debug("📊 Контраст повышен на 30%")
         
         # Улучшение резкости
@@ -101,9 +195,16 @@ def preprocess_image(image_bytes: bytes, max_width: int = 2048) -> bytes:
         image = enhancer.enhance(1.2)  # Увеличиваем резкость на 20%
         logger.debug("✂️ Резкость повышена на 20%")
         
-        # Сохранение в JPEG (хороший компромисс между качеством и размером)
+        # Сохранение в JPEG (хороший компромисс между качеством и размером):
+        # Vision API нужен читаемый текст, а не точный цвет - меньше байт на base64 и загрузку
         output = BytesIO()
-        image.save(output, format='JPEG', quality=90, optimize=True)
+        image.save(
+            output,
+            format='JPEG',
+            quality=IMAGE_JPEG_QUALITY,
+            subsampling=IMAGE_JPEG_SUBSAMPLING,
+            optimize=IMAGE_JPEG_OPTIMIZE
+        )
         output_bytes = output.getvalue()
         
         logger.info(f"✅ Предобработка завершена: {len(image_bytes)} → {len(output_bytes)} байт")
@@ -127,7 +228,7 @@ def convert_to_base64(image_bytes: bytes) -> str:
     """
     try:
         base64_str = base64.b64encode(image_bytes).decode('utf-8')
-        logger.debug(f"🔐 Изображение закодировано в base64 ({len(base64_str)} символов)")
+        logger.debug("🔐 Изображение закодировано в base64 (%s символов)", len(base64_str))
         return base64_str
     except Exception as e:
         logger.error(f"❌ Ошибка при кодировании в base64: {e}")
@@ -4,6 +4,7 @@
 
 import logging
 import re
+from functools import lru_cache
 from typing import List, Set
 
 from config.settings import MAX_WORDS_IN_DICTIONARY
@@ -13,23 +14,31 @@ logger = logging.getLogger(__name__)
 
 
 # Список слов, которые часто ошибочно распознаются из текста (артефакты)
-COMMON_ARTIFACTS = {
-    'по', 'и', 'в', 'во', 'на', 'не', 'к', 'со', 'со', 'за', 'с', 'у', 'он', 'она',
+COMMON_ARTIFACTS = frozenset({
+    'по', 'и', 'в', 'во', 'на', 'не', 'к', 'со', 'за', 'с', 'у', 'он', 'она',
     'оно', 'они', 'это', 'так', 'что', 'как', 'а', 'б', 'г', 'д', 'е', 'ё', 'ж',
     'з', 'й', 'л', 'м', 'н', 'р', 'х', 'ц', 'ч', 'ш', 'щ', 'т', 'ъ', 'ь', 'э',
-    'п', 'ф', 'б', 'ю', 'я', '—', '–', '-', '_',
+    'п', 'ф', 'ю', 'я', '—', '–', '-', '_',
     # Артефакты распознавания изображений (служебные слова)
-    'мы', 'вы', 'ты', 'я', 'он', 'она', 'оно', 'они', 'вас', 'нас', 'вам', 'нам',
-    'тот', 'эта', 'эти', 'того', 'той', 'того', 'том', 'той', 'той',
+    'мы', 'вы', 'ты', 'вас', 'нас', 'вам', 'нам',
+    'тот', 'эта', 'эти', 'того', 'той', 'том',
     'без', 'для', 'при', 'про', 'над', 'под', 'если', 'то', 'либо',
     'выход', 'выходных', 'доставк', 'ежедневно', 'часы', 'работ', 'работы',
     'магазин', 'инстаграм', 'одноклассник', 'фото', 'список', 'слов', 'слова',
     'картинка', 'изображение', 'фотография', 'текст', 'лист', 'страница',
-    'примечание', 'примечания', 'прим', 'прим', 'изм', 'все', 'полностью'
-}
+    'примечание', 'примечания', 'прим', 'изм', 'все', 'полностью'
+})
 
 # Символы, которые часто появляются в распознанном тексте как артефакты
-ARTIFACTS_SYMBOLS = {',', '.', '!', '?', ':', ';', '(', ')', '[', ']', '{', '}', '"', "'", '/', '\\'}
+ARTIFACTS_SYMBOLS = frozenset({',', '.', '!', '?', ':', ';', '(', ')', '[', ']', '{', '}', '"', "'", '/', '\\'})
+
+# Регулярные выражения компилируются один раз при импорте (очистка идёт для каждого распознанного слова)
+# Вся посимвольная работа выполняется в C (re и методы str); JIT вроде Numba здесь не поможет -
+# строковые операции он компилирует только в object mode, что медленнее обычного Python
+_NON_WORD_CHARS_SUB = re.compile(r'[^а-яёА-ЯЁ\-ъьЪЬ]').sub
+_REPEATED_HYPHENS = re.compile(r'-+')
+_VALID_WORD_MATCH = re.compile(r'^[а-яёъь\-]+$').match
+_WORD_SEPARATORS_SPLIT = re.compile(r'[\n,]+').split
 
 
 def clean_word(word: str) -> str:
@@ -45,15 +54,13 @@ def clean_word(word: str) -> str:
     if not word:
         return ""
     
-    # Удаление пробелов в начале и конце
-    word = word.strip()
-    
-    # Удаление символов, которые не должны быть в словах
+    # Удаление символов, которые не должны быть в словах (включая пробелы)
     # Оставляем только русские буквы, дефис и мягкий/твёрдый знак
-    word = re.sub(r'[^а-яёА-ЯЁ\-ъьЪЬ]', '', word)
+    word = _NON_WORD_CHARS_SUB('', word)
     
     # Замена нескольких дефисов на один
-    word = re.sub(r'-+', '-', word)
+    if '--' in word:
+        word = _REPEATED_HYPHENS.sub('-', word)
     
     # Удаление дефиса в начале и конце
     word = word.strip('-')
@@ -64,43 +71,64 @@ def clean_word(word: str) -> str:
     return word
 
 
-def validate_word(word: str) -> bool:
+def validate_word(word: str, cleaned: bool = False) -> bool:
     """
     Проверить валидность слова для добавления в словарь
     
     Args:
         word: Слово для проверки
+        cleaned: Слово уже прошло clean_word (проверка допустимых символов не нужна)
         
     Returns:
         True если слово валидно, False если нет
     """
     # Слово должно быть непусто после очистки
-    if not word or len(word) < 2:
+    if not word:
+        return False
+    length = len(word)
+    if length < 2:
         return False
     
     # Слово не должно быть очень длинным (обычно словарные слова < 20 букв)
-    if len(word) > 30:
-        logger.debug(f"⚠️ Слово слишком длинное: {word} ({len(word)} букв)")
+    if length > 30:
+        logger.debug(f"⚠️ Слово слишком длинное: {word} ({length} букв)")
         return False
     
-    # Слово должно содержать только русские буквы (и дефис/ъ/ь)
-    if not re.match(r'^[а-яёъь\-]+$', word):
-        logger.debug(f"⚠️ Слово содержит недопустимые символы: {word}")
+    # Слово не в списке артефактов (частые ошибки распознавания) - поиск по хешу дешевле посимвольных проверок ниже
+    if word in COMMON_ARTIFACTS:
+        logger.debug(f"⚠️ Слово - известный артефакт распознавания: {word}")
         return False
     
     # Слово не должно быть одной повторяющейся буквой
-    if len(set(word.replace('-', ''))) == 1:
+    letters = word.replace('-', '') if '-' in word else word
+    if letters and letters == letters[0] * len(letters):
         logger.debug(f"⚠️ Слово состоит из одной буквы: {word}")
         return False
     
-    # Слово не в списке артефактов (частые ошибки распознавания)
-    if word in COMMON_ARTIFACTS:
-        logger.debug(f"⚠️ Слово - известный артефакт распознавания: {word}")
+    # Слово должно содержать только русские буквы (и дефис/ъ/ь);
+    # после clean_word других символов в слове уже не бывает
+    if not cleaned and not _VALID_WORD_MATCH(word):
+        logger.debug(f"⚠️ Слово содержит недопустимые символы: {word}")
         return False
     
     return True
 
 
+@lru_cache(maxsize=4096)
+def _clean_and_validate(word: str) -> str:
+    """
+    Очистить и проверить слово (кешируется: одни и те же токены приходят с разных фото)
+    
+    Args:
+        word: Исходное слово
+        
+    Returns:
+        Очищенное слово или пустая строка если слово невалидно
+    """
+    cleaned_word = clean_word(word)
+    return cleaned_word if validate_word(cleaned_word, cleaned=True) else ""
+
+
 def clean_words_list(words: List[str]) -> List[str]:
     """
     Очистить список распознанных слов от дубликатов, артефактов и невалидных слов
@@ -113,16 +141,14 @@ def clean_words_list(words: List[str]) -> List[str]:
     """
     cleaned: Set[str] = set()
     
-    for word in words:
-        # Очистка слова
-        cleaned_word = clean_word(word)
-        
-        # Проверка валидности
-        if validate_word(cleaned_word):
+    # Дубликаты отбрасываются до очистки, чтобы не обрабатывать их повторно
+    for word in set(words):
+        cleaned_word = _clean_and_validate(word)
+        if cleaned_word:
             cleaned.add(cleaned_word)
     
     # Преобразование в список и сортировка
-    result = sorted(list(cleaned))
+    result = sorted(cleaned)
     
     logger.info(f"📝 Список слов: {len(words)} → {len(result)} (очищено от дубликатов и артефактов)")
     
@@ -145,16 +171,8 @@ def parse_recognized_text(text: str) -> List[str]:
     Returns:
         Список очищенных слов
     """
-    # Разбиение по строкам и запятым
-    lines = text.split('\n')
-    words = []
-    
-    for line in lines:
-        # Разбиение по запятым если есть несколько слов на одной строке
-        for part in line.split(','):
-            part = part.strip()
-            if part:
-                words.append(part)
+    # Разбиение по строкам и запятым (несколько слов на одной строке) за один проход
+    words = [part for part in map(str.strip, _WORD_SEPARATORS_SPLIT(text)) if part]
     
     logger.info(f"🔍 Распарсено {len(words)} слов из распознанного текста")
     logger.debug(f"📋 Слова ДО очистки: {words}")
@@ -181,13 +199,10 @@ def format_words_for_display(words: List[str]) -> str:
     if not words:
         return "❌ Нет слов для отображения"
     
-    formatted = "📚 Распознанные слова:\n\n"
-    for i, word in enumerate(words, 1):
-        formatted += f"{i}. {word}\n"
-    
-    formatted += f"\n✅ Всего: {len(words)} слов"
+    # Строки собираются в список и склеиваются один раз
+    lines = "\n".join([f"{i}. {word}" for i, word in enumerate(words, 1)])
     
-    return formatted
+    return f"📚 Распознанные слова:\n\n{lines}\n\n✅ Всего: {len(words)} слов"
 
 
 def validate_words_count(words: List[str]) -> tuple[bool, str]:
@@ -203,10 +218,11 @@ def validate_words_count(words: List[str]) -> tuple[bool, str]:
     if not words:
         return False, "❌ Список слов пуст"
     
-    if len(words) > MAX_WORDS_IN_DICTIONARY:
-        return False, f"❌ Слишком много слов: {len(words)} (максимум {MAX_WORDS_IN_DICTIONARY})"
+    count = len(words)
+    if count > MAX_WORDS_IN_DICTIONARY:
+        return False, f"❌ Слишком много слов: {count} (максимум {MAX_WORDS_IN_DICTIONARY})"
     
-    if len(words) < 2:
+    if count < 2:
         return False, "❌ Нужно минимум 2 слова"
     
-    return True, f"✅ {len(words)} слов (в порядке)"
+    return True, f"✅ {count} слов (в порядке)"
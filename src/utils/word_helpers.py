@@ -4,17 +4,28 @@
 
 import hashlib
 import random
+import re
 import logging
+from collections import Counter
+from functools import lru_cache
 from typing import List, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# Собственный генератор для перемешивания вариантов (без общего состояния модуля random)
+_rng = random.Random()
+_shuffle = _rng.shuffle
+
+# Русские буквы (А-Я, а-я, Ё, ё) и дефис: проверка слова целиком в C-движке регулярных выражений
+_RUSSIAN_WORD_MATCH = re.compile(r'[А-ЯЁа-яё-]+').fullmatch
+
 
 # ============================================================================
 # ХЕШИРОВАНИЕ СЛОВ
 # ============================================================================
 
+@lru_cache(maxsize=4096)
 def get_word_hash(word: str) -> str:
     """
     Генерировать хеш для слова для использования в имени файла кэша
@@ -23,7 +34,7 @@ def get_word_hash(word: str) -> str:
         word: Исходное слово
         
     Returns:
-        Хеш слова (8 символов)
+        Хеш слова (8 символов); результат запоминается - слова повторяются между вызовами
     """
     # Нормализуем слово: в нижний регистр и удаляем пробелы
     normalized = word.lower().strip()
@@ -65,12 +76,12 @@ def shuffle_variants(correct_word: str, wrong_variants: List[str]) -> List[str]:
         Список из 4 вариантов в случайном порядке с индексом правильного
     """
     # Создаем список всех вариантов
-    all_variants = [correct_word] + wrong_variants
+    all_variants = [correct_word, *wrong_variants]
     
     # Перемешиваем
-    random.shuffle(all_variants)
+    _shuffle(all_variants)
     
-    logger.debug(f"🔀 Перемешаны варианты для слова '{correct_word}'")
+    logger.debug("🔀 Перемешаны варианты для слова '%s'", correct_word)
     
     return all_variants
 
@@ -110,10 +121,7 @@ def is_russian_word(word: str) -> bool:
     if not word:
         return False
     
-    # Русские буквы: А-Я, а-я, ё, Ё
-    valid_chars = set('АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдеёжзийклмнопрстуфхцчшщъыьэюя-')
-    
-    return all(c in valid_chars for c in word)
+    return _RUSSIAN_WORD_MATCH(word) is not None
 
 
 def validate_variants_uniqueness(variants: List[str], original_word: str) -> Tuple[bool, str]:
@@ -136,11 +144,12 @@ def validate_variants_uniqueness(variants: List[str], original_word: str) -> Tup
     # Проверяем уникальность
     unique_variants = set(variants)
     if len(unique_variants) != len(variants):
-        duplicates = [v for v in variants if variants.count(v) > 1]
-        return False, f"Найдены дубликаты: {set(duplicates)}"
+        duplicates = {v for v, count in Counter(variants).items() if count > 1}
+        return False, f"Найдены дубликаты: {duplicates}"
     
     # Проверяем что все отличаются от оригинала
-    if original_word.lower() in [v.lower() for v in variants]:
+    # map ленивый: сравнение прекращается на первом совпадении, без промежуточного списка
+    if original_word.lower() in map(str.lower, variants):
         return False, f"Оригинальное слово присутствует в вариантах"
     
     # Проверяем что все русские
@@ -171,6 +180,7 @@ def validate_variant_structure(variants_list: list, original_word: str) -> Tuple
         return False, f"Неверное количество вариантов: {len(variants_list)}, ожидается 3"
     
     # Проверяем каждый элемент
+    original_lower = original_word.lower()
     for i, variant in enumerate(variants_list):
         # Проверяем что это строка
         if not isinstance(variant, str):
@@ -181,7 +191,7 @@ def validate_variant_structure(variants_list: list, original_word: str) -> Tuple
             return False, f"Вариант {i+1} пустой"
         
         # Проверяем что вариант отличается от оригинала
-        if variant.lower() == original_word.lower():
+        if variant.lower() == original_lower:
             return False, f"Вариант {i+1} совпадает с оригиналом"
         
         # Проверяем что варианты только русские